@@ -1,50 +1,31 @@
-from copy import deepcopy 
 import json
 from typing import Any
 
 from backend.functions.lib.api.chatgpt.prediction_ai import get_month_forecast_array
+from backend.functions.lib.api.nasa.series import series_from_dict
 
 
 def filter_dataset_by_month(dataset: Any, month: str) -> dict[str, Any]:
-    """Return a copy containing only records for the given month (MM) across years."""
+    """Return a dataset containing only records for the given month (MM) across years."""
     if not isinstance(month, str) or len(month) != 2 or not month.isdigit():
         raise ValueError("month must be a string in 'MM' format")
 
-    data_copy = deepcopy(dataset)
-
-    properties = data_copy.get("properties", {})
-    parameters = properties.get("parameter")
-    if not isinstance(parameters, dict):
+    properties = dataset.get("properties", {})
+    if not isinstance(properties.get("parameter"), dict):
         raise ValueError("dataset is missing properties.parameter mapping")
 
-    collected_dates: list[str] = []
-
-    for param_name, param_values in list(parameters.items()):
-        if not isinstance(param_values, dict):
-            # Nothing to filter (skip, keeps original value)
-            continue
-
-        filtered_values = {}
-        for date, value in param_values.items():
-            date_str = str(date)
-            if len(date_str) < 6:
-                continue
-            if date_str[-4:-2] == month:
-                filtered_values[date] = value
-
-        parameters[param_name] = filtered_values
-        collected_dates.extend(filtered_values.keys())
-
-    if not collected_dates:
+    month_series = series_from_dict(dataset).select_months(month)
+    if not len(month_series):
         raise ValueError(f"No measurements found for month {month}")
 
-    header = data_copy.get("header")
+    filtered = {**dataset, "properties": {**properties, "parameter": month_series.to_parameter_dict()}}
+
+    header = dataset.get("header")
     if isinstance(header, dict):
-        collected_dates.sort()
-        header["start"] = collected_dates[0]
-        header["end"] = collected_dates[-1]
+        date_keys = sorted(next(iter(filtered["properties"]["parameter"].values()), {}))
+        filtered["header"] = {**header, "start": date_keys[0], "end": date_keys[-1]}
 
-    return data_copy
+    return filtered
 
 nasaMock = {
     
@@ -0,0 +1,26 @@
+from infrastructure.database.interface.collection_interface import CollectionInterface
+from infrastructure.database.models.climatology_model import ClimatologyModel
+
+
+class ClimatologyCollection(CollectionInterface):
+    collection_name = "climatology"
+    entity_reference = ClimatologyModel
+
+    def ensure_indexes(self):
+        self._collection.create_index(
+            [("cell_key", 1), ("start_year", 1), ("end_year", 1), ("parameter", 1)], unique=True
+        )
+
+    def upsert(self, entity: ClimatologyModel):
+        document = entity.model_dump(by_alias=True)
+        document.pop("_id", None)
+        return self._collection.update_one(
+            {
+                "cell_key": entity.cell_key,
+                "start_year": entity.start_year,
+                "end_year": entity.end_year,
+                "parameter": entity.parameter,
+            },
+            {"$set": document, "$setOnInsert": {"_id": entity.id}},
+            upsert=True,
+        )
@@ -0,0 +1,20 @@
+from infrastructure.database.interface.collection_interface import CollectionInterface
+from infrastructure.database.models.forecast_cache_model import ForecastCacheModel
+
+
+class ForecastCacheCollection(CollectionInterface):
+    collection_name = "forecast_cache"
+    entity_reference = ForecastCacheModel
+
+    def ensure_indexes(self, ttl_seconds: int):
+        self._collection.create_index("cache_key", unique=True)
+        self._collection.create_index("created_at", expireAfterSeconds=ttl_seconds)
+
+    def upsert(self, entity: ForecastCacheModel):
+        document = entity.model_dump(by_alias=True)
+        document.pop("_id", None)
+        return self._collection.update_one(
+            {"cache_key": entity.cache_key},
+            {"$set": document, "$setOnInsert": {"_id": entity.id}},
+            upsert=True,
+        )
@@ -5,3 +5,9 @@ from infrastructure.database.models.location_model import LocationModel
 class LocationsCollection(CollectionInterface):
     collection_name = "locations"
     entity_reference = LocationModel
+
+    def iter_coordinates(self, batch_size: int = 500):
+        """Stream the coordinates of every saved location without loading them all in memory."""
+        with self._collection.find({}, {"_id": 0, "latitude": 1, "longitude": 1}, batch_size=batch_size) as cursor:
+            for document in cursor:
+                yield document
@@ -22,6 +22,9 @@ class CollectionInterface:
     def insert(self, entity: ModelInterface):
         return self._collection.insert_one(entity.model_dump(by_alias=True))
 
+    def insert_many(self, entities: list[ModelInterface]):
+        return self._collection.insert_many([entity.model_dump(by_alias=True) for entity in entities])
+
     def update(self, filter_by: dict, data_to_update: dict):
 
         for key, value in data_to_update.items():
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import Field
+from bson.objectid import ObjectId
+
+from infrastructure.database.interface.model_interface import ModelInterface
+
+
+class ClimatologyModel(ModelInterface):
+    id: str = Field(alias="_id", default_factory=lambda: str(ObjectId()))
+
+    ## NASA grid cell (GridCell.key) and its center
+    cell_key: str
+    latitude: float
+    longitude: float
+
+    ## NASA POWER parameter and historical window (inclusive years)
+    parameter: str
+    start_year: int
+    end_year: int
+
+    ## Per day-of-year statistics, 366 values (leap-year calendar, None when there is no data)
+    mean: list[Optional[float]]
+    std: list[Optional[float]]
+    p10: list[Optional[float]]
+    p50: list[Optional[float]]
+    p90: list[Optional[float]]
+    trend: list[Optional[float]]
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    updated_at: datetime = Field(default_factory=lambda: datetime.now())
@@ -0,0 +1,16 @@
+from datetime import datetime
+from pydantic import Field
+from bson.objectid import ObjectId
+
+from infrastructure.database.interface.model_interface import ModelInterface
+
+
+class ForecastCacheModel(ModelInterface):
+    id: str = Field(alias="_id", default_factory=lambda: str(ObjectId()))
+    cache_key: str
+
+    ## Forecast entries (ForecastEntry.model_dump())
+    forecast: list[dict]
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    updated_at: datetime = Field(default_factory=lambda: datetime.now())
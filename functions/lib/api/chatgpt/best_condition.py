@@ -1,8 +1,7 @@
-import os
 from typing import Dict, Any, Optional
-from openai import OpenAI
 
 from infrastructure.database.models.crop_condition_model import CropConditionModel
+from lib.api.chatgpt.client import get_openai_client, timed_call
 
 
 def get_crop_best_conditions(
@@ -19,14 +18,8 @@ def get_crop_best_conditions(
         Dictionary containing AI-generated optimal conditions or None if error
     """
     try:
-        # Initialize OpenAI client with API key from environment variable or parameter
-        openai_api_key = api_key or os.getenv("OPEN_AI_API_KEY")
-        if not openai_api_key:
-            raise ValueError(
-                "OpenAI API key not found. Set OPEN_AI_API_KEY environment variable or pass api_key parameter."
-            )
-
-        client = OpenAI(api_key=openai_api_key)
+        # Shared client with API key from environment variable or parameter
+        client = get_openai_client(api_key)
 
         # Create optimized prompt for the crop focusing on transplanting/planting conditions
         prompt = f"""
@@ -57,7 +50,9 @@ def get_crop_best_conditions(
         """
 
         # Call OpenAI API
-        response = client.beta.chat.completions.parse(
+        response = timed_call(
+            "best_condition",
+            client.beta.chat.completions.parse,
             model="gpt-4o",
             messages=[
                 {
@@ -0,0 +1,141 @@
+"""
+Shared OpenAI client.
+
+One lazily created `OpenAI` client per process (and API key) keeps its
+pooled httpx connections, TCP and TLS sessions alive between worker
+invocations. Calls have explicit connect/read timeouts, and the latency
+and token usage (`response.usage`) of every call is recorded per
+operation in `usage_stats`.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.getenv("OPENAI_READ_TIMEOUT", 120))
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", 2))
+MAX_CONNECTIONS = 16
+MAX_KEEPALIVE_CONNECTIONS = 8
+KEEPALIVE_EXPIRY_SECONDS = 120.0
+
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+class UsageStats:
+    """Thread-safe record of OpenAI call latencies and token usage per operation."""
+
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self._operations: Dict[str, Dict[str, Any]] = {}
+        self._compaction = {"prompts": 0, "tokens_before": 0, "tokens_after": 0}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, usage: Any = None, success: bool = True) -> None:
+        with self._lock:
+            stats = self._operations.setdefault(
+                operation, {"calls": 0, "failures": 0, "samples": [], **{field: 0 for field in USAGE_FIELDS}}
+            )
+            stats["calls"] += 1
+            if not success:
+                stats["failures"] += 1
+            for field in USAGE_FIELDS:
+                stats[field] += getattr(usage, field, None) or 0
+            stats["samples"].append(seconds)
+            if len(stats["samples"]) > self.max_samples:
+                del stats["samples"][0]
+
+    def record_compaction(self, tokens_before: int, tokens_after: int) -> None:
+        """Record the approximate history tokens of one prompt before and after compaction."""
+        with self._lock:
+            self._compaction["prompts"] += 1
+            self._compaction["tokens_before"] += tokens_before
+            self._compaction["tokens_after"] += tokens_after
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return call counts, token totals, prompt tokens per call and latency
+        percentiles in seconds per operation, plus the prompt compaction totals.
+        """
+        with self._lock:
+            operations = {name: {**stats, "samples": sorted(stats["samples"])}
+                          for name, stats in self._operations.items()}
+            compaction = dict(self._compaction)
+
+        summary = {}
+        for name, stats in operations.items():
+            samples: List[float] = stats.pop("samples")
+            stats["prompt_tokens_per_call"] = stats["prompt_tokens"] / stats["calls"]
+            if samples:
+                stats.update({
+                    "mean": sum(samples) / len(samples),
+                    "p50": samples[len(samples) // 2],
+                    "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+                    "max": samples[-1],
+                })
+            summary[name] = stats
+        if compaction["prompts"]:
+            summary["prompt_compaction"] = compaction
+        return summary
+
+
+usage_stats = UsageStats()
+
+_clients: Dict[str, OpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: Optional[str] = None) -> OpenAI:
+    """
+    Return the process-wide client of an API key (default: OPEN_AI_API_KEY),
+    creating it on first use.
+
+    Raises:
+        ValueError: If no API key is available
+    """
+    api_key = api_key or os.getenv("OPEN_AI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not found. Set OPEN_AI_API_KEY environment variable or pass api_key.")
+
+    with _clients_lock:
+        if api_key not in _clients:
+            timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+            http_client = DefaultHttpxClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+            _clients[api_key] = OpenAI(
+                api_key=api_key, timeout=timeout, max_retries=MAX_RETRIES, http_client=http_client
+            )
+        return _clients[api_key]
+
+
+def timed_call(operation: str, call: Callable[..., Any], **kwargs) -> Any:
+    """
+    Run `call(**kwargs)` (e.g. `client.chat.completions.create`) and record
+    its latency and token usage under `operation`.
+    """
+    started = time.perf_counter()
+    try:
+        response = call(**kwargs)
+    except Exception:
+        usage_stats.record(operation, time.perf_counter() - started, success=False)
+        raise
+
+    elapsed = time.perf_counter() - started
+    usage = getattr(response, "usage", None)
+    usage_stats.record(operation, elapsed, usage)
+    logging.info(
+        f"OpenAI {operation} call took {elapsed:.2f}s "
+        f"(prompt {getattr(usage, 'prompt_tokens', None)}, completion {getattr(usage, 'completion_tokens', None)} tokens)"
+    )
+    return response
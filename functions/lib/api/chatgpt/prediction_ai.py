@@ -15,129 +15,470 @@ DATASET
 
 from __future__ import annotations
 
+import calendar
 import os
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, Union
 
-from openai import OpenAI
-from pydantic import BaseModel
+from lib.api.chatgpt.client import get_openai_client, timed_call, usage_stats
+from lib.api.chatgpt.prompt_compaction import compact_conditions, compact_history, log_compaction
+from lib.api.chatgpt.stream_parser import ForecastStreamParser
+from lib.api.nasa.series import MonthLike, NASASeries, parse_month
+from lib.forecast.climatology import DayOfYearClimatology
 
+# Output schema is shared with the local forecast engines
+from lib.forecast.schemas import (
+    COLUMNAR_FIELDS, ColumnarForecastResponse, ForecastEntry, ForecastResponse, LLMForecastResponse
+)
+from lib.forecast.scoring import score_forecast
 
-# ---------- Output schema (exactly your format) ----------
+FORECAST_MODEL = "gpt-4o"
 
-class PredictedData(BaseModel):
-    # status: 0.0 (not suitable) .. 1.0 (perfect)
-    status: float
-    moisture: float
-    temperature: float
-    precipitation: float
-    snow_precipitation: float
-    soil_temperature: float
-    humidity: float
+# Bump whenever the prompt or the way it is requested changes, cached forecasts are keyed on it
+PROMPT_VERSION = "5"
 
+# Days per chunk of a chunked forecast and the completion budget of one chunk
+FORECAST_CHUNK_DAYS = int(os.getenv("FORECAST_LLM_CHUNK_DAYS", 8))
+CHUNK_MAX_TOKENS = 1500
 
-class ForecastEntry(BaseModel):
-    # "YYYYMMDD" as string (as in your examples)
-    date: str
-    predicted_data: PredictedData
+# "entries" asks for one object per day, "columnar" for one array per variable (far fewer output tokens)
+OUTPUT_FORMATS = ("entries", "columnar")
+FORECAST_OUTPUT_FORMAT = os.getenv("FORECAST_LLM_OUTPUT", "entries")
 
+# Rounds of re-requesting the days that are missing or invalid in a response
+MAX_REPAIR_ROUNDS = 2
 
-class ForecastResponse(BaseModel):
-    forecast: list[ForecastEntry]
+# Plausible range of every predicted value, days outside of it are re-requested
+VALUE_RANGES = {
+    "moisture": (0.0, 1.0),
+    "temperature": (-90.0, 60.0),
+    "precipitation": (0.0, 500.0),
+    "snow_precipitation": (0.0, 500.0),
+    "soil_temperature": (-90.0, 80.0),
+    "humidity": (0.0, 100.0),
+}
 
 
 # ---------- Public API ----------
 
 def get_month_forecast_array(
   current_year: str,            # "YYYY"
-  dataset_nasa: dict,   # NASA POWER-style JSON
+  dataset_nasa: Union[dict, NASASeries, DayOfYearClimatology],   # NASA POWER-style JSON, columnar series or stored climatology
   best_conditions: dict,  # best condition JSON for the crop
+  month: Optional[MonthLike] = None,  # forecasted month, needed to decode the columnar output
+  output_format: str = FORECAST_OUTPUT_FORMAT,
 ) -> Optional[list[ForecastEntry]]:
     """
-    Returns the parsed `forecast` list from the OpenAI response.
+    Returns the parsed `forecast` list from the OpenAI response, with `status`
+    computed locally from `best_conditions`.
+
+    The history is sent as a compact per-day statistics table (see
+    prompt_compaction) instead of the raw NASA JSON. A precomputed
+    climatology is sent as is. With the "columnar" output format the
+    response is decoded into the same entries.
+
+    The completion is constrained to the output schema (structured output).
+    Days that are still missing or implausible are re-requested on their
+    own (see `repair_forecast`) instead of discarding the whole response.
     """
     try:
-        openai_api_key = os.getenv("OPEN_AI_API_KEY")
-        
-        if not openai_api_key:
-            raise ValueError("Set OPEN_AI_API_KEY or pass api_key.")
+        month_number = _forecast_month(dataset_nasa, month, output_format)
+        target_year = int(current_year) + 1
+        nasa_history = compact_dataset(dataset_nasa)
+        conditions = compact_conditions(best_conditions)
 
-        client = OpenAI(api_key=openai_api_key)
+        forecast = request_forecast_days(current_year, nasa_history, conditions, target_year, month_number,
+                                         output_format=output_format, max_tokens=4000, operation="forecast")
+
+        # Without a known month the entries tell which month was forecasted
+        month_number = month_number or _entries_month(forecast or [])
+        if month_number is None:
+            return None
+
+        forecast = repair_forecast(forecast or [], current_year, nasa_history, conditions, target_year, month_number,
+                                   output_format=output_format)
+        return score_forecast(forecast, best_conditions) if forecast else None
+
+    except Exception as e:
+        print(f"Error calling OpenAI API (forecast array): {e}")
+        return None
 
-        system_prompt = "You are a meteorological prediction assistant specialized in NASA POWER datasets."
-        user_prompt = build_user_prompt(
-            current_year=current_year, dataset_nasa=dataset_nasa, best_condition=best_conditions
-        )
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+def stream_month_forecast_array(
+  current_year: str,
+  dataset_nasa: Union[dict, NASASeries, DayOfYearClimatology],
+  best_conditions: dict,
+  month: Optional[MonthLike] = None,
+  on_entry: Optional[Callable[[ForecastEntry], None]] = None,
+) -> Optional[list[ForecastEntry]]:
+    """
+    Same forecast as `get_month_forecast_array`, streamed with the same
+    structured output schema.
+
+    Every `forecast` entry is validated (date inside the month, values in
+    `VALUE_RANGES`), scored as soon as it is complete and passed to
+    `on_entry`, so callers can publish the first days while the rest of the
+    month is still being generated. Days that are missing or invalid when
+    the stream ends are re-requested (see `repair_forecast`) and published
+    as well. Streaming always uses the "entries" format, the columnar
+    arrays only complete at the end of the response.
+    """
+    started = time.perf_counter()
+    usage = None
+    try:
+        month_number = _forecast_month(dataset_nasa, month, "entries")
+        if month_number is None:
+            raise ValueError("Streaming a forecast needs the forecasted month")
+        target_year = int(current_year) + 1
+        nasa_history = compact_dataset(dataset_nasa)
+        conditions = compact_conditions(best_conditions)
+
+        parser = ForecastStreamParser()
+        published: dict[str, ForecastEntry] = {}
+
+        def publish(entry: ForecastEntry) -> None:
+            score_forecast([entry], best_conditions)
+            if not published:
+                print(f"First streamed forecast day after {time.perf_counter() - started:.2f}s")
+            published[entry.date] = entry
+            if on_entry is not None:
+                on_entry(entry)
+
+        with get_openai_client().beta.chat.completions.stream(
+            model=FORECAST_MODEL,
+            messages=forecast_messages(current_year, nasa_history, conditions),
             max_tokens=4000,
-            response_format={"type": "json_object"},
-            temperature=0.0  # Pro konzistentní výstupy
-        )
+            response_format=LLMForecastResponse,
+            temperature=0.0,
+            stream_options={"include_usage": True},
+        ) as stream:
+            for event in stream:
+                if event.type != "content.delta":
+                    continue
+                for raw_entry in parser.feed(event.delta):
+                    try:
+                        entry = LLMForecastResponse.model_validate({"forecast": [raw_entry]}).to_entries()[0]
+                    except Exception as e:
+                        print(f"Error parsing streamed forecast entry: {e}")
+                        continue
+                    # Days outside the month, implausible values and repeated days are never published
+                    if entry.date in published or entry.date not in valid_entries([entry], target_year, month_number):
+                        continue
+                    publish(entry)
+            usage = stream.get_final_completion().usage
+        usage_stats.record("forecast_stream", time.perf_counter() - started, usage)
+
+        forecast = repair_forecast(list(published.values()), current_year, nasa_history, conditions, target_year,
+                                   month_number)
+        for entry in forecast:
+            if entry.date not in published:
+                publish(entry)
+        return forecast or None
 
-        content = response.choices[0].message.content
-        if not content:
-            return None
-            
-        try:
-            parsed = ForecastResponse.model_validate_json(content)
-            return parsed.forecast
-        except Exception as e:
-            print(f"Error parsing response JSON: {e}")
+    except Exception as e:
+        usage_stats.record("forecast_stream", time.perf_counter() - started, usage, success=False)
+        print(f"Error calling OpenAI API (forecast stream): {e}")
+        return None
+
+
+def get_month_forecast_chunked(
+  current_year: str,
+  dataset_nasa: Union[dict, NASASeries, DayOfYearClimatology],
+  best_conditions: dict,
+  month: MonthLike,
+  chunk_days: int = FORECAST_CHUNK_DAYS,
+  output_format: str = FORECAST_OUTPUT_FORMAT,
+) -> Optional[list[ForecastEntry]]:
+    """
+    Same forecast as `get_month_forecast_array`, generated as concurrent
+    requests of `chunk_days` days that share the compacted history.
+
+    Each chunk only keeps the days it was asked for; the chunks are merged
+    by date, the days of failed chunks are repaired and the month is
+    validated as one ForecastResponse.
+    """
+    try:
+        month_number = _forecast_month(dataset_nasa, month, output_format)
+        target_year = int(current_year) + 1
+        chunks = day_chunks(calendar.monthrange(target_year, month_number)[1], chunk_days)
+
+        # The history is compacted once and shared by every chunk
+        nasa_history = compact_dataset(dataset_nasa)
+        conditions = compact_conditions(best_conditions)
+
+        def request_chunk(days: Tuple[int, int]) -> Optional[list[ForecastEntry]]:
+            return request_forecast_days(current_year, nasa_history, conditions, target_year, month_number,
+                                         days=days, output_format=output_format)
+
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            results = list(executor.map(request_chunk, chunks))
+
+        forecast = [entry for result in results if result for entry in result]
+        forecast = repair_forecast(forecast, current_year, nasa_history, conditions, target_year, month_number,
+                                   output_format=output_format, chunk_days=chunk_days)
+        if not forecast:
             return None
+        parsed = ForecastResponse(forecast=forecast)
+        return score_forecast(parsed.forecast, best_conditions)
 
     except Exception as e:
-        print(f"Error calling OpenAI API (forecast array): {e}")
+        print(f"Error calling OpenAI API (chunked forecast): {e}")
+        return None
+
+
+def request_forecast_days(
+  current_year: str,
+  nasa_history: str,
+  best_condition: str,
+  target_year: int,
+  month_number: Optional[int],
+  days: Optional[Tuple[int, int]] = None,
+  output_format: str = "entries",
+  max_tokens: int = CHUNK_MAX_TOKENS,
+  operation: str = "forecast_chunk",
+) -> Optional[list[ForecastEntry]]:
+    """
+    One structured-output request for the whole month or a (first, last)
+    range of days. Entries outside the range are dropped.
+
+    Returns:
+        Forecast entries, or None if the request failed, was refused or
+        truncated
+    """
+    response_format = ColumnarForecastResponse if output_format == "columnar" else LLMForecastResponse
+    try:
+        response = timed_call(
+            operation,
+            get_openai_client().beta.chat.completions.parse,
+            model=FORECAST_MODEL,
+            messages=forecast_messages(current_year, nasa_history, best_condition, days=days,
+                                       output_format=output_format),
+            max_tokens=max_tokens,
+            response_format=response_format,
+            temperature=0.0,  # Pro konzistentní výstupy
+        )
+        message = response.choices[0].message
+        if message.parsed is None:
+            print(f"OpenAI returned no forecast (refusal: {getattr(message, 'refusal', None)})")
+            return None
+        if output_format == "columnar":
+            forecast = message.parsed.to_entries(target_year, month_number)
+        else:
+            forecast = message.parsed.to_entries()
+    except Exception as e:
+        label = f"days {days[0]}-{days[1]}" if days else "month"
+        print(f"Error calling OpenAI API (forecast {label}): {e}")
         return None
 
+    if days is None or month_number is None:
+        return forecast
+    dates = {f"{target_year}{month_number:02d}{day:02d}" for day in range(days[0], days[1] + 1)}
+    return [entry for entry in forecast if entry.date in dates]
+
+
+def repair_forecast(
+  forecast: list[ForecastEntry],
+  current_year: str,
+  nasa_history: str,
+  best_condition: str,
+  target_year: int,
+  month_number: int,
+  output_format: str = "entries",
+  chunk_days: int = FORECAST_CHUNK_DAYS,
+  max_rounds: int = MAX_REPAIR_ROUNDS,
+) -> list[ForecastEntry]:
+    """
+    Keep the valid days of `forecast` and re-request only the missing or
+    invalid ones, as concurrent ranges of at most `chunk_days` days.
 
-# ---------- Prompt builder (your prompt verbatim) ----------
+    Returns:
+        Valid entries sorted by date; days that are still bad after
+        `max_rounds` are left out
+    """
+    days_in_month = calendar.monthrange(target_year, month_number)[1]
+    valid = valid_entries(forecast, target_year, month_number)
+
+    for _ in range(max_rounds):
+        bad_days = [day for day in range(1, days_in_month + 1)
+                    if f"{target_year}{month_number:02d}{day:02d}" not in valid]
+        if not bad_days:
+            break
+
+        ranges = day_ranges(bad_days, chunk_days)
+        print(f"Re-requesting {len(bad_days)} forecast days in {len(ranges)} requests")
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            results = list(executor.map(
+                lambda days: request_forecast_days(current_year, nasa_history, best_condition, target_year,
+                                                   month_number, days=days, output_format=output_format),
+                ranges,
+            ))
+        for result in results:
+            for date, entry in valid_entries(result or [], target_year, month_number).items():
+                valid.setdefault(date, entry)
+
+    missing = days_in_month - len(valid)
+    if missing:
+        print(f"Forecast is missing {missing} days after repair")
+    return [valid[date] for date in sorted(valid)]
+
+
+def valid_entries(forecast: list[ForecastEntry], target_year: int, month_number: int) -> dict[str, ForecastEntry]:
+    """First entry of every day of the month whose predicted values are plausible, by date."""
+    valid = {}
+    prefix = f"{target_year}{month_number:02d}"
+    days_in_month = calendar.monthrange(target_year, month_number)[1]
+    for entry in forecast:
+        date = entry.date
+        if len(date) != 8 or not date.startswith(prefix) or not date[6:].isdigit():
+            continue
+        if not 1 <= int(date[6:]) <= days_in_month or date in valid:
+            continue
+        values = entry.predicted_data
+        if all(low <= getattr(values, field) <= high for field, (low, high) in VALUE_RANGES.items()):
+            valid[date] = entry
+    return valid
+
+
+def day_ranges(days: List[int], max_days: int) -> List[Tuple[int, int]]:
+    """Group sorted days into contiguous (first, last) ranges of at most `max_days` days."""
+    ranges = []
+    for day in days:
+        if ranges and day == ranges[-1][1] + 1 and day - ranges[-1][0] < max(1, max_days):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def day_chunks(days_in_month: int, chunk_days: int) -> List[Tuple[int, int]]:
+    """Split days 1..days_in_month into balanced (first, last) ranges of at most `chunk_days` days."""
+    count = max(1, -(-days_in_month // max(1, chunk_days)))
+    size, extra = divmod(days_in_month, count)
+
+    chunks = []
+    first = 1
+    for index in range(count):
+        last = first + size - 1 + (1 if index < extra else 0)
+        chunks.append((first, last))
+        first = last + 1
+    return chunks
+
+
+def _forecast_month(
+  dataset_nasa: Union[dict, NASASeries, DayOfYearClimatology], month: Optional[MonthLike], output_format: str
+) -> Optional[int]:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown forecast output format: {output_format}")
+    if month is not None:
+        return parse_month(month)
+    # A climatology restricted to one month tells which month is forecasted
+    if isinstance(dataset_nasa, DayOfYearClimatology) and len(dataset_nasa.months) == 1:
+        return dataset_nasa.months[0]
+    if output_format == "columnar":
+        raise ValueError("The columnar output format needs the forecasted month")
+    return None
+
+
+def _entries_month(forecast: list[ForecastEntry]) -> Optional[int]:
+    months = [entry.date[4:6] for entry in forecast if len(entry.date) == 8 and entry.date[4:6].isdigit()]
+    if not months:
+        return None
+    month = int(max(set(months), key=months.count))
+    return month if 1 <= month <= 12 else None
+
+
+def compact_dataset(dataset_nasa: Union[dict, NASASeries, DayOfYearClimatology]) -> str:
+    """Compacted history sent as `nasa_data`."""
+    nasa_history = compact_history(dataset_nasa)
+    report = log_compaction(dataset_nasa, nasa_history)
+    usage_stats.record_compaction(report["before"], report["after"])
+    return nasa_history
+
+
+def forecast_messages(
+  current_year: str,
+  nasa_history: str,
+  best_condition: str,
+  days: Optional[Tuple[int, int]] = None,
+  output_format: str = "entries",
+) -> list[dict]:
+    """Chat messages from an already compacted history."""
+    system_prompt = "You are a meteorological prediction assistant specialized in NASA POWER datasets."
+    user_prompt = build_user_prompt(
+        current_year=current_year, dataset_nasa=nasa_history, best_condition=best_condition, days=days,
+        output_format=output_format,
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def build_user_prompt(
+    current_year: str,
+    dataset_nasa: str,
+    best_condition: str,
+    days: Optional[Tuple[int, int]] = None,
+    output_format: str = "entries",
+) -> str:
+    # English prompt: produce predictions from NASA history statistics. The `status` of every day is scored locally.
+    # With `days` only that (first, last) range of the month is requested, the rest of the prompt is unchanged.
+    day_range = ""
+    if days is not None:
+        day_range = f"\n- Only include the days {days[0]} to {days[1]} (inclusive) of the requested month, in order."
+    if output_format == "columnar":
+        output_requirements, empty_output, output_name = _columnar_output(day_range)
+    else:
+        output_requirements, empty_output, output_name = _entries_output(day_range)
 
-def build_user_prompt(current_year: str, dataset_nasa: dict, best_condition: dict) -> str:
-    # English prompt: produce predictions from NASA data and compute a status comparing predictions to best_condition
     return f"""
-You are an expert agronomist and data scientist. You will receive two JSON inputs: `best_condition` (optimal values for a crop) and `nasa_data` (historical NASA POWER time series from past years). Your job is to:
+You are an expert agronomist and data scientist. You will receive two inputs: `best_condition` (optimal values for a crop) and `nasa_data` (statistics of historical NASA POWER time series from past years). Your job is to:
 
 1) Using the provided historical `nasa_data` as a reference, generate a daily climatological forecast for the requested month for the year {int(current_year) + 1}. The forecast should be based on patterns and trends observed in the historical data. For each day-of-month produce the following predicted values: moisture, temperature, precipitation, snow_precipitation, soil_temperature, humidity.
 
-2) For each forecasted day, compute a numeric `status` between 0.00 and 1.00 that indicates how closely the predicted conditions match the provided `best_condition`. Insert `status` as the FIRST field inside `predicted_data`.
-
-SCORING RULES (apply exactly):
-- Temperature (°C): perfect if |pred - best| ≤ 2 → score = 1. Linear decay to 0 when |pred - best| = 10.
-  score_temp = clamp(0, 1 - (|pred - best| - 2) / 8, 1)
-- Humidity (%): convert percentages to 0..1 scale if necessary. Perfect if within ±5% (0.05) → score 1; linear decay to 0 at ±30%.
-  score_hum = clamp(0, 1 - (|pred_h - best_h| - 0.05) / 0.25, 1)
-- Root and top soil moisture (0..1): perfect if within ±0.05; decay to 0 at ±0.4.
-  score_soil = clamp(0, 1 - (|pred - best| - 0.05) / 0.35, 1)
-- Soil temperature: same as Temperature.
-- Precipitation (mm/day): perfect if |pred - best| ≤ 1 mm; linear decay to 0 at 10 mm.
-- Snow precipitation: if both pred and best are 0 → score 1; otherwise rapid decay.
-
-WEIGHTS (sum = 1.0):
-- root_soil_moisture: 0.30
-- top_soil_moisture: 0.20
-- temperature: 0.20
-- soil_temperature: 0.10
-- humidity: 0.10
-- precipitation: 0.08
-- snow_precipitation: 0.02
-
-FINAL STATUS COMPUTATION:
-- Compute per-variable scores as above, multiply each by its weight and sum. Round status to two decimals and clamp to [0.00, 1.00].
+2) Use `best_condition` only as context for the crop. Do NOT compute any score or status.
+
+UNITS:
+- moisture: root zone soil wetness (0..1)
+- temperature: mean air temperature at 2 meters (°C)
+- precipitation: rain precipitation (mm/day)
+- snow_precipitation: snow precipitation (mm/day)
+- soil_temperature: soil temperature (°C)
+- humidity: relative humidity at 2 meters (%)
+
+NASA_DATA FORMAT:
+- First line: `years=YYYY-YYYY`, the historical window.
+- Then one block per NASA POWER parameter: the parameter ID, a header line naming the columns (`mmdd,mean,min,max,trend` or `mmdd,mean,p10,p90,trend`), and one row per calendar day.
+- mean/min/max and the p10/p90 percentiles are taken across the historical years for that day; trend is the linear change per year.
+- Parameters: T2M_MAX/T2M_MIN air temperature max/min (°C), RH2M humidity (%), PRECTOTCORR precipitation (mm/day), GWETROOT/GWETTOP root/surface soil wetness (0..1), PRECSNO snow (mm/day), TSOIL5 soil temperature (°C).
+- Precomputed agronomic indicators (when present): GDD growing degree days (°C·day, base 10 °C), PRECTOTCORR_7D/PRECTOTCORR_14D trailing 7/14-day precipitation (mm), FROST_DAY/HEAT_STRESS_DAY whose mean is the share of years with frost (T2M_MIN <= 0 °C) / heat stress (T2M_MAX >= 35 °C) on that day, GWETROOT_TREND_7D 7-day root soil wetness slope (per day). Use them as given, do not re-derive them, and keep the predicted values consistent with them.
+
+{output_requirements}
+
+ADDITIONAL RULES:
+- If the requested month is not present in the dataset, return `{empty_output}` (no error text).
+- Use deterministic outputs (temperature=0.0) and ensure valid JSON only.
+
+INPUTS (for this run):
+best_condition = {best_condition}
+nasa_data = {dataset_nasa}
+
+Now produce the requested JSON {output_name} following the rules above.
+""".strip()
 
+
+def _entries_output(day_range: str) -> Tuple[str, str, str]:
+    # One object per day, the format of ForecastResponse
+    output_requirements = f"""
 OUTPUT REQUIREMENTS:
-- Return ONLY a JSON object with exactly one key `forecast`. Its value must be an array of entries shaped like below. Each numeric value must be rounded to two decimals.
+- Return ONLY a JSON object with exactly one key `forecast`. Its value must be an array of entries shaped like below. Each numeric value must be rounded to two decimals.{day_range}
 
 {{
   "forecast": [
     {{
       "date": "YYYYMMDD",
       "predicted_data": {{
-        "status": NN.NN,
         "moisture": NN.NN,
         "temperature": NN.NN,
         "precipitation": NN.NN,
@@ -149,15 +490,18 @@ OUTPUT REQUIREMENTS:
     ...
   ]
 }}
+""".strip()
+    return output_requirements, '{"forecast": []}', "array"
 
-ADDITIONAL RULES:
-- If the requested month is not present in the dataset, return `{{"forecast": []}}` (no error text).
-- Use deterministic outputs (temperature=0.0) and ensure valid JSON only.
-- If you cannot compute numeric `status` for a day, return `status`: null (no extra fields).
 
-INPUTS (for this run):
-best_condition = {best_condition}
-nasa_data = {dataset_nasa}
+def _columnar_output(day_range: str) -> Tuple[str, str, str]:
+    # One array per variable, the format of ColumnarForecastResponse
+    arrays = ", ".join(f'"{field}": [NN.NN, ...]' for field in COLUMNAR_FIELDS)
+    output_requirements = f"""
+OUTPUT REQUIREMENTS:
+- Return ONLY a JSON object with exactly the keys below. `days` lists the forecasted days of the month (1..31) in order; every other key is an array with one value per entry of `days`, in the same order. Each numeric value must be rounded to two decimals.{day_range}
 
-Now produce the requested JSON array following the rules above.
+{{"days": [1, 2, ...], {arrays}}}
 """.strip()
+    empty_output = "{" + ", ".join(f'"{name}": []' for name in ("days",) + COLUMNAR_FIELDS) + "}"
+    return output_requirements, empty_output, "object"
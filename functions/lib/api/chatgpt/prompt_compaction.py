@@ -0,0 +1,132 @@
+"""
+Prompt compaction for the forecast prompt.
+
+Instead of interpolating the raw NASA POWER JSON (header plus years x days x
+parameters as a Python repr), the history is reduced to a dense table of
+per-day statistics across years: mean, min, max and linear trend per year.
+A precomputed day-of-year climatology is rendered the same way, with the
+P10/P90 percentiles in place of min/max.
+"""
+
+import logging
+from typing import Any, Dict, Union
+
+import numpy as np
+
+from lib.api.nasa.series import NASASeries, series_from_dict
+from lib.forecast.climatology import DayOfYearClimatology, day_of_month_matrix, month_slots, trend_slope
+
+CONDITION_FIELDS = [
+    "crop_name", "temperature", "humidity", "root_soil_moisture", "top_soil_moisture",
+    "soil_temperature", "snow_precipitation", "rain_precipitation",
+]
+
+# Approximate GPT-4o token costs: about 4 characters per token of the compact
+# table and 8 tokens per value of the raw JSON ("'20250101': 12.34, ")
+CHARS_PER_TOKEN = 4
+RAW_VALUE_TOKENS = 8
+
+
+def compact_history(dataset: Union[NASASeries, DayOfYearClimatology, Dict[str, Any]]) -> str:
+    """
+    Reduce a NASA POWER history to per-day statistics in a CSV-like form.
+
+    Every parameter gets one block with a row per calendar day (MMDD) of the
+    months present in the history:
+
+        T2M_MAX
+        mmdd,mean,min,max,trend
+        0301,25.12,22.04,28.30,0.12
+
+    `trend` is the least-squares slope across years (units per year).
+    """
+    if isinstance(dataset, DayOfYearClimatology):
+        return compact_climatology(dataset)
+
+    series = dataset if isinstance(dataset, NASASeries) else series_from_dict(dataset)
+    if not len(series):
+        return ""
+
+    years = series.years
+    months = sorted(set(series.months.tolist()))
+    lines = [f"years={int(years.min())}-{int(years.max())}"]
+
+    month_matrices = [(month, *day_of_month_matrix(series, month)) for month in months]
+    for name in series.parameters:
+        lines.append(name)
+        lines.append("mmdd,mean,min,max,trend")
+        for month, matrix_years, matrices in month_matrices:
+            lines.extend(_parameter_rows(month, matrix_years, matrices[name]))
+
+    return "\n".join(lines)
+
+
+def compact_climatology(climatology: DayOfYearClimatology) -> str:
+    """
+    Render the selected months of a precomputed climatology like
+    `compact_history`, with columns `mmdd,mean,p10,p90,trend`.
+    """
+    lines = [f"years={climatology.start_year}-{climatology.end_year}"]
+    for name in climatology.parameters:
+        lines.append(name)
+        lines.append("mmdd,mean,p10,p90,trend")
+        stats = climatology.stats[name]
+        for month in climatology.months:
+            slots = month_slots(month)
+            columns = [stats[stat][slots] for stat in ("mean", "p10", "p90", "trend")]
+            for day, (m, lo, hi, t) in enumerate(zip(*(column.tolist() for column in columns))):
+                if not np.isnan(m):
+                    lines.append(f"{month:02d}{day + 1:02d},{m:.2f},{lo:.2f},{hi:.2f},{t:.2f}")
+
+    return "\n".join(lines)
+
+
+def compact_conditions(best_conditions: Any) -> str:
+    """Keep only the crop condition values relevant to the prompt."""
+    if not isinstance(best_conditions, dict):
+        best_conditions = best_conditions.model_dump()
+    return ",".join(f"{field}={best_conditions[field]}" for field in CONDITION_FIELDS if field in best_conditions)
+
+
+def log_compaction(dataset: Union[NASASeries, DayOfYearClimatology, Dict[str, Any]],
+                   compact_prompt_data: str) -> Dict[str, int]:
+    """
+    Log the approximate prompt tokens of the raw history versus its compacted form.
+
+    The raw history is not rendered, its size is estimated from the number
+    of daily values it holds, so the measurement is cheap enough for every
+    request.
+    """
+    before = raw_history_values(dataset) * RAW_VALUE_TOKENS
+    after = -(-len(compact_prompt_data) // CHARS_PER_TOKEN)
+    logging.info(f"Forecast prompt history compacted from ~{before} to ~{after} tokens")
+    return {"before": before, "after": after}
+
+
+def raw_history_values(dataset: Union[NASASeries, DayOfYearClimatology, Dict[str, Any]]) -> int:
+    """Number of daily values the raw NASA JSON of a history holds (years x days x parameters)."""
+    if isinstance(dataset, NASASeries):
+        return len(dataset) * len(dataset.parameters)
+    if isinstance(dataset, DayOfYearClimatology):
+        days = sum(len(month_slots(month)) for month in dataset.months)
+        return (dataset.end_year - dataset.start_year + 1) * days * len(dataset.parameters)
+    parameters = dataset.get("properties", {}).get("parameter", {})
+    return sum(len(values) for values in parameters.values())
+
+
+def _parameter_rows(month: int, years: np.ndarray, values: np.ndarray) -> list:
+    counts = (~np.isnan(values)).sum(axis=0)
+    days = np.flatnonzero(counts > 0)
+    if not len(days):
+        return []
+
+    values = values[:, days]
+    mean = np.nanmean(values, axis=0)
+    minimum = np.nanmin(values, axis=0)
+    maximum = np.nanmax(values, axis=0)
+    slope, _ = trend_slope(values, years)
+
+    return [
+        f"{month:02d}{day + 1:02d},{m:.2f},{lo:.2f},{hi:.2f},{t:.2f}"
+        for day, m, lo, hi, t in zip(days.tolist(), mean.tolist(), minimum.tolist(), maximum.tolist(), slope.tolist())
+    ]
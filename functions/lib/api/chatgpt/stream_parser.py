@@ -0,0 +1,83 @@
+"""
+Incremental parser of a streamed `{"forecast": [...]}` completion.
+
+The completion arrives as arbitrary text fragments. The parser keeps the
+text received so far and a scan position, tracks strings, escapes and
+brace depth inside the `forecast` array, and hands out every array entry
+as soon as its closing brace arrives, without waiting for the rest of the
+document.
+"""
+
+import json
+import re
+from typing import Any, Dict, List
+
+_FORECAST_ARRAY = re.compile(r'"forecast"\s*:\s*\[')
+
+
+class ForecastStreamParser:
+    """Feed completion fragments, get back the finished `forecast` entries."""
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self._in_array = False
+        self._in_string = False
+        self._escaped = False
+        self._depth = 0
+        self._entry_start = None
+        self.finished = False
+
+    def feed(self, fragment: str) -> List[Dict[str, Any]]:
+        """
+        Add a fragment and return the entries it completed, in order.
+
+        Raises:
+            ValueError: If a completed entry is not valid JSON
+        """
+        if self.finished or not fragment:
+            return []
+        self._buffer += fragment
+
+        if not self._in_array:
+            match = _FORECAST_ARRAY.search(self._buffer)
+            if match is None:
+                return []
+            self._in_array = True
+            self._position = match.end()
+
+        entries = []
+        buffer = self._buffer
+        for index in range(self._position, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._entry_start = index
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    entries.append(json.loads(buffer[self._entry_start:index + 1]))
+                    self._entry_start = None
+            elif char == "]" and self._depth == 0:
+                self.finished = True
+                break
+
+        # Only the unfinished entry has to be kept
+        keep_from = self._entry_start if self._entry_start is not None else len(buffer)
+        if self.finished:
+            keep_from = len(buffer)
+        self._buffer = buffer[keep_from:]
+        self._position = len(self._buffer)
+        if self._entry_start is not None:
+            self._entry_start = 0
+        return entries
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared OpenAI client.
+"""
+
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../'))
+
+from lib.api.chatgpt import client
+
+
+class TestGetOpenAIClient(unittest.TestCase):
+    """Test cases for the lazily created client."""
+
+    def setUp(self):
+        client._clients.clear()
+
+    def tearDown(self):
+        client._clients.clear()
+
+    def test_client_is_reused(self):
+        """Test that one client is created per API key and process."""
+        first = client.get_openai_client("sk-test")
+        self.assertIs(client.get_openai_client("sk-test"), first)
+        self.assertIsNot(client.get_openai_client("sk-other"), first)
+
+    def test_timeouts(self):
+        """Test that connect and read timeouts are set explicitly."""
+        openai_client = client.get_openai_client("sk-test")
+        self.assertEqual(openai_client.timeout.connect, client.CONNECT_TIMEOUT)
+        self.assertEqual(openai_client.timeout.read, client.READ_TIMEOUT)
+        self.assertEqual(openai_client.max_retries, client.MAX_RETRIES)
+
+    @patch.dict(os.environ, {"OPEN_AI_API_KEY": "sk-env"})
+    def test_default_key_from_environment(self):
+        """Test that the API key defaults to OPEN_AI_API_KEY."""
+        self.assertEqual(client.get_openai_client().api_key, "sk-env")
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_missing_key(self):
+        """Test that a missing API key is rejected."""
+        with self.assertRaises(ValueError):
+            client.get_openai_client()
+
+
+class TestUsageStats(unittest.TestCase):
+    """Test cases for the per-operation usage metrics."""
+
+    def test_timed_call_records_usage(self):
+        """Test that token usage and latency are recorded from the response."""
+        stats = client.UsageStats()
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+        call = MagicMock(return_value=SimpleNamespace(usage=usage))
+
+        with patch.object(client, "usage_stats", stats):
+            response = client.timed_call("forecast", call, model="gpt-4o")
+            client.timed_call("forecast", call, model="gpt-4o")
+
+        call.assert_called_with(model="gpt-4o")
+        self.assertIs(response.usage, usage)
+        summary = stats.summary()["forecast"]
+        self.assertEqual(summary["calls"], 2)
+        self.assertEqual(summary["prompt_tokens"], 200)
+        self.assertEqual(summary["total_tokens"], 240)
+        self.assertEqual(summary["prompt_tokens_per_call"], 100)
+        self.assertIn("p95", summary)
+
+    def test_prompt_compaction(self):
+        """Test that the history tokens before and after compaction are summed per prompt."""
+        stats = client.UsageStats()
+        self.assertNotIn("prompt_compaction", stats.summary())
+        stats.record_compaction(5000, 800)
+        stats.record_compaction(3000, 600)
+        self.assertEqual(stats.summary()["prompt_compaction"],
+                         {"prompts": 2, "tokens_before": 8000, "tokens_after": 1400})
+
+    def test_failed_call(self):
+        """Test that failures are counted and re-raised."""
+        stats = client.UsageStats()
+        call = MagicMock(side_effect=RuntimeError("timeout"))
+
+        with patch.object(client, "usage_stats", stats):
+            with self.assertRaises(RuntimeError):
+                client.timed_call("best_condition", call)
+
+        summary = stats.summary()["best_condition"]
+        self.assertEqual((summary["calls"], summary["failures"], summary["total_tokens"]), (1, 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
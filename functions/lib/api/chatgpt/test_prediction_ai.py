@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the LLM forecast requests.
+"""
+
+import json
+import re
+import threading
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../'))
+
+from lib.api.chatgpt import prediction_ai
+from lib.api.chatgpt.prediction_ai import day_chunks, get_month_forecast_chunked, request_forecast_days
+from lib.forecast.schemas import (
+    COLUMNAR_FIELDS, ColumnarForecastResponse, ForecastResponse, LLMForecastResponse
+)
+from lib.forecast.test_climatology import BEST_CONDITIONS
+
+_DAY_RANGE = re.compile(r"Only include the days (\d+) to (\d+)")
+
+
+def _entry(date):
+    return {
+        "date": date,
+        "predicted_data": {
+            "moisture": 0.7, "temperature": 24.0, "precipitation": 3.0,
+            "snow_precipitation": 0.0, "soil_temperature": 22.0, "humidity": 70.0,
+        },
+    }
+
+
+def _completion(content, response_format=None):
+    parsed = response_format.model_validate_json(content) if response_format else None
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content, parsed=parsed, refusal=None))], usage=None
+    )
+
+
+class FakeCompletions:
+    """Answers every structured chunk request with the days it asked for (plus one extra day)."""
+
+    def __init__(self, month="06", fail_first_day=None, failures=1, bad_day=None):
+        self.month = month
+        self.fail_first_day = fail_first_day
+        self.failures = failures
+        self.bad_day = bad_day
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def parse(self, messages, response_format, **kwargs):
+        first, last = map(int, _DAY_RANGE.search(messages[-1]["content"]).groups())
+        with self._lock:
+            self.requests.append(((first, last), kwargs))
+            failing = first == self.fail_first_day and self.failures > 0
+            if failing:
+                self.failures -= 1
+            # The implausible day is only answered once
+            bad_day = self.bad_day if self.bad_day and first <= self.bad_day <= last else None
+            if bad_day:
+                self.bad_day = None
+        if failing:
+            raise ValueError("Invalid JSON: EOF while parsing")
+        # Models sometimes add a day outside their range, it must be dropped
+        entries = [_entry(f"2026{self.month}{day:02d}") for day in range(first, last + 2)]
+        for entry in entries:
+            if bad_day and entry["date"].endswith(f"{bad_day:02d}"):
+                entry["predicted_data"]["humidity"] = 170.0
+        return _completion(json.dumps({"forecast": entries}), response_format)
+
+
+class TestChunkedForecast(unittest.TestCase):
+    """Test cases for the concurrent week-sized forecast chunks."""
+
+    def test_day_chunks(self):
+        """Test that the month is split into balanced chunks."""
+        self.assertEqual(day_chunks(31, 8), [(1, 8), (9, 16), (17, 24), (25, 31)])
+        self.assertEqual(day_chunks(28, 8), [(1, 7), (8, 14), (15, 21), (22, 28)])
+        self.assertEqual(day_chunks(30, 31), [(1, 30)])
+
+    def _forecast(self, completions, month="June"):
+        with patch.object(prediction_ai, "get_openai_client") as mock_get_client, \
+                patch.object(prediction_ai, "compact_dataset", return_value="years=2019-2024"):
+            mock_get_client.return_value.beta.chat.completions = completions
+            return get_month_forecast_chunked("2025", {}, BEST_CONDITIONS, month=month, chunk_days=8)
+
+    def test_chunks_are_merged(self):
+        """Test that every chunk is requested and the days are merged once, in order."""
+        completions = FakeCompletions()
+        forecast = self._forecast(completions)
+
+        self.assertEqual(sorted(days for days, _ in completions.requests), [(1, 8), (9, 16), (17, 23), (24, 30)])
+        self.assertEqual([entry.date for entry in forecast], [f"202606{day:02d}" for day in range(1, 31)])
+        self.assertTrue(all(entry.predicted_data.status is not None for entry in forecast))
+        self.assertTrue(all(kwargs["max_tokens"] == prediction_ai.CHUNK_MAX_TOKENS
+                            for _, kwargs in completions.requests))
+
+    def test_failed_chunk_is_repaired(self):
+        """Test that only the days of a failed chunk are requested again."""
+        completions = FakeCompletions(fail_first_day=9)
+        forecast = self._forecast(completions)
+
+        self.assertEqual([entry.date for entry in forecast], [f"202606{day:02d}" for day in range(1, 31)])
+        self.assertEqual([days for days, _ in completions.requests].count((9, 16)), 2)
+        self.assertEqual(len(completions.requests), 5)
+
+    def test_persistent_failure_is_partial(self):
+        """Test that days which keep failing are left out instead of failing the month."""
+        completions = FakeCompletions(fail_first_day=9, failures=10)
+        forecast = self._forecast(completions)
+
+        self.assertEqual(len(forecast), 22)
+        self.assertNotIn("20260609", [entry.date for entry in forecast])
+        self.assertEqual(len(completions.requests), 4 + prediction_ai.MAX_REPAIR_ROUNDS)
+
+    def test_invalid_day_is_repaired(self):
+        """Test that an implausible value re-requests only its day."""
+        completions = FakeCompletions(bad_day=12)
+        forecast = self._forecast(completions)
+
+        self.assertEqual(len(forecast), 30)
+        self.assertEqual(completions.requests[-1][0], (12, 12))
+        self.assertEqual(forecast[11].predicted_data.humidity, 70.0)
+
+    def test_repair_forecast(self):
+        """Test that only missing and implausible days are requested again."""
+        forecast = ForecastResponse.model_validate({"forecast": [
+            _entry(f"202606{day:02d}") for day in range(1, 31) if day not in (4, 5, 20)
+        ]}).forecast
+        # 13 June
+        forecast[10].predicted_data.moisture = 1.7
+        completions = FakeCompletions()
+
+        with patch.object(prediction_ai, "get_openai_client") as mock_get_client:
+            mock_get_client.return_value.beta.chat.completions = completions
+            repaired = prediction_ai.repair_forecast(forecast, "2025", "years=2019-2024", "", 2026, 6)
+
+        self.assertEqual(sorted(days for days, _ in completions.requests), [(4, 5), (13, 13), (20, 20)])
+        self.assertEqual([entry.date for entry in repaired], [f"202606{day:02d}" for day in range(1, 31)])
+        self.assertEqual(repaired[12].predicted_data.moisture, 0.7)
+
+    def test_day_ranges(self):
+        """Test that bad days are grouped into contiguous ranges."""
+        self.assertEqual(prediction_ai.day_ranges([1, 2, 3, 7, 9, 10], 8), [(1, 3), (7, 7), (9, 10)])
+        self.assertEqual(prediction_ai.day_ranges(list(range(1, 11)), 4), [(1, 4), (5, 8), (9, 10)])
+
+    def test_prompt_without_range(self):
+        """Test that the single-request prompt does not restrict days."""
+        prompt = prediction_ai.build_user_prompt("2025", "years=2019-2024", "{}")
+        self.assertIsNone(_DAY_RANGE.search(prompt))
+        self.assertIn("Only include the days 9 to 16",
+                      prediction_ai.build_user_prompt("2025", "years=2019-2024", "{}", days=(9, 16)))
+
+
+def _columnar(days):
+    values = _entry("")["predicted_data"]
+    return {"days": list(days), **{field: [values[field]] * len(days) for field in COLUMNAR_FIELDS}}
+
+
+class TestColumnarOutput(unittest.TestCase):
+    """Test cases for the compact columnar output contract."""
+
+    def _request(self, completion, days=None, month=6):
+        with patch.object(prediction_ai, "get_openai_client") as mock_get_client:
+            parse = mock_get_client.return_value.beta.chat.completions.parse
+            if isinstance(completion, Exception):
+                parse.side_effect = completion
+            else:
+                parse.return_value = completion
+            return request_forecast_days("2025", "years=2019-2024", "", 2026, month, days=days,
+                                         output_format="columnar")
+
+    def test_decode(self):
+        """Test that the arrays expand into the usual entries."""
+        content = json.dumps(_columnar(range(1, 31)))
+        forecast = self._request(_completion(content, ColumnarForecastResponse))
+
+        expected = ForecastResponse.model_validate({"forecast": [_entry(f"202606{day:02d}") for day in range(1, 31)]})
+        self.assertEqual(forecast, expected.forecast)
+
+    def test_decode_range(self):
+        """Test that days outside the requested range are dropped."""
+        content = json.dumps(_columnar(range(8, 18)))
+        forecast = self._request(_completion(content, ColumnarForecastResponse), days=(9, 16))
+        self.assertEqual([entry.date for entry in forecast], [f"202606{day:02d}" for day in range(9, 17)])
+
+    def test_length_mismatch(self):
+        """Test that arrays of different lengths are rejected and the request reports no days."""
+        document = _columnar(range(1, 4))
+        document["humidity"] = document["humidity"][:2]
+        with self.assertRaises(ValueError):
+            ColumnarForecastResponse.model_validate_json(json.dumps(document))
+        with self.assertRaises(ValueError) as context:
+            _completion(json.dumps(document), ColumnarForecastResponse)
+        self.assertIsNone(self._request(context.exception))
+
+    def test_month_required(self):
+        """Test that the columnar format is not requested without the month."""
+        with patch.object(prediction_ai, "get_openai_client") as mock_get_client:
+            forecast = prediction_ai.get_month_forecast_array("2025", {}, BEST_CONDITIONS, output_format="columnar")
+
+        self.assertIsNone(forecast)
+        mock_get_client.return_value.beta.chat.completions.parse.assert_not_called()
+
+    def test_output_is_less_than_half(self):
+        """Test that the columnar contract needs less than half the output of the entries one."""
+        entries = json.dumps({"forecast": [_entry(f"202606{day:02d}") for day in range(1, 31)]}, indent=2)
+        columnar = json.dumps(_columnar(range(1, 31)))
+        self.assertLess(len(columnar), len(entries) / 2)
+
+    def test_columnar_request(self):
+        """Test a single columnar request end to end."""
+        content = json.dumps(_columnar(range(1, 31)))
+        with patch.object(prediction_ai, "get_openai_client") as mock_get_client, \
+                patch.object(prediction_ai, "compact_dataset", return_value="years=2019-2024"):
+            parse = mock_get_client.return_value.beta.chat.completions.parse
+            parse.return_value = _completion(content, ColumnarForecastResponse)
+            forecast = prediction_ai.get_month_forecast_array("2025", {}, BEST_CONDITIONS, month="jun",
+                                                              output_format="columnar")
+
+        self.assertEqual(len(forecast), 30)
+        self.assertEqual(forecast[0].predicted_data.status, 1.0)
+        self.assertIs(parse.call_args.kwargs["response_format"], ColumnarForecastResponse)
+        self.assertIn('"days": [1, 2, ...]', parse.call_args.kwargs["messages"][-1]["content"])
+        self.assertEqual(parse.call_count, 1)
+
+    def test_single_request_repairs_missing_days(self):
+        """Test that a month missing days only re-requests those days."""
+        month = json.dumps({"forecast": [_entry(f"202606{day:02d}") for day in range(1, 26)]})
+        tail = json.dumps({"forecast": [_entry(f"202606{day:02d}") for day in range(26, 31)]})
+        with patch.object(prediction_ai, "get_openai_client") as mock_get_client, \
+                patch.object(prediction_ai, "compact_dataset", return_value="years=2019-2024"):
+            parse = mock_get_client.return_value.beta.chat.completions.parse
+            parse.side_effect = [_completion(month, LLMForecastResponse), _completion(tail, LLMForecastResponse)]
+            forecast = prediction_ai.get_month_forecast_array("2025", {}, BEST_CONDITIONS)
+
+        self.assertEqual(len(forecast), 30)
+        self.assertIs(parse.call_args_list[0].kwargs["response_format"], LLMForecastResponse)
+        self.assertIn("Only include the days 26 to 30", parse.call_args_list[1].kwargs["messages"][-1]["content"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the forecast prompt compaction.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../'))
+
+from lib.api.chatgpt.prompt_compaction import (
+    RAW_VALUE_TOKENS, compact_history, compact_conditions, log_compaction, raw_history_values
+)
+from lib.api.nasa.series import NASASeries
+from lib.forecast.climatology import build_climatology
+
+
+def _build_series():
+    dates = np.arange(np.datetime64("2019-01-01"), np.datetime64("2025-01-01"))
+    years = (dates.astype("datetime64[Y]").astype(np.int64) + 1970 - 2019).astype(np.float32)
+    return NASASeries(dates=dates, columns={
+        "T2M_MAX": np.ma.masked_array(20.0 + years),
+        "RH2M": np.ma.masked_array(np.full(len(dates), 70.0, dtype=np.float32)),
+    })
+
+
+class TestPromptCompaction(unittest.TestCase):
+    """Test cases for the prompt compaction stage."""
+
+    def test_compact_history_table(self):
+        """Test the per-day statistics table for one month."""
+        history = compact_history(_build_series().select_months("March"))
+        lines = history.splitlines()
+
+        self.assertEqual(lines[0], "years=2019-2024")
+        self.assertEqual(lines[1], "T2M_MAX")
+        self.assertEqual(lines[2], "mmdd,mean,min,max,trend")
+        self.assertEqual(lines[3], "0301,22.50,20.00,25.00,1.00")
+        # one block per parameter, 31 days each
+        self.assertEqual(len(lines), 1 + 2 * (2 + 31))
+
+    def test_compact_climatology_table(self):
+        """Test the table rendered from a precomputed climatology."""
+        history = compact_history(build_climatology(_build_series()).select_months("March"))
+        lines = history.splitlines()
+
+        self.assertEqual(lines[0], "years=2019-2024")
+        self.assertEqual(lines[2], "mmdd,mean,p10,p90,trend")
+        self.assertEqual(lines[3], "0301,22.50,20.50,24.50,1.00")
+        self.assertEqual(len(lines), 1 + 2 * (2 + 31))
+
+    def test_compaction_reduces_size(self):
+        """Test that the compact table needs far fewer tokens than the raw history."""
+        march = _build_series().select_months(3)
+        with self.assertLogs(level="INFO"):
+            report = log_compaction(march, compact_history(march))
+        self.assertEqual(report["before"], len(march) * len(march.parameters) * RAW_VALUE_TOKENS)
+        self.assertLess(report["after"] * 2, report["before"])
+
+    def test_raw_history_is_not_rendered(self):
+        """Test that the raw history size is estimated without rendering it."""
+        march = _build_series().select_months(3)
+        with patch.object(NASASeries, "to_parameter_dict") as to_parameter_dict:
+            log_compaction(march, compact_history(march))
+        to_parameter_dict.assert_not_called()
+
+    def test_climatology_raw_values(self):
+        """Test the raw value count of the history a climatology summarizes."""
+        climatology = build_climatology(_build_series()).select_months(3)
+        years = climatology.end_year - climatology.start_year + 1
+        self.assertEqual(raw_history_values(climatology), years * 31 * len(climatology.parameters))
+
+    def test_compact_conditions(self):
+        """Test that metadata is dropped from the crop conditions."""
+        conditions = {"_id": "abc", "crop_name": "Tomato", "temperature": 24, "created_at": "2025-01-01"}
+        self.assertEqual(compact_conditions(conditions), "crop_name=Tomato,temperature=24")
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
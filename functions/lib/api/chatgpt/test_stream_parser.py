@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streamed forecast parsing.
+"""
+
+import json
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../'))
+
+from lib.api.chatgpt import prediction_ai
+from lib.api.chatgpt.stream_parser import ForecastStreamParser
+from lib.forecast.schemas import LLMForecastResponse
+from lib.forecast.test_climatology import BEST_CONDITIONS
+
+
+def _entry(day, **extra):
+    return {
+        "date": f"202606{day:02d}",
+        "predicted_data": {
+            "moisture": 0.7, "temperature": 24.0, "precipitation": 3.0,
+            "snow_precipitation": 0.0, "soil_temperature": 22.0, "humidity": 70.0, **extra,
+        },
+    }
+
+
+def _document(days=3):
+    return json.dumps({"forecast": [_entry(day) for day in range(1, days + 1)]}, indent=2)
+
+
+def _fragments(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+class TestForecastStreamParser(unittest.TestCase):
+    """Test cases for the incremental parser."""
+
+    def test_entries_arrive_as_they_complete(self):
+        """Test that every entry is returned by the fragment that closes it."""
+        parser = ForecastStreamParser()
+        document = _document()
+        first_end = document.index("}\n    }") + len("}\n    }")
+
+        self.assertEqual(parser.feed(document[:first_end - 1]), [])
+        self.assertEqual(parser.feed(document[first_end - 1:first_end]), [_entry(1)])
+        self.assertEqual(parser.feed(document[first_end:]), [_entry(2), _entry(3)])
+        self.assertTrue(parser.finished)
+
+    def test_any_fragment_size(self):
+        """Test that the split points don't change the result."""
+        document = _document(days=5)
+        for size in (1, 3, 7, 64, len(document)):
+            parser = ForecastStreamParser()
+            entries = [entry for fragment in _fragments(document, size) for entry in parser.feed(fragment)]
+            self.assertEqual(entries, json.loads(document)["forecast"])
+
+    def test_braces_inside_strings(self):
+        """Test that braces and escaped quotes in strings are not counted."""
+        document = json.dumps({"note": "x", "forecast": [{"date": "a}\\\"{", "value": [1, 2]}]})
+        parser = ForecastStreamParser()
+        entries = [entry for fragment in _fragments(document, 2) for entry in parser.feed(fragment)]
+        self.assertEqual(entries, [{"date": "a}\\\"{", "value": [1, 2]}])
+
+    def test_empty_forecast(self):
+        """Test an empty forecast array."""
+        parser = ForecastStreamParser()
+        self.assertEqual(parser.feed('{"forecast": []}'), [])
+        self.assertTrue(parser.finished)
+
+
+class FakeStream:
+    """Context manager streaming a completion as content delta events."""
+
+    def __init__(self, document, size, usage=None):
+        self.events = [SimpleNamespace(type="content.delta", delta=fragment) for fragment in _fragments(document, size)]
+        self.usage = usage
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return iter([SimpleNamespace(type="chunk")] + self.events)
+
+    def get_final_completion(self):
+        return SimpleNamespace(usage=self.usage)
+
+
+def _completion(entries):
+    parsed = LLMForecastResponse.model_validate({"forecast": entries})
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed, refusal=None))], usage=None)
+
+
+class TestStreamMonthForecastArray(unittest.TestCase):
+    """Test cases for the streaming forecast request."""
+
+    def _stream(self, mock_get_client, published):
+        with patch.object(prediction_ai, "compact_dataset", return_value="years=2019-2024"):
+            return prediction_ai.stream_month_forecast_array(
+                current_year="2025", dataset_nasa={}, best_conditions=BEST_CONDITIONS, month="June",
+                on_entry=published.append
+            )
+
+    @patch('lib.api.chatgpt.prediction_ai.get_openai_client')
+    def test_streamed_entries_are_scored_and_published(self, mock_get_client):
+        """Test that every valid day is scored and handed to the callback, bad days are repaired."""
+        # Day 2 has no predicted data, day 3 an implausible humidity and 20260701 is outside the month
+        days = [_entry(1), {"date": "20260602"}, _entry(3, humidity=170.0)]
+        days += [_entry(day) for day in range(4, 31)] + [_entry(4), {**_entry(1), "date": "20260701"}]
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        client = mock_get_client.return_value
+        client.beta.chat.completions.stream.return_value = FakeStream(json.dumps({"forecast": days}), 16, usage)
+        client.beta.chat.completions.parse.return_value = _completion([_entry(2), _entry(3)])
+
+        published = []
+        entries = self._stream(mock_get_client, published)
+
+        self.assertEqual([entry.date for entry in entries], [f"202606{day:02d}" for day in range(1, 31)])
+        # Streamed days first, the repaired days once the stream has ended; nothing is published twice
+        self.assertEqual([entry.date for entry in published[-2:]], ["20260602", "20260603"])
+        self.assertEqual(sorted(entry.date for entry in published), [entry.date for entry in entries])
+        self.assertEqual(entries[0].predicted_data.status, 1.0)
+        self.assertEqual(entries[2].predicted_data.humidity, 70.0)
+
+        kwargs = client.beta.chat.completions.stream.call_args.kwargs
+        self.assertIs(kwargs["response_format"], LLMForecastResponse)
+        self.assertIn("Only include the days 2 to 3",
+                      client.beta.chat.completions.parse.call_args.kwargs["messages"][-1]["content"])
+
+    @patch('lib.api.chatgpt.prediction_ai.get_openai_client')
+    def test_stream_error(self, mock_get_client):
+        """Test that a failed request returns None."""
+        mock_get_client.return_value.beta.chat.completions.stream.side_effect = RuntimeError("timeout")
+        self.assertIsNone(self._stream(mock_get_client, []))
+
+    @patch('lib.api.chatgpt.prediction_ai.get_openai_client')
+    def test_month_required(self, mock_get_client):
+        """Test that a forecast without a known month is not streamed."""
+        self.assertIsNone(prediction_ai.stream_month_forecast_array("2025", {}, BEST_CONDITIONS))
+        mock_get_client.return_value.beta.chat.completions.stream.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -2,7 +2,15 @@
 NASA Power API module for fetching meteorological data.
 """
 
+from .client import request_daily_point, latency_stats
+from .async_client import fetch_many, fetch_many_sync, PointResult
 from .daily_data import fetch_nasa_daily_data, DEFAULT_PARAMETERS
+from .cache import NASADiskCache, GridCell, snap_to_grid, get_default_cache
+from .history import fetch_year_window, fetch_year_window_series
+from .series import NASASeries, series_from_dict
+from .series_file import open_series_file, write_series_file
+from .spatial import GridCellIndex, SpatialSeriesStore, get_spatial_store
+from .unified import UNION_PARAMETERS, fetch_window, fetch_window_series
 from .types import (
     NASAPowerResponse,
     ParameterData,
@@ -15,8 +23,29 @@ from .types import (
 )
 
 __all__ = [
+    'request_daily_point',
+    'latency_stats',
+    'fetch_many',
+    'fetch_many_sync',
+    'PointResult',
     'fetch_nasa_daily_data',
     'DEFAULT_PARAMETERS',
+    'NASADiskCache',
+    'GridCell',
+    'snap_to_grid',
+    'get_default_cache',
+    'fetch_year_window',
+    'fetch_year_window_series',
+    'NASASeries',
+    'series_from_dict',
+    'open_series_file',
+    'write_series_file',
+    'GridCellIndex',
+    'SpatialSeriesStore',
+    'get_spatial_store',
+    'UNION_PARAMETERS',
+    'fetch_window',
+    'fetch_window_series',
     'NASAPowerResponse',
     'ParameterData',
     'Geometry',
@@ -0,0 +1,164 @@
+"""
+Async NASA POWER client for fetching many points concurrently.
+
+Uses `httpx.AsyncClient` with a bounded concurrency semaphore and yields
+results as they complete, so fetching N points takes about as long as the
+slowest few requests instead of the sum of all of them. Retries, backoff
+and latency recording follow the synchronous client.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+
+from .client import (
+    NASA_POWER_BASE_URL,
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    MAX_RETRIES,
+    RETRY_STATUS_CODES,
+    backoff_delay,
+    build_daily_params,
+    latency_stats,
+)
+from .types import NASAPowerResponse
+
+DEFAULT_CONCURRENCY = 8
+
+# A point is a (latitude, longitude) tuple or a mapping with latitude/longitude,
+# e.g. a LocationsCollection document
+Point = Union[Tuple[float, float], Dict[str, Any]]
+
+
+@dataclass
+class PointResult:
+    """Outcome of fetching one point."""
+    point: Point
+    response: Optional[NASAPowerResponse] = None
+    error: Optional[Exception] = None
+
+
+def point_coordinates(point: Point) -> Tuple[float, float]:
+    """Return (latitude, longitude) of a point."""
+    if isinstance(point, dict):
+        return float(point["latitude"]), float(point["longitude"])
+    latitude, longitude = point
+    return float(latitude), float(longitude)
+
+
+async def request_daily_point_async(
+    client: httpx.AsyncClient, params: Dict[str, Any], max_retries: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Async counterpart of `client.request_daily_point`.
+
+    Raises:
+        httpx.HTTPError: If the request still fails after retrying
+    """
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            response = await client.get(NASA_POWER_BASE_URL, params=params)
+        except httpx.TransportError as e:
+            latency_stats.record(time.perf_counter() - started, success=False)
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logging.warning(f"NASA POWER request failed ({e}), retrying in {delay:.1f}s")
+        else:
+            elapsed = time.perf_counter() - started
+            if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+                latency_stats.record(elapsed, success=False)
+                delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+                logging.warning(f"NASA POWER returned {response.status_code}, retrying in {delay:.1f}s")
+            else:
+                latency_stats.record(elapsed, success=response.is_success)
+                response.raise_for_status()
+                return response.json()
+
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def create_async_client(concurrency: int = DEFAULT_CONCURRENCY) -> httpx.AsyncClient:
+    """Create an AsyncClient sized for `concurrency` parallel requests."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        headers={"accept": "application/json"},
+    )
+
+
+async def fetch_many(
+    points: Iterable[Point],
+    start_date: str,
+    end_date: str,
+    parameters: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    columnar: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[PointResult]:
+    """
+    Fetch daily data for many points, yielding each result as it completes.
+
+    Args:
+        points: (latitude, longitude) tuples or location documents
+        start_date: Start date formatted as YYYYMMDD
+        end_date: End date formatted as YYYYMMDD
+        parameters: Comma separated NASA POWER parameters
+        concurrency: Maximum number of requests in flight
+        columnar: Build the NumPy-backed `series` of every response
+        client: Optional AsyncClient to use instead of a new one
+
+    Yields:
+        PointResult per point, in completion order. Failures are reported in
+        `error` instead of aborting the whole batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    own_client = client is None
+    client = client or create_async_client(concurrency)
+
+    async def fetch_one(point: Point) -> PointResult:
+        try:
+            latitude, longitude = point_coordinates(point)
+            params = build_daily_params(latitude, longitude, start_date, end_date, parameters)
+            async with semaphore:
+                data = await request_daily_point_async(client, params)
+            return PointResult(point=point, response=NASAPowerResponse.from_dict(data, columnar=columnar))
+        except Exception as e:
+            logging.error(f"Failed to fetch NASA data for {point}: {e}")
+            return PointResult(point=point, error=e)
+
+    tasks = [asyncio.ensure_future(fetch_one(point)) for point in points]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Consumer stopped early: don't leave requests running in the background
+        for task in tasks:
+            task.cancel()
+        if own_client:
+            await client.aclose()
+
+
+def fetch_many_sync(
+    points: Iterable[Point],
+    start_date: str,
+    end_date: str,
+    parameters: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    columnar: bool = False,
+) -> List[PointResult]:
+    """Run `fetch_many` from synchronous code and collect all results."""
+
+    async def collect() -> List[PointResult]:
+        return [result async for result in fetch_many(points, start_date, end_date, parameters, concurrency, columnar)]
+
+    return asyncio.run(collect())
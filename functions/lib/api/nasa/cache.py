@@ -0,0 +1,215 @@
+"""
+Persistent cache for NASA POWER daily responses.
+
+NASA POWER serves its daily point data from a fixed MERRA-2 grid
+(0.5° latitude x 0.625° longitude), so every coordinate inside the same
+cell returns exactly the same series. Responses are cached on disk keyed
+by the snapped grid cell, the requested parameter set and the date window.
+Columnar series can be cached as memory-mapped binary files (see
+series_file) next to the JSON responses.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .series import NASASeries
+from .series_file import open_series_file, write_series_file
+
+# NASA POWER (MERRA-2) grid resolution
+NASA_GRID_LAT_STEP = 0.5
+NASA_GRID_LON_STEP = 0.625
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "nasa_power_cache")
+# /tmp is an in-memory filesystem on Cloud Functions and counts against the
+# instance memory (256 MB by default). Raise NASA_CACHE_MAX_BYTES only
+# together with the function's memory setting (see README).
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+_CACHE_FILE_SUFFIX = ".json"
+_SERIES_FILE_SUFFIX = ".series"
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """Center of a NASA POWER grid cell."""
+    latitude: float
+    longitude: float
+
+    @property
+    def key(self) -> str:
+        """Stable string identifier of the cell."""
+        return f"{self.latitude:.3f}_{self.longitude:.3f}"
+
+
+def snap_to_grid(latitude: float, longitude: float) -> GridCell:
+    """Snap a coordinate to the center of the NASA POWER grid cell containing it."""
+    snapped_lat = round(latitude / NASA_GRID_LAT_STEP) * NASA_GRID_LAT_STEP
+    snapped_lon = round(longitude / NASA_GRID_LON_STEP) * NASA_GRID_LON_STEP
+
+    # Keep the cell inside the valid coordinate range
+    snapped_lat = min(90.0, max(-90.0, snapped_lat))
+    if snapped_lon >= 180.0:
+        snapped_lon -= 360.0
+
+    # round() removes float noise such as 0.6250000000000001
+    return GridCell(latitude=round(snapped_lat, 4), longitude=round(snapped_lon, 4))
+
+
+def make_cache_key(cell: GridCell, parameters: str, start_date: str, end_date: str) -> str:
+    """Build the cache key for a cell, a parameter set and a YYYYMMDD date window."""
+    normalized_parameters = ",".join(sorted(p.strip().upper() for p in parameters.split(",") if p.strip()))
+    return f"{cell.key}|{normalized_parameters}|{start_date}-{end_date}"
+
+
+class NASADiskCache:
+    """
+    Size-bounded on-disk LRU cache of NASA POWER JSON responses and series.
+
+    Each entry is stored as one JSON (or binary series) file. The file
+    modification time is used as the recency marker, so the least recently
+    used entries are evicted first once the total size exceeds `max_bytes`. Writes are atomic, which
+    makes the directory safe to share between worker processes on one host.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or os.getenv("NASA_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.getenv("NASA_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for `key`, or None on a miss."""
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            # Mark the entry as recently used
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Store `data` under `key` and evict old entries if the cache is full."""
+        path = self._path_for(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(data, tmp_file, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.error(f"Failed to write NASA cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._evict()
+
+    def get_series(self, key: str) -> Optional[NASASeries]:
+        """Return the cached series for `key` as memory-mapped views, or None on a miss."""
+        path = self._path_for(key, _SERIES_FILE_SUFFIX)
+        try:
+            series = open_series_file(path)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return series
+
+    def set_series(self, key: str, series: NASASeries) -> None:
+        """Store `series` under `key` in the binary series format."""
+        try:
+            write_series_file(self._path_for(key, _SERIES_FILE_SUFFIX), series)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to write NASA series cache entry {key}: {e}")
+            return
+
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current on-disk size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size_bytes": sum(entry.stat().st_size for entry in self._entries()),
+            }
+
+    def _path_for(self, key: str, suffix: str = _CACHE_FILE_SUFFIX) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + suffix)
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.directory)
+                    if entry.is_file() and entry.name.endswith((_CACHE_FILE_SUFFIX, _SERIES_FILE_SUFFIX))]
+        except OSError:
+            return []
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            total_size = 0
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+            if total_size <= self.max_bytes:
+                return
+
+            # Oldest (least recently used) first
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+                self.evictions += 1
+
+
+_default_cache: Optional[NASADiskCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> NASADiskCache:
+    """Return the process-wide NASA cache, creating it on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = NASADiskCache()
+        return _default_cache
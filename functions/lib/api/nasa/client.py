@@ -0,0 +1,157 @@
+"""
+Shared HTTP client for the NASA POWER API.
+
+One pooled `requests.Session` per process keeps TCP/TLS connections alive
+between calls. Requests have explicit connect/read timeouts and are retried
+with exponential backoff and jitter on 429/5xx responses and connection
+errors. The latency of every call is recorded in `latency_stats`.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# NASA Power API Configuration
+NASA_POWER_BASE_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+
+CONNECT_TIMEOUT = float(os.getenv("NASA_POWER_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.getenv("NASA_POWER_READ_TIMEOUT", 60))
+MAX_RETRIES = int(os.getenv("NASA_POWER_MAX_RETRIES", 3))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+POOL_MAXSIZE = 16
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LatencyStats:
+    """Thread-safe record of NASA POWER call latencies."""
+
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.calls = 0
+        self.failures = 0
+        self._samples: List[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, success: bool = True) -> None:
+        with self._lock:
+            self.calls += 1
+            if not success:
+                self.failures += 1
+            self._samples.append(seconds)
+            if len(self._samples) > self.max_samples:
+                del self._samples[0]
+
+    def summary(self) -> Dict[str, float]:
+        """Return call counts and latency percentiles in seconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+            calls, failures = self.calls, self.failures
+        if not samples:
+            return {"calls": calls, "failures": failures}
+        return {
+            "calls": calls,
+            "failures": failures,
+            "mean": sum(samples) / len(samples),
+            "p50": samples[len(samples) // 2],
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            "max": samples[-1],
+        }
+
+
+latency_stats = LatencyStats()
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"accept": "application/json"})
+            _session = session
+        return _session
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based).
+
+    Uses exponential backoff with full jitter, or the server's Retry-After
+    header when it is given in seconds.
+    """
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def build_daily_params(
+    latitude: float, longitude: float, start_date: str, end_date: str, parameters: str
+) -> Dict[str, Any]:
+    """Build the query parameters of a daily point request."""
+    return {
+        "start": start_date,
+        "end": end_date,
+        "latitude": latitude,
+        "longitude": longitude,
+        "community": "re",
+        "parameters": parameters,
+        "format": "json",
+        "units": "metric",
+        "header": "true",
+    }
+
+
+def request_daily_point(
+    params: Dict[str, Any],
+    timeout: Optional[Tuple[float, float]] = None,
+    max_retries: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Call the NASA POWER daily point endpoint and return the JSON response.
+
+    Raises:
+        requests.RequestException: If the request still fails after retrying
+    """
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    session = get_session()
+
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            response = session.get(NASA_POWER_BASE_URL, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            latency_stats.record(time.perf_counter() - started, success=False)
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logging.warning(f"NASA POWER request failed ({e}), retrying in {delay:.1f}s")
+        else:
+            elapsed = time.perf_counter() - started
+            if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+                latency_stats.record(elapsed, success=False)
+                delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+                logging.warning(f"NASA POWER returned {response.status_code}, retrying in {delay:.1f}s")
+            else:
+                latency_stats.record(elapsed, success=response.ok)
+                logging.info(f"NASA POWER call took {elapsed:.2f}s (status {response.status_code})")
+                response.raise_for_status()
+                return response.json()
+
+        time.sleep(delay)
+        attempt += 1
@@ -3,12 +3,11 @@ from typing import Optional
 from datetime import datetime
 import logging
 
+from .cache import snap_to_grid
 from .types import NASAPowerResponse
+from .unified import DAILY_PARAMETERS, fetch_window
 
-# NASA Power API Configuration
-NASA_POWER_BASE_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
-
-DEFAULT_PARAMETERS = "T2M,RH2M,PRECTOTCORR,GWETROOT,GWETTOP,PRECSNO,TSOIL5"
+DEFAULT_PARAMETERS = DAILY_PARAMETERS
 
 
 def _validate_coordinates(latitude: float, longitude: float) -> None:
@@ -39,15 +38,21 @@ def fetch_nasa_daily_data(
     longitude: float,
     start_date: str,
     end_date: str,
+    columnar: bool = False,
 ) -> NASAPowerResponse:
     """
     Fetch daily meteorological data from NASA Power API.
 
+    Data is served by the shared fetch layer (see unified): the window is
+    cut from the point's grid cell years already stored by other consumers,
+    otherwise only the requested dates are downloaded.
+
     Args:
         latitude: Point latitude value
         longitude: Point longitude value
         start_date: Start date formatted as YYYYMMDD
         end_date: End date formatted as YYYYMMDD
+        columnar: Build the NumPy-backed `series` instead of per-date dictionaries
 
     Returns:
         NASAPowerResponse object containing the structured API response data
@@ -60,32 +65,11 @@ def fetch_nasa_daily_data(
     _validate_coordinates(latitude, longitude)
     _validate_dates(start_date, end_date)
 
-    # Build query parameters
-    params = {
-        "start": start_date,
-        "end": end_date,
-        "latitude": latitude,
-        "longitude": longitude,
-        "community": "re",
-        "parameters": DEFAULT_PARAMETERS,
-        "format": "json",
-        "units": "metric",
-        "header": "true",
-    }
-
     try:
         logging.info(f"Fetching NASA data for coordinates ({latitude}, {longitude})")
-        response = requests.get(
-            NASA_POWER_BASE_URL,
-            params=params,
-            headers={"accept": "application/json"},
-            timeout=30,
-        )
-        response.raise_for_status()
-
-        data = response.json()
+        data = fetch_window(snap_to_grid(latitude, longitude), start_date, end_date, DEFAULT_PARAMETERS)
         logging.info("Successfully fetched NASA data")
-        return NASAPowerResponse.from_dict(data)
+        return NASAPowerResponse.from_dict(data, columnar=columnar)
 
     except requests.RequestException as e:
         logging.error(f"Failed to fetch NASA data: {e}")
@@ -0,0 +1,234 @@
+"""
+Incremental fetching of NASA POWER history by calendar year.
+
+Historical years never change once they are over, so the daily data is
+stored per grid cell per year. A request for a year window only downloads
+the years that are not stored yet (one request per consecutive run of
+missing years) and rebuilds the window from the stored years. When the
+window moves forward in January, only the newly completed year is fetched.
+
+NASA POWER publishes with a lag, so right after New Year the last days of
+the previous year can still be fill values. A completed year is only
+stored once its tail is published (see `year_is_final`).
+
+`fetch_year_window_series` additionally keeps each assembled window of
+completed years as a memory-mapped series file, so reopening it costs a
+mmap instead of parsing the stored JSON years again.
+"""
+
+import datetime
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import GridCell, NASADiskCache, get_default_cache, make_cache_key
+from .client import build_daily_params, request_daily_point
+from .series import DEFAULT_FILL_VALUE, NASASeries, series_from_dict
+
+# Days at the end of a completed year that must be published before it is stored
+FINAL_TAIL_DAYS = 31
+
+
+def _current_year() -> int:
+    return datetime.date.today().year
+
+
+def _run_end_date(last_year: int) -> str:
+    """Last date to request for a run ending in `last_year`, never after today."""
+    return min(f"{last_year}1231", datetime.date.today().strftime("%Y%m%d"))
+
+
+def year_is_final(data: Dict[str, Any], year: int) -> bool:
+    """
+    True if every parameter of `data` has 31 December of `year` and no fill
+    value in the last FINAL_TAIL_DAYS days of the year.
+    """
+    fill_value = (data.get("header") or {}).get("fill_value", DEFAULT_FILL_VALUE)
+    last_day = datetime.date(year, 12, 31)
+    tail = [(last_day - datetime.timedelta(days=offset)).strftime("%Y%m%d") for offset in range(FINAL_TAIL_DAYS)]
+    for values in data["properties"]["parameter"].values():
+        if values.get(tail[0]) is None or any(values.get(date_key) == fill_value for date_key in tail):
+            return False
+    return True
+
+
+def series_year_is_final(series: NASASeries, year: int) -> bool:
+    """`year_is_final` for a columnar series, whose fill values are masked."""
+    tail_start = datetime.date(year, 12, 31) - datetime.timedelta(days=FINAL_TAIL_DAYS - 1)
+    tail = series.slice(tail_start.strftime("%Y%m%d"), f"{year}1231")
+    if not len(tail) or tail.end != np.datetime64(f"{year}-12-31"):
+        return False
+    return not any(np.ma.getmaskarray(tail[name]).any() for name in tail)
+
+
+def year_cache_key(cell: GridCell, parameters: str, year: int) -> str:
+    """Cache key of one stored year."""
+    return make_cache_key(cell, parameters, f"{year}0101", f"{year}1231")
+
+
+def missing_year_runs(years: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted missing years into (first, last) runs of consecutive years."""
+    runs: List[Tuple[int, int]] = []
+    for year in years:
+        if runs and runs[-1][1] == year - 1:
+            runs[-1] = (runs[-1][0], year)
+        else:
+            runs.append((year, year))
+    return runs
+
+
+def split_by_year(data: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    """Split a multi-year NASA POWER response into one response per year."""
+    per_year: Dict[int, Dict[str, Dict[str, float]]] = {}
+    for name, values in data["properties"]["parameter"].items():
+        for date_key, value in values.items():
+            per_year.setdefault(int(date_key[:4]), {}).setdefault(name, {})[date_key] = value
+
+    header = data.get("header") or {}
+    return {
+        year: {
+            **data,
+            "properties": {**data["properties"], "parameter": parameter},
+            "header": {**header, "start": f"{year}0101", "end": f"{year}1231"},
+        }
+        for year, parameter in per_year.items()
+    }
+
+
+def merge_years(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-year responses (in chronological order) into one response."""
+    first = payloads[0]
+    parameter: Dict[str, Dict[str, float]] = {}
+    for payload in payloads:
+        for name, values in payload["properties"]["parameter"].items():
+            parameter.setdefault(name, {}).update(values)
+
+    header = first.get("header") or {}
+    return {
+        **first,
+        "properties": {**first["properties"], "parameter": parameter},
+        "header": {**header, "start": payloads[0]["header"]["start"], "end": payloads[-1]["header"]["end"]},
+    }
+
+
+def is_completed_year_window(start_date: str, end_date: str) -> bool:
+    """True if a YYYYMMDD window is made of whole calendar years that are over."""
+    return start_date.endswith("0101") and end_date.endswith("1231") and int(end_date[:4]) < _current_year()
+
+
+def read_stored_years(
+    cell: GridCell,
+    start_year: int,
+    end_year: int,
+    parameters: str,
+    cache: Optional[NASADiskCache] = None,
+) -> Optional[Dict[str, Any]]:
+    """Merged stored years `start_year`..`end_year`, or None unless every one of them is stored."""
+    if end_year >= _current_year():
+        return None
+    cache = cache or get_default_cache()
+
+    payloads = []
+    for year in range(start_year, end_year + 1):
+        stored = cache.get(year_cache_key(cell, parameters, year))
+        if stored is None:
+            return None
+        payloads.append(stored)
+    return merge_years(payloads)
+
+
+def fetch_date_window(cell: GridCell, start_date: str, end_date: str, parameters: str) -> Dict[str, Any]:
+    """
+    Download a YYYYMMDD window of `cell` exactly as asked for, without storing it.
+
+    Raises:
+        requests.RequestException: If the download fails
+    """
+    logging.info(f"Fetching NASA data for cell {cell.key}, {start_date}-{end_date}")
+    return request_daily_point(build_daily_params(cell.latitude, cell.longitude, start_date, end_date, parameters))
+
+
+def fetch_year_window(
+    cell: GridCell,
+    start_year: int,
+    end_year: int,
+    parameters: str,
+    cache: Optional[NASADiskCache] = None,
+) -> Dict[str, Any]:
+    """
+    Return NASA POWER daily data for `start_year`..`end_year` (inclusive).
+
+    Stored years are read from the cache; missing years are downloaded in
+    as few requests as possible. Only completed years (before the current
+    one) whose tail is published are stored, any other year is fetched
+    again on the next call.
+
+    Raises:
+        requests.RequestException: If a download fails
+        ValueError: If NASA POWER returned no data for the window
+    """
+    cache = cache or get_default_cache()
+    completed_before = _current_year()
+
+    payloads: Dict[int, Dict[str, Any]] = {}
+    missing: List[int] = []
+    for year in range(start_year, end_year + 1):
+        stored = cache.get(year_cache_key(cell, parameters, year)) if year < completed_before else None
+        if stored is not None:
+            payloads[year] = stored
+        else:
+            missing.append(year)
+
+    for first, last in missing_year_runs(missing):
+        logging.info(f"Fetching NASA data for cell {cell.key}, years {first}-{last}")
+        params = build_daily_params(cell.latitude, cell.longitude, f"{first}0101", _run_end_date(last), parameters)
+        for year, payload in split_by_year(request_daily_point(params)).items():
+            payloads[year] = payload
+            if year < completed_before:
+                if year_is_final(payload, year):
+                    cache.set(year_cache_key(cell, parameters, year), payload)
+                else:
+                    logging.info(f"NASA data for cell {cell.key}, year {year} is not fully published yet, not stored")
+
+    if not payloads:
+        raise ValueError(f"No NASA data returned for cell {cell.key}, years {start_year}-{end_year}")
+
+    if missing:
+        logging.info(f"NASA history for cell {cell.key}: {len(missing)} year(s) downloaded, "
+                     f"{end_year - start_year + 1 - len(missing)} year(s) reused")
+
+    return merge_years([payloads[year] for year in sorted(payloads)])
+
+
+def fetch_year_window_series(
+    cell: GridCell,
+    start_year: int,
+    end_year: int,
+    parameters: str,
+    cache: Optional[NASADiskCache] = None,
+) -> NASASeries:
+    """
+    Same as `fetch_year_window`, returned as a columnar series.
+
+    Windows of completed years are cached in the binary series format and
+    returned as memory-mapped views on later calls.
+
+    Raises:
+        requests.RequestException: If a download fails
+        ValueError: If NASA POWER returned no data for the window
+    """
+    cache = cache or get_default_cache()
+    window_key = make_cache_key(cell, parameters, f"{start_year}0101", f"{end_year}1231")
+    cacheable = end_year < _current_year()
+
+    if cacheable:
+        series = cache.get_series(window_key)
+        if series is not None:
+            return series
+
+    data = fetch_year_window(cell, start_year, end_year, parameters, cache=cache)
+    series = series_from_dict(data)
+    if cacheable and year_is_final(data, end_year):
+        cache.set_series(window_key, series)
+    return series
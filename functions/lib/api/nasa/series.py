@@ -0,0 +1,241 @@
+"""
+Columnar time-series representation of NASA POWER daily data.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+DEFAULT_FILL_VALUE = -999.0
+
+DateLike = Union[str, int, np.datetime64]
+MonthLike = Union[int, str]
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+_MONTH_LOOKUP = {
+    **{name.lower(): number for number, name in enumerate(MONTH_NAMES, start=1)},
+    **{name[:3].lower(): number for number, name in enumerate(MONTH_NAMES, start=1)},
+}
+
+
+def parse_date_keys(date_keys: List[str]) -> np.ndarray:
+    """Convert YYYYMMDD strings into a datetime64[D] array in one vectorized pass."""
+    numeric = np.fromiter(map(int, date_keys), dtype=np.int64, count=len(date_keys))
+    years = (numeric // 10000 - 1970).astype("datetime64[Y]")
+    months = years.astype("datetime64[M]") + (numeric // 100 % 100 - 1).astype("timedelta64[M]")
+    return months.astype("datetime64[D]") + (numeric % 100 - 1).astype("timedelta64[D]")
+
+
+def to_datetime64(value: DateLike) -> np.datetime64:
+    """Convert a YYYYMMDD string/int or a datetime64 into datetime64[D]."""
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    return parse_date_keys([str(value)])[0]
+
+
+def parse_month(month: MonthLike) -> int:
+    """
+    Normalize a month given as a number (3, "3", "03"), a full name ("March")
+    or an abbreviation ("mar") into its number 1..12.
+    """
+    if isinstance(month, str):
+        value = month.strip()
+        if value.isdigit():
+            month = int(value)
+        elif value.lower() in _MONTH_LOOKUP:
+            return _MONTH_LOOKUP[value.lower()]
+        else:
+            raise ValueError(f"Invalid month: {month}")
+
+    if isinstance(month, (int, np.integer)) and 1 <= month <= 12:
+        return int(month)
+    raise ValueError(f"Invalid month: {month}")
+
+
+@dataclass
+class NASASeries:
+    """
+    Columnar NASA POWER daily series.
+
+    `dates` is a sorted datetime64[D] array shared by all parameters and
+    `columns` maps every parameter to a float32 masked array where fill
+    values (header.fill_value, -999) are masked. Slicing by date returns
+    views over the same buffers, nothing is copied.
+    """
+    dates: np.ndarray
+    columns: Dict[str, np.ma.MaskedArray]
+    fill_value: float = DEFAULT_FILL_VALUE
+
+    # Lazily computed calendar index, see `_calendar_index`
+    _month_runs: Optional[Dict[int, List[Tuple[int, int]]]] = field(default=None, init=False, repr=False)
+    _day_of_year: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_parameter_dict(
+        cls, parameter: Dict[str, Dict[str, float]], fill_value: float = DEFAULT_FILL_VALUE
+    ) -> 'NASASeries':
+        """Build the series from NASA's `properties.parameter` mapping."""
+        if not parameter:
+            return cls(dates=np.array([], dtype="datetime64[D]"), columns={}, fill_value=fill_value)
+
+        date_keys = list(next(iter(parameter.values())).keys())
+        count = len(date_keys)
+        dates = parse_date_keys(date_keys)
+
+        columns = {}
+        for name, values in parameter.items():
+            if list(values.keys()) == date_keys:
+                data = np.fromiter(values.values(), dtype=np.float32, count=count)
+            else:
+                # Parameters normally share the same date keys, realign if not
+                data = np.fromiter(
+                    (values.get(key, fill_value) for key in date_keys), dtype=np.float32, count=count
+                )
+            columns[name] = np.ma.masked_array(data, mask=data == np.float32(fill_value))
+
+        if np.any(dates[1:] < dates[:-1]):
+            order = np.argsort(dates, kind="stable")
+            dates = dates[order]
+            columns = {name: column[order] for name, column in columns.items()}
+
+        return cls(dates=dates, columns=columns, fill_value=fill_value)
+
+    @property
+    def parameters(self) -> List[str]:
+        """Names of the parameters held by the series."""
+        return list(self.columns.keys())
+
+    @property
+    def start(self) -> Optional[np.datetime64]:
+        return self.dates[0] if len(self.dates) else None
+
+    @property
+    def end(self) -> Optional[np.datetime64]:
+        return self.dates[-1] if len(self.dates) else None
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, parameter: str) -> np.ma.MaskedArray:
+        return self.columns[parameter]
+
+    def __contains__(self, parameter: str) -> bool:
+        return parameter in self.columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def slice(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> 'NASASeries':
+        """Return a zero-copy view covering [start, end] (both inclusive)."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, to_datetime64(start), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, to_datetime64(end), side="right"))
+        return self._view(lo, hi)
+
+    def select(self, parameters: List[str]) -> 'NASASeries':
+        """Return a series restricted to `parameters`, sharing the same buffers."""
+        return NASASeries(
+            dates=self.dates,
+            columns={name: self.columns[name] for name in parameters if name in self.columns},
+            fill_value=self.fill_value,
+        )
+
+    @property
+    def years(self) -> np.ndarray:
+        """Calendar year of every date."""
+        return self.dates.astype("datetime64[Y]").astype(np.int64) + 1970
+
+    @property
+    def months(self) -> np.ndarray:
+        """Month number (1..12) of every date."""
+        return self.dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+    @property
+    def days(self) -> np.ndarray:
+        """Day of month (1..31) of every date."""
+        return (self.dates - self.dates.astype("datetime64[M]")).astype(np.int64) + 1
+
+    @property
+    def day_of_year(self) -> np.ndarray:
+        """Day of year (1..366) of every date, computed once per series."""
+        if self._day_of_year is None:
+            self._day_of_year = (self.dates - self.dates.astype("datetime64[Y]")).astype(np.int64) + 1
+        return self._day_of_year
+
+    def month_blocks(self, month: MonthLike) -> List['NASASeries']:
+        """
+        Return one zero-copy view per year covering `month`.
+
+        Dates are sorted and daily, so every (year, month) pair is a
+        contiguous run that can be sliced without copying.
+        """
+        month_number = parse_month(month)
+        return [self._view(lo, hi) for lo, hi in self._calendar_index().get(month_number, [])]
+
+    def select_months(self, months: Union[MonthLike, Iterable[MonthLike]]) -> 'NASASeries':
+        """
+        Return the records of one or several months across all years.
+
+        A single contiguous run is returned as a view; otherwise only the
+        selected rows are gathered, the rest of the series is never copied.
+        """
+        if isinstance(months, (str, int, np.integer)):
+            months = [months]
+        month_numbers = {parse_month(month) for month in months}
+
+        index = self._calendar_index()
+        runs = sorted(run for number in month_numbers for run in index.get(number, []))
+        if not runs:
+            return self._view(0, 0)
+        if len(runs) == 1:
+            return self._view(*runs[0])
+
+        rows = np.concatenate([np.arange(lo, hi) for lo, hi in runs])
+        return NASASeries(
+            dates=self.dates[rows],
+            columns={name: column[rows] for name, column in self.columns.items()},
+            fill_value=self.fill_value,
+        )
+
+    def _calendar_index(self) -> Dict[int, List[Tuple[int, int]]]:
+        """Map month number -> list of (start, stop) row ranges, one per year."""
+        if self._month_runs is None:
+            month_ids = self.dates.astype("datetime64[M]").astype(np.int64)
+            boundaries = np.flatnonzero(np.diff(month_ids)) + 1
+            starts = np.concatenate(([0], boundaries)) if len(month_ids) else np.array([], dtype=np.int64)
+            stops = np.concatenate((boundaries, [len(month_ids)])) if len(month_ids) else starts
+
+            runs: Dict[int, List[Tuple[int, int]]] = {}
+            for lo, hi in zip(starts.tolist(), stops.tolist()):
+                runs.setdefault(int(month_ids[lo] % 12 + 1), []).append((lo, hi))
+            self._month_runs = runs
+        return self._month_runs
+
+    def to_parameter_dict(self) -> Dict[str, Dict[str, float]]:
+        """Convert back to NASA's `{parameter: {YYYYMMDD: value}}` layout."""
+        date_keys = np.datetime_as_string(self.dates, unit="D")
+        date_keys = [key.replace("-", "") for key in date_keys]
+        result = {}
+        for name, column in self.columns.items():
+            values = column.filled(self.fill_value).astype(np.float64).round(2).tolist()
+            result[name] = dict(zip(date_keys, values))
+        return result
+
+    def _view(self, lo: int, hi: int) -> 'NASASeries':
+        return NASASeries(
+            dates=self.dates[lo:hi],
+            columns={name: column[lo:hi] for name, column in self.columns.items()},
+            fill_value=self.fill_value,
+        )
+
+
+def series_from_dict(data: Dict[str, Any]) -> NASASeries:
+    """Build a NASASeries straight from a raw NASA POWER JSON response."""
+    header = data.get("header") or {}
+    return NASASeries.from_parameter_dict(
+        data["properties"]["parameter"], fill_value=header.get("fill_value", DEFAULT_FILL_VALUE)
+    )
@@ -0,0 +1,121 @@
+"""
+Memory-mapped binary file format for NASASeries.
+
+Layout (little endian):
+
+    header   magic "NASASER1", version, day count, parameter count,
+             name width, first date (days since 1970-01-01), fill value
+    names    one fixed-width, NUL padded ASCII name per parameter
+    padding  up to the next DATA_ALIGNMENT bytes
+    columns  one contiguous float32 column of `count` values per parameter
+
+Dates are stored as a base date plus a day count, so the series must be
+contiguous (NASA POWER daily series are). Opening a file memory-maps it
+and returns NumPy views over the mapped pages: nothing is parsed or
+copied, and processes reading the same file share it through the OS page
+cache.
+"""
+
+import os
+import struct
+import tempfile
+from typing import List
+
+import numpy as np
+
+from .series import NASASeries
+
+MAGIC = b"NASASER1"
+FORMAT_VERSION = 1
+NAME_WIDTH = 32
+DATA_ALIGNMENT = 64
+
+# magic, version, count, parameter count, name width, base date, fill value
+HEADER = struct.Struct("<8sIIIIqf4x")
+
+
+def write_series_file(path: str, series: NASASeries) -> None:
+    """
+    Write `series` to `path` atomically.
+
+    Raises:
+        ValueError: If the dates are not one contiguous daily range or a
+            parameter name does not fit the name table
+        OSError: If the file cannot be written
+    """
+    count = len(series)
+    base_days = int(series.dates[0].astype(np.int64)) if count else 0
+    if count and np.any(series.dates.astype(np.int64) - base_days != np.arange(count)):
+        raise ValueError("Only contiguous daily series can be written")
+
+    names = series.parameters
+    encoded_names = [name.encode("ascii") for name in names]
+    if any(len(name) > NAME_WIDTH for name in encoded_names):
+        raise ValueError(f"Parameter names must fit in {NAME_WIDTH} bytes")
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, count, len(names), NAME_WIDTH, base_days, series.fill_value)
+    name_table = b"".join(name.ljust(NAME_WIDTH, b"\0") for name in encoded_names)
+    padding = b"\0" * (_data_offset(len(names)) - len(header) - len(name_table))
+
+    columns = np.empty((len(names), count), dtype="<f4")
+    for row, name in enumerate(names):
+        columns[row] = series[name].filled(series.fill_value)
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(header + name_table + padding)
+            tmp_file.write(columns.tobytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def open_series_file(path: str) -> NASASeries:
+    """
+    Memory-map a series file written by `write_series_file`.
+
+    The returned columns are read-only views over the mapped file.
+
+    Raises:
+        ValueError: If the file is not a valid series file
+        OSError: If the file cannot be opened
+    """
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    if len(raw) < HEADER.size:
+        raise ValueError(f"Truncated series file: {path}")
+
+    magic, version, count, parameter_count, name_width, base_days, fill_value = HEADER.unpack_from(raw, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Not a NASA series file: {path}")
+
+    offset = _data_offset(parameter_count, name_width)
+    if len(raw) < offset + parameter_count * count * 4:
+        raise ValueError(f"Truncated series file: {path}")
+
+    names = _read_names(raw, parameter_count, name_width)
+    data = raw[offset:offset + parameter_count * count * 4].view("<f4").reshape(parameter_count, count)
+    fill_value = float(fill_value)
+
+    columns = {
+        name: np.ma.masked_array(data[row], mask=data[row] == np.float32(fill_value))
+        for row, name in enumerate(names)
+    }
+    dates = np.datetime64(int(base_days), "D") + np.arange(count)
+    return NASASeries(dates=dates, columns=columns, fill_value=fill_value)
+
+
+def _read_names(raw: np.ndarray, parameter_count: int, name_width: int) -> List[str]:
+    start = HEADER.size
+    return [
+        bytes(raw[start + row * name_width:start + (row + 1) * name_width]).rstrip(b"\0").decode("ascii")
+        for row in range(parameter_count)
+    ]
+
+
+def _data_offset(parameter_count: int, name_width: int = NAME_WIDTH) -> int:
+    end_of_names = HEADER.size + parameter_count * name_width
+    return -(-end_of_names // DATA_ALIGNMENT) * DATA_ALIGNMENT
@@ -0,0 +1,313 @@
+"""
+Spatial index over grid cells with a locally cached NASA series.
+
+NASA POWER cells sit on a regular grid, so cells are indexed by their
+integer (row, column) position in a hash map. The index answers nearest-k
+queries with an expanding ring search and finds the four cached cells
+around a coordinate for bilinear interpolation. `SpatialSeriesStore`
+combines the index with the disk cache to serve a coordinate from nearby
+cached cells without calling NASA.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import (
+    NASA_GRID_LAT_STEP,
+    NASA_GRID_LON_STEP,
+    GridCell,
+    NASADiskCache,
+    get_default_cache,
+    make_cache_key,
+)
+from .series import NASASeries
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+LON_CELLS = round(360.0 / NASA_GRID_LON_STEP)
+
+# Default radius for borrowing the nearest cached cell. Neighbouring cell
+# centers are 0.5° x 0.625° apart (about 56 x 70 km at the equator, 89 km
+# diagonally), so this reaches the eight neighbours but not the next ring.
+DEFAULT_NEARBY_MAX_KM = 100.0
+
+_INDEX_FILE_SUFFIX = ".idx"
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance between two coordinates."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def cell_position(cell: GridCell) -> Tuple[int, int]:
+    """Integer (row, column) of a cell center on the NASA grid."""
+    return round(cell.latitude / NASA_GRID_LAT_STEP), round(cell.longitude / NASA_GRID_LON_STEP) % LON_CELLS
+
+
+class GridCellIndex:
+    """Uniform grid hash of cell centers."""
+
+    def __init__(self, cells: Optional[List[GridCell]] = None):
+        self._cells: Dict[Tuple[int, int], GridCell] = {}
+        for cell in cells or []:
+            self.add(cell)
+
+    def add(self, cell: GridCell) -> None:
+        self._cells[cell_position(cell)] = cell
+
+    def discard(self, cell: GridCell) -> None:
+        self._cells.pop(cell_position(cell), None)
+
+    def __contains__(self, cell: GridCell) -> bool:
+        return cell_position(cell) in self._cells
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __iter__(self) -> Iterator[GridCell]:
+        return iter(list(self._cells.values()))
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 1, max_distance_km: Optional[float] = None
+    ) -> List[Tuple[GridCell, float]]:
+        """
+        Return up to `k` indexed cells closest to a coordinate, as
+        (cell, distance in km) sorted by distance.
+        """
+        lat_step_km = NASA_GRID_LAT_STEP * KM_PER_DEGREE
+        lon_step_km = NASA_GRID_LON_STEP * KM_PER_DEGREE * math.cos(math.radians(min(abs(latitude), 89.9)))
+        min_step_km = min(lat_step_km, lon_step_km)
+
+        max_ring = None
+        if max_distance_km is not None:
+            max_ring = math.ceil(max_distance_km / min_step_km) + 1
+
+        # A ring search only pays off while it visits fewer positions than there are cells
+        if max_ring is None or (2 * max_ring + 1) ** 2 > len(self._cells):
+            return self._nearest_scan(latitude, longitude, k, max_distance_km)
+
+        center_row = round(latitude / NASA_GRID_LAT_STEP)
+        center_column = round(longitude / NASA_GRID_LON_STEP)
+        found: List[Tuple[GridCell, float]] = []
+        for ring in range(max_ring + 1):
+            # Every cell in this ring is at least (ring - 0.5) steps away
+            if len(found) >= k and (ring - 0.5) * min_step_km > found[k - 1][1]:
+                break
+            for row, column in _ring_positions(center_row, center_column, ring):
+                cell = self._cells.get((row, column % LON_CELLS))
+                if cell is None:
+                    continue
+                distance = distance_km(latitude, longitude, cell.latitude, cell.longitude)
+                if max_distance_km is None or distance <= max_distance_km:
+                    found.append((cell, distance))
+            found.sort(key=lambda item: item[1])
+
+        return found[:k]
+
+    def surrounding(self, latitude: float, longitude: float, span: int = 1) -> Optional[List[Tuple[GridCell, float]]]:
+        """
+        Return the four indexed cells around a coordinate with their bilinear
+        weights, or None if any of them is missing.
+
+        With `span=1` the corners are the closest cell centers on each side;
+        `span=2` uses the cells one further out, which still enclose the
+        coordinate when its own cell is not indexed.
+        """
+        x = latitude / NASA_GRID_LAT_STEP
+        y = longitude / NASA_GRID_LON_STEP
+        row = math.floor(x) if span == 1 else round(x) - span // 2
+        column = math.floor(y) if span == 1 else round(y) - span // 2
+        t = (x - row) / span
+        u = (y - column) / span
+
+        corners = []
+        for d_row, d_column, weight in (
+            (0, 0, (1 - t) * (1 - u)), (0, span, (1 - t) * u), (span, 0, t * (1 - u)), (span, span, t * u)
+        ):
+            cell = self._cells.get((row + d_row, (column + d_column) % LON_CELLS))
+            if cell is None:
+                return None
+            corners.append((cell, weight))
+        return corners
+
+    def _nearest_scan(
+        self, latitude: float, longitude: float, k: int, max_distance_km: Optional[float]
+    ) -> List[Tuple[GridCell, float]]:
+        distances = [(cell, distance_km(latitude, longitude, cell.latitude, cell.longitude))
+                     for cell in self._cells.values()]
+        if max_distance_km is not None:
+            distances = [item for item in distances if item[1] <= max_distance_km]
+        return sorted(distances, key=lambda item: item[1])[:k]
+
+
+def _ring_positions(center_row: int, center_column: int, ring: int) -> Iterator[Tuple[int, int]]:
+    if ring == 0:
+        yield center_row, center_column
+        return
+    for d_column in range(-ring, ring + 1):
+        yield center_row - ring, center_column + d_column
+        yield center_row + ring, center_column + d_column
+    for d_row in range(-ring + 1, ring):
+        yield center_row + d_row, center_column - ring
+        yield center_row + d_row, center_column + ring
+
+
+def interpolate_series(weighted: List[Tuple[NASASeries, float]]) -> NASASeries:
+    """
+    Weighted sum of series covering the same dates.
+
+    A value is masked if it is masked in any input.
+
+    Raises:
+        ValueError: If the series don't share the same dates
+    """
+    first = weighted[0][0]
+    if any(not np.array_equal(series.dates, first.dates) for series, _ in weighted[1:]):
+        raise ValueError("Cannot interpolate series with different dates")
+
+    parameters = [name for name in first.parameters if all(name in series for series, _ in weighted)]
+    columns = {}
+    for name in parameters:
+        data = np.zeros(len(first), dtype=np.float64)
+        mask = np.zeros(len(first), dtype=bool)
+        for series, weight in weighted:
+            column = series[name]
+            data += weight * column.filled(0.0).astype(np.float64)
+            mask |= np.ma.getmaskarray(column)
+        columns[name] = np.ma.masked_array(data.astype(np.float32), mask=mask)
+
+    return NASASeries(dates=first.dates, columns=columns, fill_value=first.fill_value)
+
+
+class SpatialSeriesStore:
+    """
+    Cached series of one parameter set and year window, indexed by cell.
+
+    The series themselves live in the NASA disk cache; the indexed cells are
+    also written to a small index file in the cache directory so a new
+    process starts with the cells already fetched on the host.
+    """
+
+    def __init__(self, parameters: str, start_year: int, end_year: int, cache: Optional[NASADiskCache] = None):
+        self.parameters = parameters
+        self.start_year = start_year
+        self.end_year = end_year
+        self.cache = cache or get_default_cache()
+        self.index = GridCellIndex()
+        self._lock = threading.Lock()
+
+        window = f"{parameters}|{start_year}-{end_year}"
+        digest = hashlib.sha1(window.encode("utf-8")).hexdigest()
+        self._index_path = os.path.join(self.cache.directory, digest + _INDEX_FILE_SUFFIX)
+        self._load_index()
+
+    def __contains__(self, cell: GridCell) -> bool:
+        with self._lock:
+            return cell in self.index
+
+    def window_key(self, cell: GridCell) -> str:
+        return make_cache_key(cell, self.parameters, f"{self.start_year}0101", f"{self.end_year}1231")
+
+    def add(self, cell: GridCell, series: Optional[NASASeries] = None) -> None:
+        """Index `cell`, storing `series` first unless it is already cached."""
+        if series is not None:
+            self.cache.set_series(self.window_key(cell), series)
+        with self._lock:
+            if cell in self.index:
+                return
+            self.index.add(cell)
+        self._save_index()
+
+    def get(self, cell: GridCell) -> Optional[NASASeries]:
+        """Return the cached series of `cell`, dropping it from the index if it was evicted."""
+        series = self.cache.get_series(self.window_key(cell))
+        if series is None:
+            with self._lock:
+                self.index.discard(cell)
+        return series
+
+    def nearby_series(
+        self, latitude: float, longitude: float, max_distance_km: float = 0.0
+    ) -> Optional[Tuple[NASASeries, str]]:
+        """
+        Approximate the series at a coordinate from cached cells around it.
+
+        Bilinear interpolation between four surrounding cells is tried first
+        (closest corners, then one cell further out); otherwise the nearest
+        cell within `max_distance_km` is used as is.
+
+        Returns:
+            Tuple of (series, description of the source), or None
+        """
+        for span in (1, 2):
+            with self._lock:
+                corners = self.index.surrounding(latitude, longitude, span=span)
+            if corners is None:
+                continue
+            weighted = [(self.get(cell), weight) for cell, weight in corners]
+            if any(series is None for series, _ in weighted):
+                continue
+            try:
+                series = interpolate_series(weighted)
+            except ValueError as e:
+                logging.warning(f"Could not interpolate NASA series: {e}")
+                continue
+            return series, "bilinear:" + ",".join(cell.key for cell, _ in corners)
+
+        if max_distance_km > 0:
+            with self._lock:
+                nearest = self.index.nearest(latitude, longitude, k=1, max_distance_km=max_distance_km)
+            if nearest:
+                cell, distance = nearest[0]
+                series = self.get(cell)
+                if series is not None:
+                    return series, f"nearest:{cell.key}:{distance:.1f}km"
+
+        return None
+
+    def _load_index(self) -> None:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as index_file:
+                positions = json.load(index_file)
+        except (OSError, ValueError):
+            return
+        for latitude, longitude in positions:
+            self.index.add(GridCell(latitude=latitude, longitude=longitude))
+
+    def _save_index(self) -> None:
+        with self._lock:
+            positions = [[cell.latitude, cell.longitude] for cell in self.index]
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(positions, tmp_file, separators=(",", ":"))
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            logging.error(f"Failed to write NASA cell index: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+_stores: Dict[Tuple[str, int, int], SpatialSeriesStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_spatial_store(parameters: str, start_year: int, end_year: int) -> SpatialSeriesStore:
+    """Return the process-wide store of a parameter set and year window."""
+    key = (parameters, start_year, end_year)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SpatialSeriesStore(parameters, start_year, end_year)
+        return _stores[key]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the async NASA POWER client.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+import httpx
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa.async_client import fetch_many, point_coordinates
+
+
+def _payload(latitude, longitude):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [longitude, latitude, 100.0]},
+        "properties": {"parameter": {"T2M": {"20241001": 15.2, "20241002": 16.1}}},
+        "header": {
+            "title": "NASA/POWER Source Native Resolution Daily Data",
+            "api": {"version": "v2.8.0", "name": "POWER Daily API"},
+            "sources": ["POWER", "MERRA2"],
+            "fill_value": -999,
+            "time_standard": "LST",
+            "start": "20241001",
+            "end": "20241002"
+        },
+        "messages": [],
+        "parameters": {"T2M": {"units": "C", "longname": "Temperature at 2 Meters"}},
+        "times": {"data": 0.5, "process": 0.02}
+    }
+
+
+async def _collect(points, handler, concurrency=4):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    results = [result async for result in fetch_many(
+        points, "20241001", "20241002", "T2M", concurrency=concurrency, columnar=True, client=client
+    )]
+    await client.aclose()
+    return results
+
+
+class TestFetchMany(unittest.TestCase):
+    """Test cases for concurrent multi-point fetching."""
+
+    def test_point_coordinates(self):
+        """Test tuples and location documents as points."""
+        self.assertEqual(point_coordinates((1, 2)), (1.0, 2.0))
+        self.assertEqual(point_coordinates({"latitude": 1, "longitude": 2, "display_name": "Farm"}), (1.0, 2.0))
+
+    def test_results_in_completion_order(self):
+        """Test that faster points are yielded first."""
+
+        async def handler(request):
+            latitude = float(request.url.params["latitude"])
+            await asyncio.sleep(0.05 if latitude == 10 else 0)
+            return httpx.Response(200, json=_payload(latitude, float(request.url.params["longitude"])))
+
+        results = asyncio.run(_collect([(10, 20), (30, 40)], handler))
+
+        self.assertEqual([result.point for result in results], [(30, 40), (10, 20)])
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(results[0].response.series.parameters, ["T2M"])
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than `concurrency` requests are in flight."""
+        in_flight = {"current": 0, "max": 0}
+
+        async def handler(request):
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return httpx.Response(200, json=_payload(0, 0))
+
+        results = asyncio.run(_collect([(i, i) for i in range(10)], handler, concurrency=3))
+
+        self.assertEqual(len(results), 10)
+        self.assertLessEqual(in_flight["max"], 3)
+
+    def test_failed_point_does_not_abort_batch(self):
+        """Test that errors are reported per point."""
+        def handler(request):
+            if request.url.params["latitude"] == "1.0":
+                return httpx.Response(422, json={"messages": ["bad point"]})
+            return httpx.Response(200, json=_payload(0, 0))
+
+        results = asyncio.run(_collect([(1.0, 1.0), (2.0, 2.0)], handler))
+        errors = [result for result in results if result.error is not None]
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].point, (1.0, 1.0))
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
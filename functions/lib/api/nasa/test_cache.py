@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the NASA POWER response cache.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa.cache import NASADiskCache, GridCell, snap_to_grid, make_cache_key
+
+
+class TestGridSnapping(unittest.TestCase):
+    """Test cases for grid cell snapping."""
+
+    def test_snap_to_grid(self):
+        """Test that coordinates snap to the nearest cell center."""
+        self.assertEqual(snap_to_grid(49.05, -122.30), GridCell(latitude=49.0, longitude=-122.5))
+        self.assertEqual(snap_to_grid(-23.55, -46.63), GridCell(latitude=-23.5, longitude=-46.875))
+        self.assertEqual(snap_to_grid(0.2, 0.4), GridCell(latitude=0.0, longitude=0.625))
+
+    def test_same_cell_shares_key(self):
+        """Test that nearby points in the same cell produce the same cache key."""
+        first = make_cache_key(snap_to_grid(49.05, -122.30), "T2M,RH2M", "20190101", "20241231")
+        second = make_cache_key(snap_to_grid(49.10, -122.40), "RH2M,T2M", "20190101", "20241231")
+        self.assertEqual(first, second)
+
+    def test_antimeridian_wraps(self):
+        """Test that longitudes snapping to 180 wrap to -180."""
+        self.assertEqual(snap_to_grid(10.0, 179.9).longitude, -180.0)
+
+
+class TestNASADiskCache(unittest.TestCase):
+    """Test cases for the on-disk LRU cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = NASADiskCache(directory=self.tmp_dir.name, max_bytes=10_000_000)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_hit_and_miss_counters(self):
+        """Test that hits and misses are counted."""
+        self.assertIsNone(self.cache.get("missing"))
+        self.cache.set("key", {"value": 1})
+        self.assertEqual(self.cache.get("key"), {"value": 1})
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        payload = {"data": "x" * 1000}
+        self.cache.max_bytes = 2500
+
+        self.cache.set("first", payload)
+        self.cache.set("second", payload)
+        # Make "first" the most recently used entry
+        past = time.time() - 10
+        os.utime(self.cache._path_for("second"), (past, past))
+        self.cache.get("first")
+
+        self.cache.set("third", payload)
+
+        self.assertIsNotNone(self.cache.get("first"))
+        self.assertIsNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("third"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pooled NASA POWER HTTP client.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+import requests
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa import client
+
+
+def _response(status_code, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.headers = headers or {}
+    response.json.return_value = payload
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} Error")
+    return response
+
+
+@patch('functions.lib.api.nasa.client.time.sleep')
+@patch('functions.lib.api.nasa.client.get_session')
+class TestRequestDailyPoint(unittest.TestCase):
+    """Test cases for retries and backoff."""
+
+    def test_retries_on_server_error(self, mock_get_session, mock_sleep):
+        """Test that 5xx and 429 responses are retried until success."""
+        mock_get_session.return_value.get.side_effect = [
+            _response(503), _response(429, headers={"Retry-After": "2"}), _response(200, {"ok": True})
+        ]
+
+        self.assertEqual(client.request_daily_point({}), {"ok": True})
+        self.assertEqual(mock_get_session.return_value.get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(mock_sleep.call_args_list[1].args[0], 2.0)
+
+    def test_gives_up_after_max_retries(self, mock_get_session, mock_sleep):
+        """Test that the last error is raised once retries are exhausted."""
+        mock_get_session.return_value.get.return_value = _response(500)
+
+        with self.assertRaises(requests.HTTPError):
+            client.request_daily_point({}, max_retries=2)
+        self.assertEqual(mock_get_session.return_value.get.call_count, 3)
+
+    def test_retries_connection_errors(self, mock_get_session, mock_sleep):
+        """Test that connection errors and timeouts are retried."""
+        mock_get_session.return_value.get.side_effect = [requests.Timeout("slow"), _response(200, {"ok": True})]
+
+        self.assertEqual(client.request_daily_point({}), {"ok": True})
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_client_errors_are_not_retried(self, mock_get_session, mock_sleep):
+        """Test that 4xx responses other than 429 fail immediately."""
+        mock_get_session.return_value.get.return_value = _response(422)
+
+        with self.assertRaises(requests.HTTPError):
+            client.request_daily_point({})
+        mock_sleep.assert_not_called()
+
+
+class TestSessionAndBackoff(unittest.TestCase):
+    """Test cases for the shared session and the backoff delay."""
+
+    def test_session_is_shared(self):
+        """Test that the pooled session is created once per process."""
+        self.assertIs(client.get_session(), client.get_session())
+
+    def test_backoff_delay_is_bounded(self):
+        """Test exponential backoff with jitter."""
+        for attempt in range(10):
+            delay = client.backoff_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(client.BACKOFF_MAX_SECONDS, client.BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
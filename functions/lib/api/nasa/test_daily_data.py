@@ -6,18 +6,29 @@ Unit tests for NASA daily data API fetcher.
 import unittest
 import sys
 import os
+import tempfile
 from unittest.mock import patch, MagicMock
 
 # Add the project root to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
 
 from functions.lib.api.nasa.daily_data import fetch_nasa_daily_data, _validate_coordinates, _validate_dates
+from functions.lib.api.nasa.cache import NASADiskCache
 from functions.lib.api.nasa.types import NASAPowerResponse
 
 
 class TestNASADataFetcher(unittest.TestCase):
     """Test cases for NASA Power API data fetcher."""
 
+    def setUp(self):
+        # Downloads are cached by the shared fetch layer, isolate every test
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        patcher = patch('functions.lib.api.nasa.unified.get_default_cache',
+                        return_value=NASADiskCache(directory=self.tmp_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+
     def test_validate_coordinates_valid(self):
         """Test coordinate validation with valid values."""
         # Should not raise any exception
@@ -68,8 +79,8 @@ class TestNASADataFetcher(unittest.TestCase):
             _validate_dates("20241003", "20241001")
         self.assertIn("Start date must be before end date", str(context.exception))
 
-    @patch('functions.lib.api.nasa.daily_data.requests.get')
-    def test_fetch_nasa_daily_data_success(self, mock_get):
+    @patch('functions.lib.api.nasa.client.get_session')
+    def test_fetch_nasa_daily_data_success(self, mock_get_session):
         """Test successful API call."""
         # Mock response data
         mock_response_data = {
@@ -101,9 +112,10 @@ class TestNASADataFetcher(unittest.TestCase):
         
         # Configure mock
         mock_response = MagicMock()
+        mock_response.status_code = 200
         mock_response.json.return_value = mock_response_data
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
         
         # Test the function
         result = fetch_nasa_daily_data(
@@ -121,11 +133,15 @@ class TestNASADataFetcher(unittest.TestCase):
         self.assertIn("T2M", dict(result.properties.parameter))
         self.assertEqual(result.header.api.name, "POWER Daily API")
 
-    @patch('functions.lib.api.nasa.daily_data.requests.get')
-    def test_fetch_nasa_daily_data_api_error(self, mock_get):
+        # Only the requested dates are downloaded
+        params = mock_get_session.return_value.get.call_args.kwargs["params"]
+        self.assertEqual((params["start"], params["end"]), ("20241001", "20241002"))
+
+    @patch('functions.lib.api.nasa.client.get_session')
+    def test_fetch_nasa_daily_data_api_error(self, mock_get_session):
         """Test API error handling."""
         # Configure mock to raise an exception
-        mock_get.side_effect = Exception("API Error")
+        mock_get_session.return_value.get.side_effect = Exception("API Error")
         
         # Test that the function raises the exception
         with self.assertRaises(Exception) as context:
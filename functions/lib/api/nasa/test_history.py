@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit tests for incremental year-window fetching.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa.cache import NASADiskCache, GridCell
+from functions.lib.api.nasa.history import (
+    fetch_year_window, fetch_year_window_series, missing_year_runs, series_year_is_final
+)
+
+CELL = GridCell(latitude=49.0, longitude=-122.5)
+
+
+def _fake_response(params):
+    """NASA-like response with two days per requested year."""
+    first, last = int(params["start"][:4]), int(params["end"][:4])
+    values = {}
+    for year in range(first, last + 1):
+        values[f"{year}0101"] = float(year)
+        values[f"{year}1231"] = float(year) + 0.5
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [CELL.longitude, CELL.latitude, 10.0]},
+        "properties": {"parameter": {"T2M": values}},
+        "header": {"fill_value": -999, "start": params["start"], "end": params["end"]},
+    }
+
+
+def _full_response(params):
+    """NASA-like response with every day of the requested years."""
+    dates = np.arange(np.datetime64(f"{params['start'][:4]}-01-01"), np.datetime64(f"{int(params['end'][:4]) + 1}-01-01"))
+    response = _fake_response(params)
+    response["properties"]["parameter"]["T2M"] = {
+        str(date).replace("-", ""): float(index) for index, date in enumerate(dates)
+    }
+    return response
+
+
+@patch('functions.lib.api.nasa.history._current_year', return_value=2026)
+@patch('functions.lib.api.nasa.history.request_daily_point', side_effect=_fake_response)
+class TestFetchYearWindow(unittest.TestCase):
+    """Test cases for fetch_year_window."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = NASADiskCache(directory=self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_first_fetch_downloads_window_once(self, mock_request, mock_year):
+        """Test that an empty cache downloads the window in one request."""
+        data = fetch_year_window(CELL, 2020, 2025, "T2M", cache=self.cache)
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(len(data["properties"]["parameter"]["T2M"]), 12)
+        self.assertEqual(data["header"]["start"], "20200101")
+        self.assertEqual(data["header"]["end"], "20251231")
+
+    def test_moving_window_fetches_only_new_year(self, mock_request, mock_year):
+        """Test that a window shifted by one year downloads one year."""
+        fetch_year_window(CELL, 2019, 2024, "T2M", cache=self.cache)
+        mock_request.reset_mock()
+
+        data = fetch_year_window(CELL, 2020, 2025, "T2M", cache=self.cache)
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(mock_request.call_args.args[0]["start"], "20250101")
+        self.assertEqual(mock_request.call_args.args[0]["end"], "20251231")
+        self.assertEqual(list(data["properties"]["parameter"]["T2M"])[0], "20200101")
+
+    def test_repeat_request_is_local(self, mock_request, mock_year):
+        """Test that a stored window needs no download."""
+        fetch_year_window(CELL, 2020, 2025, "T2M", cache=self.cache)
+        mock_request.reset_mock()
+
+        fetch_year_window(CELL, 2020, 2025, "T2M", cache=self.cache)
+        mock_request.assert_not_called()
+
+    def test_current_year_is_not_stored(self, mock_request, mock_year):
+        """Test that the year in progress is always fetched again."""
+        fetch_year_window(CELL, 2025, 2026, "T2M", cache=self.cache)
+        mock_request.reset_mock()
+
+        fetch_year_window(CELL, 2025, 2026, "T2M", cache=self.cache)
+        self.assertEqual(mock_request.call_args.args[0]["start"], "20260101")
+
+    def test_window_series_is_memory_mapped(self, mock_request, mock_year):
+        """Test that a completed window is reopened from the binary series file."""
+        mock_request.side_effect = _full_response
+        first = fetch_year_window_series(CELL, 2020, 2025, "T2M", cache=self.cache)
+        mock_request.reset_mock()
+
+        second = fetch_year_window_series(CELL, 2020, 2025, "T2M", cache=self.cache)
+
+        mock_request.assert_not_called()
+        self.assertIsInstance(second["T2M"].data.base, np.memmap)
+        np.testing.assert_array_equal(second.dates, first.dates)
+
+    def test_fill_tailed_year_is_not_stored(self, mock_request, mock_year):
+        """Test that a completed year whose last days are still fill values is fetched again."""
+        def lagged_response(params):
+            response = _full_response(params)
+            values = response["properties"]["parameter"]["T2M"]
+            for day in range(20, 32):
+                values[f"202512{day:02d}"] = -999.0
+            return response
+
+        mock_request.side_effect = lagged_response
+        fetch_year_window_series(CELL, 2024, 2025, "T2M", cache=self.cache)
+        mock_request.reset_mock()
+
+        fetch_year_window_series(CELL, 2024, 2025, "T2M", cache=self.cache)
+
+        # 2024 is final and stored, the lagged 2025 is downloaded again
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(mock_request.call_args.args[0]["start"], "20250101")
+
+        series = fetch_year_window_series(CELL, 2024, 2025, "T2M", cache=self.cache)
+        self.assertTrue(series_year_is_final(series, 2024))
+        self.assertFalse(series_year_is_final(series, 2025))
+
+    def test_missing_year_runs(self, mock_request, mock_year):
+        """Test grouping of missing years into consecutive runs."""
+        self.assertEqual(missing_year_runs([2019, 2020, 2022, 2024, 2025]), [(2019, 2020), (2022, 2022), (2024, 2025)])
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the columnar NASA POWER series.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa.series import NASASeries, parse_date_keys, parse_month
+from functions.lib.api.nasa.types import NASAPowerResponse
+
+
+PARAMETER_DATA = {
+    "T2M": {"20231230": 1.5, "20231231": -999, "20240101": 3.25, "20240102": 4.0},
+    "RH2M": {"20231230": 80.0, "20231231": 81.5, "20240101": 82.0, "20240102": -999},
+}
+
+
+class TestNASASeries(unittest.TestCase):
+    """Test cases for NASASeries."""
+
+    def test_parse_date_keys(self):
+        """Test vectorized YYYYMMDD parsing, including leap days."""
+        dates = parse_date_keys(["20240228", "20240229", "20240301"])
+        expected = np.array(["2024-02-28", "2024-02-29", "2024-03-01"], dtype="datetime64[D]")
+        np.testing.assert_array_equal(dates, expected)
+
+    def test_fill_values_are_masked(self):
+        """Test that fill values become masked entries."""
+        series = NASASeries.from_parameter_dict(PARAMETER_DATA)
+        self.assertEqual(series["T2M"].dtype, np.float32)
+        self.assertEqual(series["T2M"].mask.tolist(), [False, True, False, False])
+        self.assertEqual(series["RH2M"].mask.tolist(), [False, False, False, True])
+
+    def test_slice_is_zero_copy(self):
+        """Test that slicing by date returns views of the original buffers."""
+        series = NASASeries.from_parameter_dict(PARAMETER_DATA)
+        window = series.slice("20231231", "20240101")
+
+        self.assertEqual(len(window), 2)
+        self.assertTrue(np.shares_memory(window["T2M"].data, series["T2M"].data))
+        self.assertAlmostEqual(float(window["T2M"][1]), 3.25)
+
+    def test_round_trip_to_parameter_dict(self):
+        """Test conversion back to the NASA parameter layout."""
+        series = NASASeries.from_parameter_dict(PARAMETER_DATA)
+        self.assertEqual(series.to_parameter_dict(), PARAMETER_DATA)
+
+    def test_unsorted_and_misaligned_keys(self):
+        """Test that parameters with different key order are realigned."""
+        parameter = {
+            "T2M": {"20240102": 2.0, "20240101": 1.0},
+            "RH2M": {"20240101": 10.0, "20240102": 20.0},
+        }
+        series = NASASeries.from_parameter_dict(parameter)
+        self.assertEqual(series["T2M"].tolist(), [1.0, 2.0])
+        self.assertEqual(series["RH2M"].tolist(), [10.0, 20.0])
+
+    def test_response_from_dict_columnar(self):
+        """Test building the columnar series from a full API response."""
+        data = {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [-122.30, 49.05, 148.97]},
+            "properties": {"parameter": PARAMETER_DATA},
+            "header": {
+                "title": "NASA/POWER Source Native Resolution Daily Data",
+                "api": {"version": "v2.8.0", "name": "POWER Daily API"},
+                "sources": ["POWER", "MERRA2"],
+                "fill_value": -999,
+                "time_standard": "LST",
+                "start": "20231230",
+                "end": "20240102"
+            },
+            "messages": [],
+            "parameters": {"T2M": {"units": "C", "longname": "Temperature at 2 Meters"}},
+            "times": {"data": 0.5, "process": 0.02}
+        }
+
+        result = NASAPowerResponse.from_dict(data, columnar=True)
+
+        self.assertIsNotNone(result.series)
+        self.assertEqual(result.series.parameters, ["T2M", "RH2M"])
+        self.assertEqual(dict(result.properties.parameter), {})
+
+
+class TestMonthSelection(unittest.TestCase):
+    """Test cases for the indexed month selector."""
+
+    def setUp(self):
+        dates = np.arange(np.datetime64("2022-01-01"), np.datetime64("2024-01-01"))
+        values = np.arange(len(dates), dtype=np.float32)
+        self.series = NASASeries(dates=dates, columns={"T2M": np.ma.masked_array(values)})
+
+    def test_parse_month(self):
+        """Test month numbers, names and abbreviations."""
+        for value in (3, "3", "03", "March", "march", "Mar", " mar "):
+            self.assertEqual(parse_month(value), 3)
+        for value in (0, 13, "Marchh", "", "13"):
+            with self.assertRaises(ValueError):
+                parse_month(value)
+
+    def test_month_blocks_are_views(self):
+        """Test that per-year month blocks share memory with the series."""
+        blocks = self.series.month_blocks("February")
+
+        self.assertEqual([len(block) for block in blocks], [28, 28])
+        for block in blocks:
+            self.assertTrue(np.shares_memory(block["T2M"].data, self.series["T2M"].data))
+            self.assertTrue(np.all(block.months == 2))
+
+    def test_select_single_and_multiple_months(self):
+        """Test selecting one or several months across years."""
+        january = self.series.select_months("01")
+        self.assertEqual(len(january), 62)
+        self.assertTrue(np.all(january.months == 1))
+
+        winter = self.series.select_months(["dec", 1, "February"])
+        self.assertEqual(len(winter), 2 * (31 + 31 + 28))
+        self.assertTrue(np.all(winter.dates[1:] > winter.dates[:-1]))
+
+    def test_day_of_year_index(self):
+        """Test the precomputed day-of-year index."""
+        self.assertEqual(self.series.day_of_year[0], 1)
+        self.assertEqual(self.series.day_of_year[364], 365)
+        self.assertEqual(self.series.day_of_year[365], 1)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
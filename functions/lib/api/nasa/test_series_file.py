@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the memory-mapped NASA series file format.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa.cache import NASADiskCache
+from functions.lib.api.nasa.series import NASASeries
+from functions.lib.api.nasa.series_file import open_series_file, write_series_file
+
+
+def _build_series(days=6 * 365):
+    dates = np.arange(np.datetime64("2019-01-01"), np.datetime64("2019-01-01") + days)
+    t2m = np.arange(days, dtype=np.float32)
+    t2m[10] = -999.0
+    return NASASeries(dates=dates, columns={
+        "T2M_MAX": np.ma.masked_array(t2m, mask=t2m == -999.0),
+        "PRECTOTCORR": np.ma.masked_array(np.full(days, 2.5, dtype=np.float32)),
+    })
+
+
+class TestSeriesFile(unittest.TestCase):
+    """Test cases for writing and memory-mapping series files."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "series.series")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that dates, values and fill masks survive a round trip."""
+        series = _build_series()
+        write_series_file(self.path, series)
+        reopened = open_series_file(self.path)
+
+        self.assertEqual(reopened.parameters, ["T2M_MAX", "PRECTOTCORR"])
+        np.testing.assert_array_equal(reopened.dates, series.dates)
+        np.testing.assert_array_equal(reopened["T2M_MAX"].data, series["T2M_MAX"].data)
+        self.assertTrue(reopened["T2M_MAX"].mask[10])
+        self.assertEqual(reopened.fill_value, -999.0)
+
+    def test_columns_are_mapped_views(self):
+        """Test that columns are read-only views over the mapped file."""
+        write_series_file(self.path, _build_series())
+        column = open_series_file(self.path)["PRECTOTCORR"].data
+
+        self.assertIsInstance(column.base, np.memmap)
+        self.assertFalse(column.flags.writeable)
+
+    def test_rejects_gaps_and_bad_files(self):
+        """Test that non-contiguous series and foreign files are rejected."""
+        series = _build_series()
+        gapped = NASASeries(dates=series.dates[::2], columns={"T2M_MAX": series["T2M_MAX"][::2]})
+        with self.assertRaises(ValueError):
+            write_series_file(self.path, gapped)
+
+        with open(self.path, "wb") as bad_file:
+            bad_file.write(b"{" * 100)
+        with self.assertRaises(ValueError):
+            open_series_file(self.path)
+
+    def test_cache_series_entries(self):
+        """Test storing series in the disk cache."""
+        cache = NASADiskCache(directory=self.tmp_dir.name)
+        self.assertIsNone(cache.get_series("key"))
+
+        cache.set_series("key", _build_series())
+        self.assertEqual(len(cache.get_series("key")), 6 * 365)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertGreater(cache.stats()["size_bytes"], 6 * 365 * 2 * 4)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
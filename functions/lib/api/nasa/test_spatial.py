@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the spatial index over cached grid cells.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa.cache import NASADiskCache, GridCell, snap_to_grid
+from functions.lib.api.nasa.series import NASASeries
+from functions.lib.api.nasa.spatial import DEFAULT_NEARBY_MAX_KM, GridCellIndex, SpatialSeriesStore, distance_km
+
+
+def _series(value):
+    dates = np.arange(np.datetime64("2019-01-01"), np.datetime64("2019-01-11"))
+    return NASASeries(dates=dates, columns={"T2M": np.ma.masked_array(np.full(10, value, dtype=np.float32))})
+
+
+class TestGridCellIndex(unittest.TestCase):
+    """Test cases for nearest and surrounding cell lookups."""
+
+    def setUp(self):
+        # 5 x 5 block of cells around (49.0, -122.5)
+        self.index = GridCellIndex([
+            GridCell(latitude=48.0 + 0.5 * row, longitude=-123.75 + 0.625 * column)
+            for row in range(5) for column in range(5)
+        ])
+
+    def test_nearest_k(self):
+        """Test that the ring search matches a brute force scan."""
+        for k in (1, 3, 8):
+            ring = self.index.nearest(49.1, -122.4, k=k, max_distance_km=40)
+            scan = self.index._nearest_scan(49.1, -122.4, k, 40)
+            self.assertEqual(ring, scan)
+        self.assertEqual(self.index.nearest(49.1, -122.4)[0][0], snap_to_grid(49.1, -122.4))
+
+    def test_max_distance(self):
+        """Test that cells further than max_distance_km are ignored."""
+        self.assertEqual(self.index.nearest(60.0, -122.5, max_distance_km=100), [])
+
+    def test_surrounding_weights(self):
+        """Test bilinear corners and weights."""
+        corners = self.index.surrounding(49.25, -122.5 + 0.3125)
+        self.assertEqual(len(corners), 4)
+        self.assertAlmostEqual(sum(weight for _, weight in corners), 1.0)
+        for _, weight in corners:
+            self.assertAlmostEqual(weight, 0.25)
+
+    def test_surrounding_missing_corner(self):
+        """Test that a missing corner disables interpolation."""
+        self.index.discard(GridCell(latitude=49.0, longitude=-122.5))
+        self.assertIsNone(self.index.surrounding(49.1, -122.4))
+        self.assertIsNotNone(self.index.surrounding(49.1, -122.4, span=2))
+
+    def test_default_radius_reaches_neighbours(self):
+        """Test that the default radius reaches the diagonal neighbour at the equator, but not the next ring."""
+        index = GridCellIndex([GridCell(latitude=0.5, longitude=0.625), GridCell(latitude=1.0, longitude=1.25)])
+        nearest = index.nearest(0.0, 0.0, k=2, max_distance_km=DEFAULT_NEARBY_MAX_KM)
+        self.assertEqual([cell for cell, _ in nearest], [GridCell(latitude=0.5, longitude=0.625)])
+
+    def test_distance(self):
+        """Test the haversine distance of one degree of latitude."""
+        self.assertAlmostEqual(distance_km(0.0, 0.0, 1.0, 0.0), 111.19, places=1)
+
+
+class TestSpatialSeriesStore(unittest.TestCase):
+    """Test cases for serving uncached cells from cached neighbours."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = NASADiskCache(directory=self.tmp_dir.name)
+        self.store = SpatialSeriesStore("T2M", 2019, 2024, cache=self.cache)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_bilinear_series(self):
+        """Test interpolation from the four cells around the missing one."""
+        for row, column, value in ((48.5, -123.125, 10.0), (48.5, -121.875, 20.0),
+                                   (49.5, -123.125, 30.0), (49.5, -121.875, 40.0)):
+            self.store.add(GridCell(latitude=row, longitude=column), _series(value))
+
+        series, source = self.store.nearby_series(49.0, -122.5)
+        self.assertTrue(source.startswith("bilinear:"))
+        self.assertAlmostEqual(float(series["T2M"][0]), 25.0, places=4)
+
+    def test_nearest_fallback_and_persistence(self):
+        """Test the nearest-cell fallback and that the index survives a restart."""
+        self.store.add(GridCell(latitude=49.0, longitude=-121.875), _series(5.0))
+        self.assertIsNone(self.store.nearby_series(49.0, -122.5))
+
+        reopened = SpatialSeriesStore("T2M", 2019, 2024, cache=self.cache)
+        series, source = reopened.nearby_series(49.0, -122.5, max_distance_km=60)
+        self.assertTrue(source.startswith("nearest:"))
+        self.assertEqual(float(series["T2M"][0]), 5.0)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
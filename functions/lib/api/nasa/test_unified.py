@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared NASA POWER fetch layer.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+
+from functions.lib.api.nasa.cache import NASADiskCache, GridCell
+from functions.lib.api.nasa.unified import (
+    DAILY_PARAMETERS, PREDICTION_PARAMETERS, UNION_PARAMETERS, fetch_parameters_for, fetch_window,
+    fetch_window_series, parse_parameters,
+)
+
+CELL = GridCell(latitude=49.0, longitude=-122.5)
+
+
+def _full_response(params):
+    """NASA-like response with every requested parameter and day."""
+    dates = np.arange(np.datetime64(f"{params['start'][:4]}-01-01"), np.datetime64(f"{int(params['end'][:4]) + 1}-01-01"))
+    date_keys = [str(date).replace("-", "") for date in dates]
+    names = parse_parameters(params["parameters"])
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [CELL.longitude, CELL.latitude, 10.0]},
+        "properties": {"parameter": {name: {key: 1.0 for key in date_keys} for name in names}},
+        "header": {"fill_value": -999, "start": params["start"], "end": params["end"]},
+        "parameters": {name: {"units": "-", "longname": name} for name in names},
+    }
+
+
+@patch('functions.lib.api.nasa.history._current_year', return_value=2026)
+@patch('functions.lib.api.nasa.history.request_daily_point', side_effect=_full_response)
+class TestUnifiedFetch(unittest.TestCase):
+    """Test cases for fetching the union parameter set once."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = NASADiskCache(directory=self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_union_contains_both_sets(self, mock_request, mock_year):
+        """Test that the union covers the daily and prediction parameters."""
+        union = set(parse_parameters(UNION_PARAMETERS))
+        self.assertTrue(set(parse_parameters(DAILY_PARAMETERS)) <= union)
+        self.assertTrue(set(parse_parameters(PREDICTION_PARAMETERS)) <= union)
+        self.assertEqual(fetch_parameters_for("T2M,RH2M"), UNION_PARAMETERS)
+        self.assertTrue(fetch_parameters_for("WS2M").endswith(",WS2M"))
+
+    def test_consumers_share_one_download(self, mock_request, mock_year):
+        """Test that daily data is cut from the years downloaded for the worker."""
+        series = fetch_window_series(CELL, 2023, 2024, PREDICTION_PARAMETERS, cache=self.cache)
+        self.assertEqual(mock_request.call_args.args[0]["parameters"], UNION_PARAMETERS)
+        self.assertEqual(series.parameters, parse_parameters(PREDICTION_PARAMETERS))
+        self.assertEqual(len(series), 365 + 366)
+        mock_request.reset_mock()
+
+        daily = fetch_window(CELL, "20240301", "20240310", DAILY_PARAMETERS, cache=self.cache)
+
+        mock_request.assert_not_called()
+        self.assertEqual(list(daily["properties"]["parameter"]), parse_parameters(DAILY_PARAMETERS))
+        self.assertEqual(len(daily["properties"]["parameter"]["T2M"]), 10)
+        self.assertEqual(list(daily["parameters"]), parse_parameters(DAILY_PARAMETERS))
+
+    def test_short_window_is_not_widened(self, mock_request, mock_year):
+        """Test that an uncached short window downloads only its own dates and parameters."""
+        mock_request.side_effect = lambda params: _full_response({**params, "end": params["start"]})
+        daily = fetch_window(CELL, "20260301", "20260310", DAILY_PARAMETERS, cache=self.cache)
+
+        params = mock_request.call_args.args[0]
+        self.assertEqual((params["start"], params["end"]), ("20260301", "20260310"))
+        self.assertEqual(params["parameters"], DAILY_PARAMETERS)
+        self.assertEqual(len(daily["properties"]["parameter"]["T2M"]), 10)
+
+        # Partial windows are not stored
+        fetch_window(CELL, "20260301", "20260310", DAILY_PARAMETERS, cache=self.cache)
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_completed_years_are_stored(self, mock_request, mock_year):
+        """Test that a window of whole completed years goes through the per-year store."""
+        fetch_window(CELL, "20240101", "20241231", DAILY_PARAMETERS, cache=self.cache)
+        self.assertEqual(mock_request.call_args.args[0]["parameters"], UNION_PARAMETERS)
+
+        fetch_window(CELL, "20240601", "20240630", DAILY_PARAMETERS, cache=self.cache)
+        self.assertEqual(mock_request.call_count, 1)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -2,9 +2,11 @@
 Type definitions for NASA Power API responses.
 """
 
-from typing import Dict, Any, List, TypedDict
+from typing import Dict, Any, List, Optional, TypedDict
 from dataclasses import dataclass
 
+from .series import NASASeries
+
 
 class ParameterData(TypedDict, total=False):
     """
@@ -78,10 +80,23 @@ class NASAPowerResponse:
     messages: List[Any]
     parameters: Dict[str, ParameterInfo]
     times: Times
+    series: Optional[NASASeries] = None  # Columnar view, set when built with columnar=True
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'NASAPowerResponse':
-        """Create NASAPowerResponse from API response dictionary."""
+    def from_dict(cls, data: Dict[str, Any], columnar: bool = False) -> 'NASAPowerResponse':
+        """
+        Create NASAPowerResponse from API response dictionary.
+
+        With `columnar=True` the parameter data is converted in one pass into
+        a NASASeries (`series`) and `properties.parameter` is left empty, so
+        the per-date dictionaries are not kept in memory.
+        """
+        parameter = data["properties"]["parameter"]
+        series = None
+        if columnar:
+            series = NASASeries.from_parameter_dict(parameter, fill_value=data["header"]["fill_value"])
+            parameter = {}
+
         return cls(
             type=data["type"],
             geometry=Geometry(
@@ -89,7 +104,7 @@ class NASAPowerResponse:
                 coordinates=data["geometry"]["coordinates"]
             ),
             properties=Properties(
-                parameter=data["properties"]["parameter"]  # type: ignore[typeddict-item]
+                parameter=parameter  # type: ignore[typeddict-item]
             ),
             header=Header(
                 title=data["header"]["title"],
@@ -113,5 +128,6 @@ class NASAPowerResponse:
             times=Times(
                 data=data["times"]["data"],
                 process=data["times"]["process"]
-            )
+            ),
+            series=series
         )
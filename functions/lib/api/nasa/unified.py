@@ -0,0 +1,149 @@
+"""
+Single NASA POWER fetch layer shared by every consumer.
+
+The daily data endpoint and the prediction worker need different but
+overlapping parameter sets. Instead of downloading and caching each set
+separately, the union of all known sets is fetched once per grid cell and
+year (see history) and every caller gets a projection of its own
+parameters and dates. A consumer asking for a parameter outside the union
+still works, but fetches (and caches) its own extended set.
+
+Short windows (a few days or weeks) are never widened to whole years:
+they are served from the stored years when all of them are available and
+otherwise downloaded exactly as asked for.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from .cache import GridCell, NASADiskCache, get_default_cache
+from .history import (
+    fetch_date_window, fetch_year_window, fetch_year_window_series, is_completed_year_window, read_stored_years
+)
+from .series import NASASeries
+from .spatial import get_spatial_store
+
+# Parameters of `fetch_nasa_daily_data`
+DAILY_PARAMETERS = "T2M,RH2M,PRECTOTCORR,GWETROOT,GWETTOP,PRECSNO,TSOIL5"
+
+# Parameters used by the prediction worker
+PREDICTION_PARAMETERS = "T2M_MAX,T2M_MIN,RH2M,PRECTOTCORR,GWETROOT,GWETTOP,PRECSNO,TSOIL5"
+
+
+def parse_parameters(parameters: str) -> List[str]:
+    """Split a comma separated parameter string into normalized names."""
+    return [name.strip().upper() for name in parameters.split(",") if name.strip()]
+
+
+def union_parameters(*parameter_sets: str) -> str:
+    """Union of parameter strings, in first-seen order."""
+    names: List[str] = []
+    for parameters in parameter_sets:
+        names.extend(name for name in parse_parameters(parameters) if name not in names)
+    return ",".join(names)
+
+
+# Parameter set that is actually downloaded and cached
+UNION_PARAMETERS = union_parameters(DAILY_PARAMETERS, PREDICTION_PARAMETERS)
+
+
+def fetch_parameters_for(parameters: str) -> str:
+    """Parameter set to download in order to serve `parameters`."""
+    if set(parse_parameters(parameters)) <= set(parse_parameters(UNION_PARAMETERS)):
+        return UNION_PARAMETERS
+    logging.warning(f"NASA parameters {parameters} are not all in the shared set, add them to UNION_PARAMETERS")
+    return union_parameters(UNION_PARAMETERS, parameters)
+
+
+def project_response(
+    data: Dict[str, Any], parameters: Iterable[str], start_date: str, end_date: str
+) -> Dict[str, Any]:
+    """Restrict a NASA POWER JSON response to `parameters` and a YYYYMMDD date window."""
+    names = list(parameters)
+    parameter = {
+        name: {date: value for date, value in data["properties"]["parameter"][name].items()
+               if start_date <= date <= end_date}
+        for name in names if name in data["properties"]["parameter"]
+    }
+
+    projected = {
+        **data,
+        "properties": {**data["properties"], "parameter": parameter},
+        "header": {**(data.get("header") or {}), "start": start_date, "end": end_date},
+    }
+    if isinstance(data.get("parameters"), dict):
+        projected["parameters"] = {name: info for name, info in data["parameters"].items() if name in names}
+    return projected
+
+
+def fetch_window(
+    cell: GridCell,
+    start_date: str,
+    end_date: str,
+    parameters: str,
+    cache: Optional[NASADiskCache] = None,
+) -> Dict[str, Any]:
+    """
+    NASA POWER JSON response for `cell`, `parameters` and a YYYYMMDD window.
+
+    The window is cut from the stored years when all of them are stored.
+    A window of whole completed years goes through the per-year store, any
+    other window is downloaded as asked for and not stored.
+
+    Raises:
+        requests.RequestException: If a download fails
+        ValueError: If NASA POWER returned no data for the window
+    """
+    cache = cache or get_default_cache()
+    names = parse_parameters(parameters)
+    shared_parameters = fetch_parameters_for(parameters)
+    start_year, end_year = int(start_date[:4]), int(end_date[:4])
+
+    data = read_stored_years(cell, start_year, end_year, shared_parameters, cache=cache)
+    if data is None and is_completed_year_window(start_date, end_date):
+        data = fetch_year_window(cell, start_year, end_year, shared_parameters, cache=cache)
+    if data is None:
+        data = fetch_date_window(cell, start_date, end_date, ",".join(names))
+    return project_response(data, names, start_date, end_date)
+
+
+def fetch_window_series(
+    cell: GridCell,
+    start_year: int,
+    end_year: int,
+    parameters: str,
+    cache: Optional[NASADiskCache] = None,
+) -> NASASeries:
+    """
+    Columnar series of whole years for `cell`, restricted to `parameters`.
+
+    The projection shares the buffers of the cached series.
+
+    Raises:
+        requests.RequestException: If a download fails
+        ValueError: If NASA POWER returned no data for the window
+    """
+    cache = cache or get_default_cache()
+    series = fetch_year_window_series(cell, start_year, end_year, fetch_parameters_for(parameters), cache=cache)
+    return series.select(parse_parameters(parameters))
+
+
+def fetch_cell_history(
+    cell: GridCell,
+    start_year: int,
+    end_year: int,
+    parameters: str,
+    cache: Optional[NASADiskCache] = None,
+) -> NASASeries:
+    """
+    `fetch_window_series` of a cell's history window that also indexes the
+    cell in the spatial store, so uncached cells around it can be
+    approximated from its series.
+
+    Raises:
+        requests.RequestException: If a download fails
+        ValueError: If NASA POWER returned no data for the window
+    """
+    series = fetch_window_series(cell, start_year, end_year, parameters, cache=cache)
+    get_spatial_store(UNION_PARAMETERS, start_year, end_year).add(cell)
+    return series
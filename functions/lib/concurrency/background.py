@@ -0,0 +1,84 @@
+"""
+Deduplicated background tasks.
+
+Work that should not delay a response, e.g. fetching the real NASA history
+of a cell after serving an approximation from its neighbours, is queued
+once per key and run on a small thread pool. A function invocation calls
+`drain` before returning, so the queued work finishes while the instance
+still has CPU allocated.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_WORKERS = 2
+
+
+class BackgroundTasks:
+    """Run at most one pending task per key in the background."""
+
+    def __init__(self, name: str, workers: int = DEFAULT_WORKERS):
+        self.name = name
+        self.submitted = 0
+        self.skipped = 0
+        self.failed = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"background-{name}")
+        self._tasks: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        Queue `fn(*args, **kwargs)` unless a task with `key` is still pending.
+
+        Returns:
+            True if the task was queued
+        """
+        with self._lock:
+            if key in self._tasks:
+                self.skipped += 1
+                return False
+            self.submitted += 1
+            future = self._executor.submit(self._run, key, fn, *args, **kwargs)
+            self._tasks[key] = future
+        return True
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for every pending task.
+
+        Returns:
+            True if no task is left pending
+        """
+        with self._lock:
+            pending = list(self._tasks.values())
+        return not wait(pending, timeout=timeout).not_done
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"submitted": self.submitted, "skipped": self.skipped, "failed": self.failed,
+                    "pending": len(self._tasks)}
+
+    def _run(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> None:
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logging.error(f"Background task {self.name}:{key} failed: {e}")
+        finally:
+            with self._lock:
+                self._tasks.pop(key, None)
+
+
+_groups: Dict[str, BackgroundTasks] = {}
+_groups_lock = threading.Lock()
+
+
+def get_background_tasks(name: str) -> BackgroundTasks:
+    """Return the process-wide background task group called `name`."""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = BackgroundTasks(name)
+        return _groups[name]
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Unit tests for deduplicated background tasks.
+"""
+
+import threading
+import unittest
+import sys
+import os
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from lib.concurrency.background import BackgroundTasks, get_background_tasks
+
+
+class TestBackgroundTasks(unittest.TestCase):
+    """Test cases for BackgroundTasks."""
+
+    def test_pending_key_is_queued_once(self):
+        """Test that a key is not queued again while its task is pending."""
+        tasks = BackgroundTasks("test")
+        release = threading.Event()
+        calls = []
+
+        def refresh(cell):
+            release.wait(5)
+            calls.append(cell)
+
+        self.assertTrue(tasks.submit("cell", refresh, "cell"))
+        self.assertFalse(tasks.submit("cell", refresh, "cell"))
+        release.set()
+
+        self.assertTrue(tasks.drain(timeout=5))
+        self.assertEqual(calls, ["cell"])
+        self.assertEqual(tasks.stats(), {"submitted": 1, "skipped": 1, "failed": 0, "pending": 0})
+
+        # A finished key can be queued again
+        self.assertTrue(tasks.submit("cell", refresh, "cell"))
+        self.assertTrue(tasks.drain(timeout=5))
+        self.assertEqual(len(calls), 2)
+
+    def test_failure_is_logged(self):
+        """Test that a failing task is counted and does not raise."""
+        tasks = BackgroundTasks("test")
+
+        def failing():
+            raise ValueError("boom")
+
+        with self.assertLogs(level="ERROR"):
+            tasks.submit("cell", failing)
+            self.assertTrue(tasks.drain(timeout=5))
+        self.assertEqual(tasks.stats()["failed"], 1)
+
+    def test_named_groups(self):
+        """Test that named groups are shared per process."""
+        self.assertIs(get_background_tasks("test"), get_background_tasks("test"))
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Unit tests for single-flight call coalescing.
+"""
+
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from lib.concurrency.single_flight import SingleFlight, get_single_flight, coalesced_counts
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight."""
+
+    def _run_concurrently(self, flight, key, fn, callers=5):
+        results, errors = [], []
+        barrier = threading.Barrier(callers)
+
+        def call():
+            barrier.wait()
+            try:
+                results.append(flight.do(key, fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Test that concurrent callers share one execution."""
+        flight = SingleFlight("test")
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results, errors = self._run_concurrently(flight, "key", slow)
+
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats(), {"executed": 1, "coalesced": 4, "in_flight": 0})
+
+    def test_exception_is_shared(self):
+        """Test that every waiting caller receives the leader's exception."""
+        flight = SingleFlight("test")
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        results, errors = self._run_concurrently(flight, "key", failing)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 5)
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+
+    def test_sequential_calls_run_again(self):
+        """Test that a finished call is not cached."""
+        flight = SingleFlight("test")
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+        self.assertEqual(flight.do("key", lambda: 2), 2)
+        self.assertEqual(flight.coalesced, 0)
+
+    def test_named_groups(self):
+        """Test that named groups are shared per process."""
+        self.assertIs(get_single_flight("nasa-test"), get_single_flight("nasa-test"))
+        self.assertIn("nasa-test", coalesced_counts())
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from firebase_admin import db
 from pydantic import BaseModel
 
@@ -43,3 +45,25 @@ def update(payload: UpdateRequest):
         ref.update({"status": payload.status, "updated_at": payload.updated_at})
 
     return {"is_success": True, "message": "Update successful"}
+
+
+# Status of a streamed forecast: "streaming" while days arrive, then "done" or "error"
+FORECAST_STREAMING = "streaming"
+FORECAST_DONE = "done"
+FORECAST_ERROR = "error"
+
+
+def push_forecast_day(id_user: str, id_request: str, entry: dict):
+    # One multi-path update per day: the entry under forecast/{date} and the request status
+    ref = db.reference(f"{id_user}/{id_request}")
+    ref.update({f"forecast/{entry['date']}": entry, "status": FORECAST_STREAMING})
+
+    return {"is_success": True, "message": "Forecast day published"}
+
+
+def finish_forecast(id_user: str, id_request: str, status: str, forecast: Optional[List[dict]] = None):
+    # Terminal status, written together with any days that were not streamed (e.g. cached results)
+    ref = db.reference(f"{id_user}/{id_request}")
+    ref.update({**{f"forecast/{entry['date']}": entry for entry in forecast or []}, "status": status})
+
+    return {"is_success": True, "message": "Forecast finished"}
@@ -0,0 +1,232 @@
+"""
+Analog-year forecast engine.
+
+Instead of averaging every historical year, the forecast follows the years
+whose recent weather looked most like now. The weeks before an anchor date
+(by default the day after the last observed day) are summarized as weekly
+means of temperature, relative humidity and root soil moisture; the same
+calendar weeks of every stored year are summarized the same way and the
+standardized feature vectors are compared in one distance matrix. The k
+closest years are blended, weighted by inverse distance, over what followed
+them at the same lead time.
+"""
+
+import calendar
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import numpy as np
+
+from lib.api.nasa.series import NASASeries, MonthLike, parse_month
+from lib.forecast.climatology import _fill_missing_days, _forecast_entries, day_of_month_matrix, forecast_fields
+from lib.forecast.indicators import indicator_arrays
+from lib.forecast.schemas import ForecastEntry
+
+# Variables compared between years; T2M falls back to the mean of T2M_MAX and T2M_MIN
+ANALOG_VARIABLES = ("T2M", "RH2M", "GWETROOT")
+
+DEFAULT_ANALOG_YEARS = 3
+DEFAULT_ANALOG_WEEKS = 4
+
+# Keeps an exact match from getting an infinite weight
+_MIN_DISTANCE = 1e-6
+
+
+@dataclass
+class AnalogYears:
+    """
+    Historical years matched to an anchor date.
+
+    `years` are the anchor years of the matched windows, closest first;
+    `weights` sum to 1.
+    """
+    years: np.ndarray
+    distances: np.ndarray
+    weights: np.ndarray
+
+
+def distance_matrix(queries: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """
+    Root-mean-square distance between every query and candidate row.
+
+    Features missing (NaN) on either side are ignored; pairs without a
+    common feature are infinitely far apart.
+
+    Returns:
+        (queries, candidates) matrix
+    """
+    differences = queries[:, None, :] - candidates[None, :, :]
+    valid = ~np.isnan(differences)
+    counts = valid.sum(axis=2)
+    squared = np.where(valid, differences, 0.0) ** 2
+    return np.where(counts > 0, np.sqrt(squared.sum(axis=2) / np.maximum(counts, 1)), np.inf)
+
+
+def window_features(series: NASASeries, anchors: np.ndarray, weeks: int) -> np.ndarray:
+    """
+    Weekly means of ANALOG_VARIABLES over the `weeks` weeks before each anchor date.
+
+    Returns:
+        (anchors, variables x weeks) matrix, NaN for weeks without data
+
+    Raises:
+        ValueError: If a variable is missing from the series
+    """
+    days = weeks * 7
+    window_dates = anchors[:, None] - np.arange(days, 0, -1)
+    positions = np.searchsorted(series.dates, window_dates)
+    clipped = np.minimum(positions, len(series) - 1)
+    found = (positions < len(series)) & (series.dates[clipped] == window_dates)
+
+    features = []
+    for values in _analog_columns(series):
+        window = np.where(found, values[clipped], np.nan).reshape(len(anchors), weeks, 7)
+        counts = (~np.isnan(window)).sum(axis=2)
+        sums = np.where(np.isnan(window), 0.0, window).sum(axis=2)
+        features.append(np.where(counts > 0, sums / np.maximum(counts, 1), np.nan))
+    return np.concatenate(features, axis=1)
+
+
+def find_analog_years(
+    series: NASASeries,
+    anchor: Optional[np.datetime64] = None,
+    k: int = DEFAULT_ANALOG_YEARS,
+    weeks: int = DEFAULT_ANALOG_WEEKS,
+    candidate_years: Optional[np.ndarray] = None,
+) -> AnalogYears:
+    """
+    Find the `k` years whose weeks before the anchor's calendar day are
+    closest to the weeks before `anchor`.
+
+    Args:
+        series: Historical NASA POWER series
+        anchor: Date the query window ends before (default: the day after the series ends)
+        k: Number of analog years
+        weeks: Length of the compared window in weeks
+        candidate_years: Years allowed as analogs (default: every year of the series)
+
+    Raises:
+        ValueError: If the series is empty or the query window has no data
+    """
+    if not len(series):
+        raise ValueError("Cannot find analog years in an empty series")
+
+    anchor = np.datetime64(anchor, "D") if anchor is not None else series.dates[-1] + np.timedelta64(1, "D")
+    anchor_year = _year_of(anchor)
+    if candidate_years is None:
+        candidate_years = np.unique(series.years)
+    candidate_years = np.asarray([year for year in candidate_years if year != anchor_year], dtype=np.int64)
+
+    # The same day of year in every candidate year (29 Feb shifts to 1 Mar in common years)
+    day_of_year = anchor - _year_start(anchor_year)
+    anchors = np.concatenate(([anchor], _year_start(candidate_years) + day_of_year))
+    features = window_features(series, anchors, weeks)
+    if np.isnan(features[0]).all():
+        raise ValueError("No data in the weeks before the analog anchor date")
+
+    # Standardize every feature so temperature, humidity and soil moisture weigh the same
+    mean = _column_nanmean(features)
+    std = _column_nanstd(features, mean)
+    standardized = (features - mean) / np.where(std > 0, std, 1.0)
+
+    distances = distance_matrix(standardized[:1], standardized[1:])[0]
+    order = np.argsort(distances, kind="stable")
+    order = order[np.isfinite(distances[order])][:k]
+
+    inverse = 1.0 / np.maximum(distances[order], _MIN_DISTANCE)
+    return AnalogYears(years=candidate_years[order], distances=distances[order], weights=inverse / inverse.sum())
+
+
+def analog_forecast(
+    series: NASASeries,
+    month: MonthLike,
+    target_year: int,
+    best_conditions: Optional[Any] = None,
+    k: int = DEFAULT_ANALOG_YEARS,
+    weeks: int = DEFAULT_ANALOG_WEEKS,
+    anchor: Optional[np.datetime64] = None,
+) -> List[ForecastEntry]:
+    """
+    Forecast every day of `month` in `target_year` from the analog years.
+
+    The lead time between the anchor and the target is kept: with an anchor
+    in 2026 and a 2027 target, an analog year 2022 contributes its 2023 month.
+
+    Args:
+        series: Historical NASA POWER series, optionally with indicator columns
+        month: Month to forecast (number, name or abbreviation)
+        target_year: Year of the forecast
+        best_conditions: Crop best conditions used to compute `status`
+        k: Number of analog years blended
+        weeks: Length of the compared window in weeks
+        anchor: Date the compared window ends before (default: the day after the series ends)
+
+    Returns:
+        ForecastEntry list in the same shape as the other engines
+    """
+    month_number = parse_month(month)
+    years, matrices = day_of_month_matrix(series, month_number)
+    if not len(years) or not len(series):
+        return []
+
+    anchor = np.datetime64(anchor, "D") if anchor is not None else series.dates[-1] + np.timedelta64(1, "D")
+    lead_years = target_year - _year_of(anchor)
+
+    # Only years whose following month is in the series can be analogs
+    analogs = find_analog_years(series, anchor=anchor, k=k, weeks=weeks, candidate_years=years - lead_years)
+    if not len(analogs.years):
+        return []
+
+    rows = np.searchsorted(years, analogs.years + lead_years)
+    days_in_month = calendar.monthrange(target_year, month_number)[1]
+    predicted = {
+        field: _fill_missing_days(blend_years(values[rows], analogs.weights)[:days_in_month])
+        for field, values in forecast_fields(matrices).items()
+    }
+    indicators = {
+        field: blend_years(values[rows], analogs.weights)[:days_in_month]
+        for field, values in indicator_arrays(matrices).items()
+    }
+    return _forecast_entries(predicted, month_number, target_year, best_conditions, indicators)
+
+
+def blend_years(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted mean per day of a (years, days) matrix, renormalized over the years with data."""
+    valid = ~np.isnan(values)
+    total = (weights[:, None] * valid).sum(axis=0)
+    blended = (weights[:, None] * np.where(valid, values, 0.0)).sum(axis=0)
+    return np.where(total > 0, blended / np.where(total > 0, total, 1.0), np.nan)
+
+
+def _analog_columns(series: NASASeries) -> List[np.ndarray]:
+    columns = []
+    for name in ANALOG_VARIABLES:
+        if name in series:
+            columns.append(series[name].astype(np.float64).filled(np.nan))
+        elif name == "T2M" and "T2M_MAX" in series and "T2M_MIN" in series:
+            t_max = series["T2M_MAX"].astype(np.float64).filled(np.nan)
+            t_min = series["T2M_MIN"].astype(np.float64).filled(np.nan)
+            columns.append((t_max + t_min) / 2.0)
+        else:
+            raise ValueError(f"NASA series is missing parameter: {name}")
+    return columns
+
+
+def _column_nanmean(values: np.ndarray) -> np.ndarray:
+    counts = (~np.isnan(values)).sum(axis=0)
+    sums = np.where(np.isnan(values), 0.0, values).sum(axis=0)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def _column_nanstd(values: np.ndarray, mean: np.ndarray) -> np.ndarray:
+    deviations = np.where(np.isnan(values), 0.0, values - mean)
+    counts = np.maximum((~np.isnan(values)).sum(axis=0), 1)
+    return np.sqrt((deviations ** 2).sum(axis=0) / counts)
+
+
+def _year_start(years) -> np.ndarray:
+    return (np.asarray(years, dtype=np.int64) - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+
+
+def _year_of(date: np.datetime64) -> int:
+    return int(date.astype("datetime64[Y]").astype(np.int64)) + 1970
@@ -0,0 +1,426 @@
+"""
+Local climatology forecast engine.
+
+Builds the per-day-of-month forecast from the fetched NASA POWER history
+instead of asking the LLM for a "climatological forecast": every day of
+the requested month is the mean (or median) of the same day in the
+historical years, optionally extrapolated with a linear trend across years.
+
+`build_climatology` condenses a whole series into per day-of-year
+statistics once, so forecasts for any month of the same grid cell are
+served from a few precomputed arrays (`forecast_from_climatology`, see
+climatology_store).
+"""
+
+import calendar
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from lib.api.nasa.series import NASASeries, MonthLike, parse_month
+from lib.forecast.indicators import INDICATOR_FIELDS, indicator_arrays
+from lib.forecast.schemas import ForecastEntry, PredictedData
+from lib.forecast.scoring import score_forecast
+
+CLIMATOLOGY_METHODS = ("mean", "median")
+
+# NASA POWER parameters needed to build every predicted field
+REQUIRED_PARAMETERS = ["T2M_MAX", "T2M_MIN", "RH2M", "PRECTOTCORR", "GWETROOT", "PRECSNO", "TSOIL5"]
+
+# Statistics kept per parameter and day of year
+CLIMATOLOGY_STATS = ("mean", "std", "p10", "p50", "p90", "trend")
+
+# Days of year are counted on a leap-year calendar, so 1 March is slot 60 in
+# every year and 29 February (slot 59) only holds leap-year data
+DAY_OF_YEAR_SLOTS = 366
+_LEAP_MONTH_LENGTHS = np.array([31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+_LEAP_MONTH_STARTS = np.concatenate(([0], np.cumsum(_LEAP_MONTH_LENGTHS)[:-1]))
+_FEBRUARY_29_SLOT = 59
+
+
+def calendar_slots(months: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Leap-year day-of-year slot (0..365) of every (month, day) pair."""
+    return _LEAP_MONTH_STARTS[np.asarray(months) - 1] + np.asarray(days) - 1
+
+
+def month_slots(month: MonthLike) -> np.ndarray:
+    """Day-of-year slots of every day of `month` (29 for February)."""
+    month_number = parse_month(month)
+    start = _LEAP_MONTH_STARTS[month_number - 1]
+    return np.arange(start, start + _LEAP_MONTH_LENGTHS[month_number - 1])
+
+
+@dataclass
+class DayOfYearClimatology:
+    """
+    Per day-of-year statistics of a historical window.
+
+    `stats[parameter][stat]` is a float array of DAY_OF_YEAR_SLOTS values
+    (NaN without data) for every stat in CLIMATOLOGY_STATS; `trend` is the
+    least-squares slope across years (units per year). `months` limits which
+    months are reported, e.g. by the prompt builder.
+    """
+    start_year: int
+    end_year: int
+    stats: Dict[str, Dict[str, np.ndarray]]
+    months: Tuple[int, ...] = field(default=tuple(range(1, 13)))
+
+    @property
+    def parameters(self) -> List[str]:
+        return list(self.stats.keys())
+
+    @property
+    def mid_year(self) -> float:
+        """Year the trend is centered on."""
+        return (self.start_year + self.end_year) / 2.0
+
+    def select_months(self, months: Union[MonthLike, Iterable[MonthLike]]) -> 'DayOfYearClimatology':
+        """Return the same statistics restricted to one or several months."""
+        if isinstance(months, (int, str)):
+            months = [months]
+        return replace(self, months=tuple(sorted({parse_month(month) for month in months})))
+
+    def month_stat(self, parameter: str, stat: str, month: MonthLike) -> np.ndarray:
+        """Values of one statistic for every day of `month`."""
+        return self.stats[parameter][stat][month_slots(month)]
+
+
+def build_climatology(series: NASASeries) -> DayOfYearClimatology:
+    """
+    Compute the day-of-year climatology of every parameter of `series`.
+
+    All parameters are laid out as one (years, parameters x days) matrix so
+    every statistic is a single vectorized reduction over the years axis.
+
+    Raises:
+        ValueError: If the series is empty
+    """
+    if not len(series):
+        raise ValueError("Cannot build a climatology from an empty series")
+
+    years = series.years
+    start_year, end_year = int(years.min()), int(years.max())
+    year_axis = np.arange(start_year, end_year + 1)
+    names = series.parameters
+
+    cube = np.full((len(year_axis), len(names), DAY_OF_YEAR_SLOTS), np.nan, dtype=np.float64)
+    rows = years - start_year
+    slots = calendar_slots(series.months, series.days)
+    for index, name in enumerate(names):
+        cube[rows, index, slots] = series[name].astype(np.float64).filled(np.nan)
+
+    summary = summarize_day_matrix(cube.reshape(len(year_axis), -1), year_axis)
+    stats = {
+        name: {stat: values.reshape(len(names), DAY_OF_YEAR_SLOTS)[index] for stat, values in summary.items()}
+        for index, name in enumerate(names)
+    }
+    return DayOfYearClimatology(start_year=start_year, end_year=end_year, stats=stats)
+
+
+def summarize_day_matrix(values: np.ndarray, years: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute every stat in CLIMATOLOGY_STATS for each column of a (years, days) matrix."""
+    counts = (~np.isnan(values)).sum(axis=0)
+    has_data = counts > 0
+
+    percentiles = np.full((3, values.shape[1]), np.nan, dtype=np.float64)
+    if has_data.any():
+        percentiles[:, has_data] = np.nanpercentile(values[:, has_data], [10, 50, 90], axis=0)
+
+    slope, _ = trend_slope(values, years)
+    return {
+        "mean": _nan_reduce(np.nanmean, values, counts),
+        "std": _nan_reduce(np.nanstd, values, counts),
+        "p10": percentiles[0],
+        "p50": percentiles[1],
+        "p90": percentiles[2],
+        "trend": np.where(has_data, slope, np.nan),
+    }
+
+
+def day_of_month_matrix(series: NASASeries, month: MonthLike) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Arrange the records of `month` as a (years, 31) matrix per parameter.
+
+    Returns:
+        Tuple of (years, matrices). Missing days (short months, fill values)
+        are NaN.
+    """
+    blocks = series.month_blocks(month)
+    years = np.array([int(block.years[0]) for block in blocks], dtype=np.int64)
+
+    matrices = {}
+    for name in series.parameters:
+        matrix = np.full((len(blocks), 31), np.nan, dtype=np.float64)
+        for row, block in enumerate(blocks):
+            matrix[row, block.days - 1] = block[name].astype(np.float64).filled(np.nan)
+        matrices[name] = matrix
+
+    return years, matrices
+
+
+def forecast_fields(matrices: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Derive the PredictedData fields from NASA parameter matrices."""
+    missing = [name for name in REQUIRED_PARAMETERS if name not in matrices]
+    if missing:
+        raise ValueError(f"NASA series is missing parameters: {', '.join(missing)}")
+
+    return {
+        "moisture": matrices["GWETROOT"],
+        "temperature": (matrices["T2M_MAX"] + matrices["T2M_MIN"]) / 2.0,
+        "precipitation": matrices["PRECTOTCORR"],
+        "snow_precipitation": matrices["PRECSNO"],
+        "soil_temperature": matrices["TSOIL5"],
+        "humidity": matrices["RH2M"],
+    }
+
+
+def summarize_years(
+    values: np.ndarray, years: np.ndarray, target_year: int, method: str = "mean", trend: bool = False
+) -> np.ndarray:
+    """
+    Collapse a (years, days) matrix into one value per day.
+
+    With `trend=True` a least-squares line is fitted per day across years
+    (ignoring missing values) and evaluated at `target_year`.
+    """
+    if method not in CLIMATOLOGY_METHODS:
+        raise ValueError(f"Unknown climatology method: {method}")
+
+    counts = (~np.isnan(values)).sum(axis=0)
+    if method == "median":
+        center = _nan_reduce(np.nanmedian, values, counts)
+    else:
+        center = _nan_reduce(np.nanmean, values, counts)
+
+    if not trend:
+        return center
+
+    slope, x_mean = trend_slope(values, years)
+    return center + slope * (target_year - x_mean)
+
+
+def trend_slope(values: np.ndarray, years: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Least-squares slope per day (units per year) of a (years, days) matrix.
+
+    Returns:
+        Tuple of (slope, mean year of the valid samples). Days with fewer
+        than two valid years get a slope of 0.
+    """
+    valid = ~np.isnan(values)
+    counts = np.maximum(valid.sum(axis=0), 1)
+
+    x = np.where(valid, years[:, None].astype(np.float64), 0.0)
+    x_mean = x.sum(axis=0) / counts
+    y_mean = np.where(valid, values, 0.0).sum(axis=0) / counts
+    dx = np.where(valid, x - x_mean, 0.0)
+    dy = np.where(valid, values - y_mean, 0.0)
+
+    denominator = (dx * dx).sum(axis=0)
+    slope = (dx * dy).sum(axis=0) / np.where(denominator > 0, denominator, 1.0)
+    return np.where(denominator > 0, slope, 0.0), x_mean
+
+
+def _nan_reduce(reducer, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Apply a nan-aware reducer without warnings on all-NaN columns."""
+    result = np.full(values.shape[1], np.nan, dtype=np.float64)
+    has_data = counts > 0
+    if has_data.any():
+        result[has_data] = reducer(values[:, has_data], axis=0)
+    return result
+
+
+def matrix_forecast(
+    years: np.ndarray,
+    matrices: Dict[str, np.ndarray],
+    month_number: int,
+    target_year: int,
+    best_conditions: Optional[Any] = None,
+    method: str = "mean",
+    trend: bool = False,
+) -> List[ForecastEntry]:
+    """
+    Forecast every day of `month_number` in `target_year` from matrices
+    already built by `day_of_month_matrix` (used by the ensemble engine).
+
+    Args:
+        years: Historical year of every matrix row
+        matrices: (years, 31) matrix per NASA parameter
+        month_number: Month to forecast (1-12)
+        target_year: Year of the forecast
+        best_conditions: Crop best conditions used to compute `status`
+        method: "mean" or "median" across years
+        trend: Extrapolate a per-day linear trend across years
+
+    Returns:
+        ForecastEntry list in the same shape as the LLM forecast
+    """
+    days_in_month = calendar.monthrange(target_year, month_number)[1]
+    predicted = {
+        key: _fill_missing_days(summarize_years(values, years, target_year, method, trend)[:days_in_month])
+        for key, values in forecast_fields(matrices).items()
+    }
+    # Indicators (when the series has them) are plain averages across years
+    indicators = {
+        key: summarize_years(values, years, target_year)[:days_in_month]
+        for key, values in indicator_arrays(matrices).items()
+    }
+    return _forecast_entries(predicted, month_number, target_year, best_conditions, indicators)
+
+
+def forecast_from_climatology(
+    climatology: DayOfYearClimatology,
+    month: MonthLike,
+    target_year: int,
+    best_conditions: Optional[Any] = None,
+    method: str = "mean",
+    trend: bool = False,
+) -> List[ForecastEntry]:
+    """
+    Same forecast as `matrix_forecast`, read from precomputed statistics.
+    This is the entry point of the climatology engine.
+
+    The median uses the stored P50; the trend is extrapolated from the middle
+    of the historical window. Indicators are always the plain mean.
+    """
+    if method not in CLIMATOLOGY_METHODS:
+        raise ValueError(f"Unknown climatology method: {method}")
+
+    month_number = parse_month(month)
+    days_in_month = calendar.monthrange(target_year, month_number)[1]
+    center = "p50" if method == "median" else "mean"
+
+    values = {}
+    for name in climatology.parameters:
+        day_values = climatology.month_stat(name, center, month_number)[:days_in_month]
+        if trend:
+            slope = climatology.month_stat(name, "trend", month_number)[:days_in_month]
+            day_values = day_values + slope * (target_year - climatology.mid_year)
+        values[name] = day_values
+
+    predicted = {key: _fill_missing_days(field_values) for key, field_values in forecast_fields(values).items()}
+    indicators = {
+        key: climatology.month_stat(name, "mean", month_number)[:days_in_month]
+        for key, name in INDICATOR_FIELDS.items() if name in climatology.stats
+    }
+    return _forecast_entries(predicted, month_number, target_year, best_conditions, indicators)
+
+
+def forecast_year_from_climatology(
+    climatology: DayOfYearClimatology,
+    target_year: int,
+    best_conditions: Optional[Any] = None,
+    method: str = "mean",
+    trend: bool = False,
+) -> Dict[int, List[ForecastEntry]]:
+    """
+    Forecast every day of `target_year` in one pass over the day-of-year
+    statistics, with the same values as `forecast_from_climatology`.
+
+    Returns:
+        ForecastEntry list per month number (1..12)
+    """
+    if method not in CLIMATOLOGY_METHODS:
+        raise ValueError(f"Unknown climatology method: {method}")
+
+    slots = np.arange(DAY_OF_YEAR_SLOTS)
+    if not calendar.isleap(target_year):
+        slots = slots[slots != _FEBRUARY_29_SLOT]
+    center = "p50" if method == "median" else "mean"
+
+    values = {}
+    for name in climatology.parameters:
+        day_values = climatology.stats[name][center][slots]
+        if trend:
+            day_values = day_values + climatology.stats[name]["trend"][slots] * (target_year - climatology.mid_year)
+        values[name] = day_values
+
+    predicted = {key: _fill_missing_days(field_values) for key, field_values in forecast_fields(values).items()}
+    indicators = {
+        key: climatology.stats[name]["mean"][slots]
+        for key, name in INDICATOR_FIELDS.items() if name in climatology.stats
+    }
+    dates = np.arange(np.datetime64(f"{target_year}-01-01"), np.datetime64(f"{target_year + 1}-01-01"))
+    entries = _dated_entries(predicted, [str(date).replace("-", "") for date in dates], best_conditions, indicators)
+
+    months: Dict[int, List[ForecastEntry]] = {month: [] for month in range(1, 13)}
+    for entry in entries:
+        months[int(entry.date[4:6])].append(entry)
+    return months
+
+
+def attach_indicators(
+    entries: List[ForecastEntry], climatology: DayOfYearClimatology, best_conditions: Optional[Any] = None
+) -> List[ForecastEntry]:
+    """
+    Fill the indicator fields of forecast entries (e.g. from the LLM) from
+    the climatology, then re-score them when `best_conditions` is given.
+
+    Entries are updated in place and returned for convenience.
+    """
+    if not entries:
+        return entries
+
+    months = np.array([int(entry.date[4:6]) for entry in entries])
+    days = np.array([int(entry.date[6:8]) for entry in entries])
+    slots = calendar_slots(months, days)
+    for key, name in INDICATOR_FIELDS.items():
+        if name not in climatology.stats:
+            continue
+        for entry, value in zip(entries, climatology.stats[name]["mean"][slots].tolist()):
+            setattr(entry.predicted_data, key, None if np.isnan(value) else round(value, 4))
+
+    if best_conditions is not None:
+        score_forecast(entries, best_conditions)
+    return entries
+
+
+def _forecast_entries(
+    predicted: Dict[str, np.ndarray],
+    month_number: int,
+    target_year: int,
+    best_conditions: Optional[Any],
+    indicators: Optional[Dict[str, np.ndarray]] = None,
+) -> List[ForecastEntry]:
+    """
+    Turn per-day field arrays into (scored) ForecastEntry objects.
+
+    Days missing a predicted field are skipped; missing indicators are None.
+    """
+    days_in_month = len(next(iter(predicted.values())))
+    dates = [f"{target_year}{month_number:02d}{day:02d}" for day in range(1, days_in_month + 1)]
+    return _dated_entries(predicted, dates, best_conditions, indicators)
+
+
+def _dated_entries(
+    predicted: Dict[str, np.ndarray],
+    dates: List[str],
+    best_conditions: Optional[Any],
+    indicators: Optional[Dict[str, np.ndarray]] = None,
+) -> List[ForecastEntry]:
+    """Same as `_forecast_entries` for arrays covering the given YYYYMMDD dates."""
+    entries = []
+    for day, date in enumerate(dates):
+        day_values = {key: values[day] for key, values in predicted.items()}
+        if any(np.isnan(value) for value in day_values.values()):
+            continue
+        day_data = {key: round(float(value), 2) for key, value in day_values.items()}
+        # Indicators such as the moisture trend are small, keep more decimals
+        for key, values in (indicators or {}).items():
+            day_data[key] = None if np.isnan(values[day]) else round(float(values[day]), 4)
+        entries.append(ForecastEntry(date=date, predicted_data=PredictedData(**day_data)))
+
+    if best_conditions is not None:
+        score_forecast(entries, best_conditions)
+
+    return entries
+
+
+def _fill_missing_days(values: np.ndarray) -> np.ndarray:
+    """Carry the previous day's value into days without history (e.g. Feb 29)."""
+    filled = values.copy()
+    for day in range(1, len(filled)):
+        if np.isnan(filled[day]):
+            filled[day] = filled[day - 1]
+    return filled
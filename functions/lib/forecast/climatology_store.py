@@ -0,0 +1,187 @@
+"""
+Mongo store of precomputed day-of-year climatologies.
+
+`build_climatology` turns years of raw NASA POWER data into a few arrays per
+parameter. They are stored in the `climatology` collection (one document per
+grid cell, historical window and parameter) with an in-process LRU in front,
+so the forecast engines and the prompt builder read precomputed statistics
+instead of re-deriving them from the raw series on every request.
+
+`store_cell_climatology` and `refresh_cell_climatology` are the single
+path that builds and stores a cell's climatology, shared by the prediction
+worker and the nightly prefetch.
+"""
+
+import logging
+import os
+import threading
+from typing import List, Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+from infrastructure.database.collections.climatology_collection import ClimatologyCollection
+from infrastructure.database.models.climatology_model import ClimatologyModel
+from lib.api.nasa.cache import GridCell
+from lib.api.nasa.history import series_year_is_final
+from lib.api.nasa.series import NASASeries
+from lib.api.nasa.unified import fetch_cell_history, parse_parameters
+from lib.forecast.climatology import CLIMATOLOGY_STATS, DayOfYearClimatology, build_climatology
+from lib.forecast.indicators import INDICATOR_PARAMETERS, cell_indicator_series
+
+DEFAULT_LRU_SIZE = 64
+
+
+def climatology_to_models(cell: GridCell, climatology: DayOfYearClimatology) -> List[ClimatologyModel]:
+    """Convert a climatology into one document per parameter."""
+    return [
+        ClimatologyModel(
+            cell_key=cell.key,
+            latitude=cell.latitude,
+            longitude=cell.longitude,
+            parameter=name,
+            start_year=climatology.start_year,
+            end_year=climatology.end_year,
+            **{stat: _to_list(stats[stat]) for stat in CLIMATOLOGY_STATS},
+        )
+        for name, stats in climatology.stats.items()
+    ]
+
+
+def climatology_from_documents(documents: List[dict]) -> DayOfYearClimatology:
+    """Rebuild a climatology from its stored per-parameter documents."""
+    return DayOfYearClimatology(
+        start_year=documents[0]["start_year"],
+        end_year=documents[0]["end_year"],
+        stats={
+            document["parameter"]: {stat: _to_array(document[stat]) for stat in CLIMATOLOGY_STATS}
+            for document in documents
+        },
+    )
+
+
+class ClimatologyStore:
+    """In-process LRU in front of the Mongo `climatology` collection."""
+
+    def __init__(self, lru_size: Optional[int] = None):
+        self._memory = LRUCache(maxsize=lru_size or int(os.getenv("CLIMATOLOGY_LRU_SIZE", DEFAULT_LRU_SIZE)))
+        self._lock = threading.Lock()
+        self._indexes_ready = False
+
+    def get(self, cell: GridCell, start_year: int, end_year: int,
+            parameters: List[str]) -> Optional[DayOfYearClimatology]:
+        """Return the stored climatology holding all `parameters`, or None."""
+        key = (cell.key, start_year, end_year)
+        with self._lock:
+            climatology = self._memory.get(key)
+
+        if climatology is None or not set(parameters) <= set(climatology.parameters):
+            climatology = self._get_from_db(cell, start_year, end_year, parameters)
+            if climatology is None:
+                return None
+            with self._lock:
+                self._memory[key] = climatology
+
+        return climatology
+
+    def save(self, cell: GridCell, climatology: DayOfYearClimatology) -> None:
+        """Store (or replace) the climatology of `cell`."""
+        with self._lock:
+            self._memory[(cell.key, climatology.start_year, climatology.end_year)] = climatology
+
+        try:
+            collection = ClimatologyCollection()
+            # Never raises: an index problem must not disable the store
+            self._ensure_indexes(collection)
+            for model in climatology_to_models(cell, climatology):
+                collection.upsert(model)
+        except Exception as e:
+            logging.error(f"Failed to store climatology of cell {cell.key}: {e}")
+
+    @staticmethod
+    def _get_from_db(cell: GridCell, start_year: int, end_year: int,
+                     parameters: List[str]) -> Optional[DayOfYearClimatology]:
+        try:
+            documents = ClimatologyCollection().list(
+                filter_by={"cell_key": cell.key, "start_year": start_year, "end_year": end_year,
+                           "parameter": {"$in": list(parameters)}},
+                hidden_fields=[], force_show_fields=[],
+            )
+        except Exception as e:
+            logging.error(f"Failed to read climatology of cell {cell.key}: {e}")
+            return None
+
+        if len(documents) < len(set(parameters)):
+            return None
+        return climatology_from_documents(documents)
+
+    def _ensure_indexes(self, collection: ClimatologyCollection) -> None:
+        """Create the collection indexes once per process; a failure is logged and not retried."""
+        with self._lock:
+            if self._indexes_ready:
+                return
+            self._indexes_ready = True
+        try:
+            collection.ensure_indexes()
+        except Exception as e:
+            logging.error(f"Failed to create climatology indexes: {e}")
+
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else round(value, 4) for value in values.tolist()]
+
+
+def _to_array(values: List[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+_default_store: Optional[ClimatologyStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_climatology_store() -> ClimatologyStore:
+    """Return the process-wide climatology store, creating it on first use."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ClimatologyStore()
+        return _default_store
+
+
+def climatology_parameters(parameters: str) -> List[str]:
+    """Parameters of a climatology built from the NASA `parameters`: the raw ones plus the indicators."""
+    return parse_parameters(parameters) + INDICATOR_PARAMETERS
+
+
+def store_cell_climatology(cell: GridCell, start_year: int, end_year: int,
+                           nasa_series: NASASeries) -> DayOfYearClimatology:
+    """
+    Build the climatology of a cell's raw history window and store it.
+
+    Stored climatologies never change, so a window whose last year NASA has
+    not fully published yet is returned without being stored.
+    """
+    climatology = build_climatology(cell_indicator_series(cell, start_year, end_year, nasa_series))
+    if series_year_is_final(nasa_series, end_year):
+        get_climatology_store().save(cell, climatology)
+    else:
+        logging.info(f"NASA data of {end_year} is not final for cell {cell.key}, climatology not stored")
+    return climatology
+
+
+def refresh_cell_climatology(cell: GridCell, start_year: int, end_year: int,
+                             parameters: str) -> DayOfYearClimatology:
+    """
+    Return the stored climatology of `cell`, or fetch its NASA history and
+    store the climatology built from it.
+
+    Raises:
+        requests.RequestException: If a download fails
+        ValueError: If NASA POWER returned no data for the window
+    """
+    climatology = get_climatology_store().get(cell, start_year, end_year, climatology_parameters(parameters))
+    if climatology is not None:
+        return climatology
+
+    nasa_series = fetch_cell_history(cell, start_year, end_year, parameters)
+    return store_cell_climatology(cell, start_year, end_year, nasa_series)
@@ -0,0 +1,122 @@
+"""
+Probabilistic ensemble scoring.
+
+A single forecast value per day hides how much the historical years
+disagree. Here every historical year is treated as one ensemble member:
+the values of each day of the month in every year are scored against the
+crop's best conditions in a single batched `score_arrays` call on
+(years, days) matrices, and the per-day status distribution is summarized
+as the probability of exceeding a threshold and its P10/P50/P90.
+
+The entries also carry the usual climatology forecast, so consumers of the
+plain forecast keep working.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from lib.api.nasa.series import NASASeries, MonthLike, parse_month
+from lib.forecast.climatology import day_of_month_matrix, forecast_fields, matrix_forecast
+from lib.forecast.indicators import indicator_arrays
+from lib.forecast.schemas import ForecastEntry, StatusEnsemble
+from lib.forecast.scoring import RISK_PENALTIES, score_arrays
+
+DEFAULT_STATUS_THRESHOLD = 0.7
+
+
+def member_statuses(matrices: Dict[str, np.ndarray], best_conditions: Any) -> np.ndarray:
+    """
+    Status of every historical year and day of the month.
+
+    Args:
+        matrices: NASA parameter matrices from `day_of_month_matrix`, with
+            indicator columns when the frost and heat risks should apply
+        best_conditions: Crop best conditions, as a dict or CropConditionModel
+
+    Returns:
+        (years, 31) matrix, NaN where a year has no value for the day
+    """
+    predicted = forecast_fields(matrices)
+    # A member either had frost / heat stress on that day or not
+    predicted.update({field: values for field, values in indicator_arrays(matrices).items()
+                      if field in RISK_PENALTIES})
+    return score_arrays(predicted, best_conditions)
+
+
+def summarize_statuses(statuses: np.ndarray, threshold: float = DEFAULT_STATUS_THRESHOLD) -> Dict[str, np.ndarray]:
+    """
+    Per-day summary of a (years, days) status matrix.
+
+    Returns:
+        Dict of day arrays: "probability" (share of members with a status
+        above `threshold`), "p10", "p50", "p90" and "members". Days without
+        members are NaN.
+    """
+    valid = ~np.isnan(statuses)
+    members = valid.sum(axis=0)
+    has_data = members > 0
+
+    above = (np.where(valid, statuses, -np.inf) > threshold).sum(axis=0)
+    percentiles = np.full((3, statuses.shape[1]), np.nan, dtype=np.float64)
+    if has_data.any():
+        percentiles[:, has_data] = np.nanpercentile(statuses[:, has_data], [10, 50, 90], axis=0)
+
+    return {
+        "probability": np.where(has_data, above / np.maximum(members, 1), np.nan),
+        "p10": percentiles[0],
+        "p50": percentiles[1],
+        "p90": percentiles[2],
+        "members": members,
+    }
+
+
+def ensemble_forecast(
+    series: NASASeries,
+    month: MonthLike,
+    target_year: int,
+    best_conditions: Any,
+    threshold: float = DEFAULT_STATUS_THRESHOLD,
+    method: str = "mean",
+    trend: bool = False,
+) -> List[ForecastEntry]:
+    """
+    Climatology forecast of `month` in `target_year` with the status
+    distribution of the historical years attached to every day.
+
+    Args:
+        series: Historical NASA POWER series, optionally with indicator columns
+        month: Month to forecast (number, name or abbreviation)
+        target_year: Year of the forecast
+        best_conditions: Crop best conditions the members are scored against
+        threshold: Status a day must exceed to count as good
+        method: "mean" or "median" across years for the point forecast
+        trend: Extrapolate a per-day linear trend for the point forecast
+
+    Returns:
+        ForecastEntry list with `ensemble` filled
+    """
+    month_number = parse_month(month)
+    years, matrices = day_of_month_matrix(series, month_number)
+    if not len(years):
+        return []
+
+    entries = matrix_forecast(years, matrices, month_number, target_year, best_conditions, method, trend)
+    summary = summarize_statuses(member_statuses(matrices, best_conditions), threshold)
+    for entry in entries:
+        day = int(entry.date[6:8]) - 1
+        entry.ensemble = _day_ensemble(summary, day, threshold)
+    return entries
+
+
+def _day_ensemble(summary: Dict[str, np.ndarray], day: int, threshold: float) -> Optional[StatusEnsemble]:
+    if not summary["members"][day]:
+        return None
+    return StatusEnsemble(
+        threshold=threshold,
+        probability=round(float(summary["probability"][day]), 2),
+        p10=round(float(summary["p10"][day]), 2),
+        p50=round(float(summary["p50"][day]), 2),
+        p90=round(float(summary["p90"][day]), 2),
+        members=int(summary["members"][day]),
+    )
@@ -0,0 +1,164 @@
+"""
+Derived agronomic indicators of a NASA POWER series.
+
+One vectorized pass over the columnar series adds the signals planting
+decisions depend on, as extra daily columns on the same dates:
+
+    GDD                 growing degree days, max(0, (T2M_MAX + T2M_MIN) / 2 - base)
+    PRECTOTCORR_7D      trailing 7-day precipitation sum (mm)
+    PRECTOTCORR_14D     trailing 14-day precipitation sum (mm)
+    FROST_DAY           1 when T2M_MIN <= FROST_THRESHOLD, else 0
+    HEAT_STRESS_DAY     1 when T2M_MAX >= HEAT_STRESS_THRESHOLD, else 0
+    GWETROOT_TREND_7D   least-squares slope of root soil wetness over the trailing 7 days (per day)
+
+Rolling values are masked until their window is complete and whenever it
+contains a missing day.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from lib.api.nasa.cache import GridCell, NASADiskCache, get_default_cache, make_cache_key
+from lib.api.nasa.series import NASASeries
+from lib.api.nasa.unified import UNION_PARAMETERS
+
+# Bump whenever an indicator definition changes, cached indicators are keyed on it
+INDICATORS_VERSION = "1"
+
+GDD_BASE_TEMPERATURE = 10.0  # °C
+FROST_THRESHOLD = 0.0  # °C, daily minimum
+HEAT_STRESS_THRESHOLD = 35.0  # °C, daily maximum
+PRECIPITATION_WINDOWS = (7, 14)  # days
+SOIL_MOISTURE_TREND_DAYS = 7
+
+INDICATOR_PARAMETERS = [
+    "GDD", "PRECTOTCORR_7D", "PRECTOTCORR_14D", "FROST_DAY", "HEAT_STRESS_DAY", "GWETROOT_TREND_7D",
+]
+
+# PredictedData field -> indicator column
+INDICATOR_FIELDS = {
+    "gdd": "GDD",
+    "precipitation_7d": "PRECTOTCORR_7D",
+    "precipitation_14d": "PRECTOTCORR_14D",
+    "frost_risk": "FROST_DAY",
+    "heat_stress_risk": "HEAT_STRESS_DAY",
+    "moisture_trend": "GWETROOT_TREND_7D",
+}
+
+# Raw NASA parameters the indicators are derived from
+SOURCE_PARAMETERS = ["T2M_MAX", "T2M_MIN", "PRECTOTCORR", "GWETROOT"]
+
+
+def compute_indicators(series: NASASeries) -> NASASeries:
+    """
+    Compute every indicator of `series`.
+
+    Returns:
+        Series on the same dates holding only the indicator columns
+
+    Raises:
+        ValueError: If a source parameter is missing
+    """
+    missing = [name for name in SOURCE_PARAMETERS if name not in series]
+    if missing:
+        raise ValueError(f"NASA series is missing parameters: {', '.join(missing)}")
+
+    t_max = _as_float(series["T2M_MAX"])
+    t_min = _as_float(series["T2M_MIN"])
+    precipitation = _as_float(series["PRECTOTCORR"])
+    moisture = _as_float(series["GWETROOT"])
+
+    columns = {
+        "GDD": np.maximum(0.0, (t_max + t_min) / 2.0 - GDD_BASE_TEMPERATURE),
+        "FROST_DAY": np.where(np.isnan(t_min), np.nan, (t_min <= FROST_THRESHOLD).astype(np.float64)),
+        "HEAT_STRESS_DAY": np.where(np.isnan(t_max), np.nan, (t_max >= HEAT_STRESS_THRESHOLD).astype(np.float64)),
+        "GWETROOT_TREND_7D": rolling_slope(moisture, SOIL_MOISTURE_TREND_DAYS),
+    }
+    for window in PRECIPITATION_WINDOWS:
+        columns[f"PRECTOTCORR_{window}D"] = rolling_sum(precipitation, window)
+
+    return NASASeries(
+        dates=series.dates,
+        columns={name: _to_masked(columns[name]) for name in INDICATOR_PARAMETERS},
+        fill_value=series.fill_value,
+    )
+
+
+def add_indicators(series: NASASeries, indicators: Optional[NASASeries] = None) -> NASASeries:
+    """Return `series` extended with its indicator columns (buffers are shared, not copied)."""
+    indicators = indicators if indicators is not None else compute_indicators(series)
+    return NASASeries(
+        dates=series.dates, columns={**series.columns, **indicators.columns}, fill_value=series.fill_value
+    )
+
+
+def cached_indicators(series: NASASeries, window_key: str, cache: Optional[NASADiskCache] = None) -> NASASeries:
+    """
+    Indicators of `series`, stored in the NASA disk cache next to the raw window.
+
+    `window_key` is the cache key of the raw series.
+    """
+    cache = cache or get_default_cache()
+    key = f"{window_key}|indicators:{INDICATORS_VERSION}"
+
+    indicators = cache.get_series(key)
+    if indicators is not None and len(indicators) == len(series):
+        return indicators
+
+    indicators = compute_indicators(series)
+    cache.set_series(key, indicators)
+    return indicators
+
+
+def cell_indicator_series(cell: GridCell, start_year: int, end_year: int, series: NASASeries) -> NASASeries:
+    """`series` of a cell's history window with its indicators, cached next to the raw window."""
+    window_key = make_cache_key(cell, UNION_PARAMETERS, f"{start_year}0101", f"{end_year}1231")
+    return add_indicators(series, cached_indicators(series, window_key))
+
+
+def indicator_arrays(values: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Map indicator columns present in `values` to their PredictedData fields."""
+    return {field: values[name] for field, name in INDICATOR_FIELDS.items() if name in values}
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over `window` days, NaN until the window is complete or if it has a missing day."""
+    result = np.full(len(values), np.nan, dtype=np.float64)
+    if len(values) < window:
+        return result
+
+    missing = np.isnan(values)
+    sums = np.cumsum(np.concatenate(([0.0], np.where(missing, 0.0, values))))
+    gaps = np.cumsum(np.concatenate(([0], missing.astype(np.int64))))
+
+    window_sums = sums[window:] - sums[:-window]
+    window_gaps = gaps[window:] - gaps[:-window]
+    result[window - 1:] = np.where(window_gaps == 0, window_sums, np.nan)
+    return result
+
+
+def rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing least-squares slope (units per day), NaN until the window is complete or if it has a missing day."""
+    result = np.full(len(values), np.nan, dtype=np.float64)
+    if len(values) < window:
+        return result
+
+    # slope = sum((x - x_mean) * y) / sum((x - x_mean)^2) with x = 0..window-1
+    weights = np.arange(window, dtype=np.float64) - (window - 1) / 2.0
+    missing = np.isnan(values)
+    slopes = np.convolve(np.where(missing, 0.0, values), weights[::-1], mode="valid") / (weights ** 2).sum()
+
+    gaps = np.cumsum(np.concatenate(([0], missing.astype(np.int64))))
+    window_gaps = gaps[window:] - gaps[:-window]
+    result[window - 1:] = np.where(window_gaps == 0, slopes, np.nan)
+    return result
+
+
+def _as_float(column: np.ma.MaskedArray) -> np.ndarray:
+    return column.astype(np.float64).filled(np.nan)
+
+
+def _to_masked(values: np.ndarray) -> np.ma.MaskedArray:
+    values = values.astype(np.float32)
+    return np.ma.masked_array(values, mask=np.isnan(values))
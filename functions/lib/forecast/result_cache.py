@@ -0,0 +1,137 @@
+"""
+Cache of finished forecasts.
+
+A forecast only depends on the NASA grid cell, the month, the target year,
+the crop's best conditions and the engine that produced it (model and
+prompt version for the LLM). Results are kept in an in-process LRU in
+front of a Mongo collection with a TTL index, so repeated requests for a
+popular crop/region skip both the NASA download and the forecast engine.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, List, Optional
+
+from cachetools import TTLCache
+
+from infrastructure.database.collections.forecast_cache_collection import ForecastCacheCollection
+from infrastructure.database.models.forecast_cache_model import ForecastCacheModel
+from lib.api.nasa.cache import GridCell
+from lib.forecast.schemas import ForecastEntry
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
+DEFAULT_LRU_SIZE = 256
+
+# Fields of the best conditions document that influence a forecast
+CONDITION_FIELDS = [
+    "temperature", "humidity", "root_soil_moisture", "top_soil_moisture",
+    "soil_temperature", "snow_precipitation", "rain_precipitation",
+]
+
+
+def conditions_hash(best_conditions: Any) -> str:
+    """Hash the best condition values, ignoring ids and timestamps."""
+    if not isinstance(best_conditions, dict):
+        best_conditions = best_conditions.model_dump()
+    values = {field: best_conditions.get(field) for field in CONDITION_FIELDS}
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def make_forecast_key(cell: GridCell, month: int, target_year: int, best_conditions: Any, version: str) -> str:
+    """Build the result cache key of a forecast."""
+    return f"{cell.key}|{month:02d}|{target_year}|{conditions_hash(best_conditions)}|{version}"
+
+
+class ForecastResultCache:
+    """In-process LRU in front of the Mongo `forecast_cache` collection."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None, lru_size: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or int(os.getenv("FORECAST_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        self.hits = 0
+        self.misses = 0
+        self._memory = TTLCache(
+            maxsize=lru_size or int(os.getenv("FORECAST_CACHE_LRU_SIZE", DEFAULT_LRU_SIZE)), ttl=self.ttl_seconds
+        )
+        self._lock = threading.Lock()
+        self._indexes_ready = False
+
+    def get(self, key: str) -> Optional[List[ForecastEntry]]:
+        """Return the cached forecast for `key`, or None on a miss."""
+        with self._lock:
+            forecast = self._memory.get(key)
+        if forecast is None:
+            forecast = self._get_from_db(key)
+            if forecast is not None:
+                with self._lock:
+                    self._memory[key] = forecast
+
+        with self._lock:
+            if forecast is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        # Callers may update entries (e.g. re-scoring), hand out copies
+        return [entry.model_copy(deep=True) for entry in forecast]
+
+    def set(self, key: str, forecast: List[ForecastEntry]) -> None:
+        """Store a non-empty forecast under `key`."""
+        if not forecast:
+            return
+
+        forecast = [entry.model_copy(deep=True) for entry in forecast]
+        with self._lock:
+            self._memory[key] = forecast
+
+        try:
+            collection = ForecastCacheCollection()
+            # Never raises: an index problem must not disable the cache
+            self._ensure_indexes(collection)
+            collection.upsert(ForecastCacheModel(cache_key=key, forecast=[entry.model_dump() for entry in forecast]))
+        except Exception as e:
+            logging.error(f"Failed to store forecast cache entry {key}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+    @staticmethod
+    def _get_from_db(key: str) -> Optional[List[ForecastEntry]]:
+        try:
+            document = ForecastCacheCollection().get_one(
+                filter_by={"cache_key": key}, hidden_fields=[], force_show_fields=[]
+            )
+        except Exception as e:
+            logging.error(f"Failed to read forecast cache entry {key}: {e}")
+            return None
+
+        if not document:
+            return None
+        return [ForecastEntry.model_validate(entry) for entry in document["forecast"]]
+
+    def _ensure_indexes(self, collection: ForecastCacheCollection) -> None:
+        """Create the collection indexes once per process; a failure is logged and not retried."""
+        with self._lock:
+            if self._indexes_ready:
+                return
+            self._indexes_ready = True
+        try:
+            collection.ensure_indexes(ttl_seconds=self.ttl_seconds)
+        except Exception as e:
+            logging.error(f"Failed to create forecast cache indexes: {e}")
+
+
+_default_cache: Optional[ForecastResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_forecast_result_cache() -> ForecastResultCache:
+    """Return the process-wide forecast result cache, creating it on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ForecastResultCache()
+        return _default_cache
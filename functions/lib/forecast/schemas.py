@@ -0,0 +1,106 @@
+"""
+Forecast output schema shared by the LLM and the local forecast engines.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, model_validator
+
+
+class PredictedData(BaseModel):
+    # status: 0.0 (not suitable) .. 1.0 (perfect), computed locally by lib.forecast.scoring
+    status: Optional[float] = None
+    moisture: float
+    temperature: float
+    precipitation: float
+    snow_precipitation: float
+    soil_temperature: float
+    humidity: float
+
+    # Agronomic indicators (see lib.forecast.indicators), filled locally from the history
+    gdd: Optional[float] = None  # growing degree days (°C·day)
+    precipitation_7d: Optional[float] = None  # trailing 7-day precipitation (mm)
+    precipitation_14d: Optional[float] = None  # trailing 14-day precipitation (mm)
+    frost_risk: Optional[float] = None  # share of historical years with frost on that day (0..1)
+    heat_stress_risk: Optional[float] = None  # share of historical years with heat stress on that day (0..1)
+    moisture_trend: Optional[float] = None  # 7-day root soil wetness slope (per day)
+
+
+class StatusEnsemble(BaseModel):
+    # Distribution of the day's status across the historical years (see lib.forecast.ensemble)
+    threshold: float
+    probability: float  # share of years whose status exceeds `threshold` (0..1)
+    p10: float
+    p50: float
+    p90: float
+    members: int  # historical years with data for the day
+
+
+class ForecastEntry(BaseModel):
+    # "YYYYMMDD" as string (as in your examples)
+    date: str
+    predicted_data: PredictedData
+    # Only filled by the ensemble engine
+    ensemble: Optional[StatusEnsemble] = None
+
+
+class ForecastResponse(BaseModel):
+    forecast: list[ForecastEntry]
+
+
+# Structured output schemas of the LLM: only the values it predicts, the
+# status and indicators are filled locally afterwards
+class LLMPredictedData(BaseModel):
+    moisture: float
+    temperature: float
+    precipitation: float
+    snow_precipitation: float
+    soil_temperature: float
+    humidity: float
+
+
+class LLMForecastEntry(BaseModel):
+    date: str
+    predicted_data: LLMPredictedData
+
+
+class LLMForecastResponse(BaseModel):
+    forecast: list[LLMForecastEntry]
+
+    def to_entries(self) -> list[ForecastEntry]:
+        return [
+            ForecastEntry(date=entry.date, predicted_data=PredictedData(**entry.predicted_data.model_dump()))
+            for entry in self.forecast
+        ]
+
+
+# Predicted fields of the columnar LLM output, in prompt order
+COLUMNAR_FIELDS = ("moisture", "temperature", "precipitation", "snow_precipitation", "soil_temperature", "humidity")
+
+
+class ColumnarForecastResponse(BaseModel):
+    # Compact LLM output: one array per predicted field, aligned with `days` (day of month)
+    days: list[int]
+    moisture: list[float]
+    temperature: list[float]
+    precipitation: list[float]
+    snow_precipitation: list[float]
+    soil_temperature: list[float]
+    humidity: list[float]
+
+    @model_validator(mode="after")
+    def check_lengths(self):
+        lengths = {field: len(getattr(self, field)) for field in COLUMNAR_FIELDS}
+        if any(length != len(self.days) for length in lengths.values()):
+            raise ValueError(f"Columnar forecast arrays must have {len(self.days)} values: {lengths}")
+        return self
+
+    def to_entries(self, year: int, month: int) -> list[ForecastEntry]:
+        """Expand the arrays into the usual per-day entries."""
+        return [
+            ForecastEntry(
+                date=f"{year}{month:02d}{day:02d}",
+                predicted_data=PredictedData(**{field: getattr(self, field)[index] for field in COLUMNAR_FIELDS}),
+            )
+            for index, day in enumerate(self.days)
+        ]
@@ -0,0 +1,125 @@
+"""
+Deterministic scoring of forecasted days against a crop's best conditions.
+
+The rules are the ones the forecast prompt used to ask the LLM to apply:
+every variable gets a score in [0, 1] that stays at 1 inside a tolerance
+band and decays linearly to 0, and the weighted sum is the day's `status`.
+Precomputed frost and heat-stress risks (see indicators), when present,
+scale the status down.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+# Weight of every variable in the final status (sum = 1.0)
+SCORE_WEIGHTS = {
+    "root_soil_moisture": 0.30,
+    "top_soil_moisture": 0.20,
+    "temperature": 0.20,
+    "soil_temperature": 0.10,
+    "humidity": 0.10,
+    "precipitation": 0.08,
+    "snow_precipitation": 0.02,
+}
+
+# score variable -> (predicted field, best condition field, tolerance, zero score at)
+SCORE_RULES = {
+    "root_soil_moisture": ("moisture", "root_soil_moisture", 0.05, 0.40),
+    "top_soil_moisture": ("moisture", "top_soil_moisture", 0.05, 0.40),
+    "temperature": ("temperature", "temperature", 2.0, 10.0),
+    "soil_temperature": ("soil_temperature", "soil_temperature", 2.0, 10.0),
+    "humidity": ("humidity", "humidity", 0.05, 0.30),
+    "precipitation": ("precipitation", "rain_precipitation", 1.0, 10.0),
+    # Snow is perfect only when both values are 0 and decays quickly otherwise
+    "snow_precipitation": ("snow_precipitation", "snow_precipitation", 0.0, 2.0),
+}
+
+PREDICTED_FIELDS = ["moisture", "temperature", "precipitation", "snow_precipitation", "soil_temperature", "humidity"]
+
+# Risk field -> status lost when the risk is 1 (status *= 1 - penalty * risk)
+RISK_PENALTIES = {
+    "frost_risk": 0.5,
+    "heat_stress_risk": 0.3,
+}
+
+
+def _condition_value(best_conditions: Any, name: str) -> float:
+    """Read a best condition value from a DB document or a CropConditionModel."""
+    if isinstance(best_conditions, Mapping):
+        return float(best_conditions[name])
+    return float(getattr(best_conditions, name))
+
+
+def _as_fraction(values: np.ndarray) -> np.ndarray:
+    """Convert humidity percentages to the 0..1 scale when needed."""
+    return np.where(values > 1.0, values / 100.0, values)
+
+
+def _linear_score(diff: np.ndarray, tolerance: float, zero_at: float) -> np.ndarray:
+    """1 inside the tolerance band, linear decay to 0 at `zero_at`."""
+    return np.clip(1.0 - (np.abs(diff) - tolerance) / (zero_at - tolerance), 0.0, 1.0)
+
+
+def score_arrays(predicted: Mapping[str, np.ndarray], best_conditions: Any) -> np.ndarray:
+    """
+    Compute the status of every forecasted day in one vectorized pass.
+
+    Args:
+        predicted: Mapping of predicted field name (see PREDICTED_FIELDS) to
+            an array of daily values. Arrays may have any shape as long as
+            they broadcast together, e.g. (days,) or (years, days).
+        best_conditions: Crop best conditions, as a dict or CropConditionModel
+
+    Optional risk fields (see RISK_PENALTIES) lower the status; a missing
+    risk value counts as no risk.
+
+    Returns:
+        Array of statuses rounded to two decimals. Days with a missing input
+        value are NaN.
+    """
+    status = None
+    for variable, (predicted_field, condition_field, tolerance, zero_at) in SCORE_RULES.items():
+        values = np.asarray(predicted[predicted_field], dtype=np.float64)
+        best = _condition_value(best_conditions, condition_field)
+
+        if variable == "humidity":
+            values = _as_fraction(values)
+            best = float(_as_fraction(np.float64(best)))
+
+        weighted = SCORE_WEIGHTS[variable] * _linear_score(values - best, tolerance, zero_at)
+        status = weighted if status is None else status + weighted
+
+    for risk_field, penalty in RISK_PENALTIES.items():
+        if risk_field in predicted:
+            risk = np.clip(np.nan_to_num(np.asarray(predicted[risk_field], dtype=np.float64), nan=0.0), 0.0, 1.0)
+            status = status * (1.0 - penalty * risk)
+
+    return np.round(np.clip(status, 0.0, 1.0), 2)
+
+
+def score_forecast(entries: List[Any], best_conditions: Any) -> List[Any]:
+    """
+    Fill `predicted_data.status` of every ForecastEntry from the scoring rules.
+
+    Entries are updated in place and returned for convenience.
+    """
+    if not entries:
+        return entries
+
+    predicted: Dict[str, np.ndarray] = {
+        field: np.array(
+            [_none_to_nan(getattr(entry.predicted_data, field, None)) for entry in entries], dtype=np.float64
+        )
+        for field in PREDICTED_FIELDS + list(RISK_PENALTIES)
+    }
+    statuses = score_arrays(predicted, best_conditions)
+
+    for entry, status in zip(entries, statuses.tolist()):
+        entry.predicted_data.status = None if np.isnan(status) else status
+
+    return entries
+
+
+def _none_to_nan(value: Optional[float]) -> float:
+    return np.nan if value is None else value
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the analog-year forecast engine.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from lib.api.nasa.series import NASASeries
+from lib.forecast.analog import analog_forecast, blend_years, distance_matrix, find_analog_years
+from lib.forecast.indicators import add_indicators
+from lib.forecast.test_climatology import BEST_CONDITIONS, _build_series
+
+# December temperature shift per year; December 2024 looks like December 2020
+DECEMBER_SHIFTS = {2019: -20.0, 2020: 5.0, 2021: -10.0, 2022: -25.0, 2023: 15.0, 2024: 5.5}
+
+
+def _analog_series():
+    """Yearly warming series (see test_climatology) with distinctive Decembers."""
+    series = _build_series()
+    shift = np.zeros(len(series), dtype=np.float32)
+    december = series.months == 12
+    for year, value in DECEMBER_SHIFTS.items():
+        shift[december & (series.years == year)] = value
+
+    columns = dict(series.columns)
+    for name in ("T2M_MAX", "T2M_MIN"):
+        columns[name] = np.ma.masked_array(series[name].data + shift)
+    return NASASeries(dates=series.dates, columns=columns, fill_value=series.fill_value)
+
+
+class TestAnalogHelpers(unittest.TestCase):
+    """Test cases for the vectorized helpers."""
+
+    def test_distance_matrix(self):
+        """Test RMS distances and missing features."""
+        queries = np.array([[0.0, 0.0], [1.0, np.nan]])
+        candidates = np.array([[3.0, 4.0], [1.0, 1.0], [np.nan, np.nan]])
+        distances = distance_matrix(queries, candidates)
+
+        self.assertEqual(distances.shape, (2, 3))
+        self.assertAlmostEqual(distances[0, 0], np.sqrt(12.5))
+        self.assertAlmostEqual(distances[1, 1], 0.0)
+        self.assertTrue(np.isinf(distances[:, 2]).all())
+
+    def test_blend_years(self):
+        """Test the weighted blend renormalizes around missing years."""
+        values = np.array([[10.0, 10.0], [20.0, np.nan]])
+        np.testing.assert_allclose(blend_years(values, np.array([0.75, 0.25])), [12.5, 10.0])
+
+
+class TestAnalogForecast(unittest.TestCase):
+    """Test cases for the analog-year forecast."""
+
+    def test_find_analog_years(self):
+        """Test that the closest December is ranked first and weights sum to 1."""
+        analogs = find_analog_years(_analog_series(), k=2)
+
+        # The window before 1 January 2021 is December 2020
+        self.assertEqual(analogs.years[0], 2021)
+        self.assertEqual(len(analogs.years), 2)
+        self.assertNotIn(2025, analogs.years)
+        self.assertAlmostEqual(analogs.weights.sum(), 1.0)
+        self.assertGreater(analogs.weights[0], analogs.weights[1])
+        self.assertTrue(np.all(np.diff(analogs.distances) >= 0))
+
+    def test_first_year_has_no_window(self):
+        """Test that a year without preceding data is never an analog."""
+        analogs = find_analog_years(_analog_series(), k=10)
+        self.assertNotIn(2019, analogs.years)
+
+    def test_forecast_follows_analog(self):
+        """Test that the single closest analog drives the forecast at the same lead time."""
+        forecast = analog_forecast(_analog_series(), "June", 2026, best_conditions=BEST_CONDITIONS, k=1)
+
+        self.assertEqual(len(forecast), 30)
+        self.assertEqual(forecast[0].date, "20260601")
+        # Anchor 2025 -> target 2026 is one year ahead, so analog 2021 contributes June 2022
+        self.assertAlmostEqual(forecast[0].predicted_data.temperature, 23.0)
+        self.assertIsNotNone(forecast[0].predicted_data.status)
+
+    def test_forecast_blend(self):
+        """Test that several analogs are blended with their weights."""
+        series = _analog_series()
+        analogs = find_analog_years(series, k=3, candidate_years=np.arange(2019, 2024))
+        forecast = analog_forecast(series, 6, 2026, k=3)
+
+        expected = float(np.dot(analogs.weights, 20.0 + (analogs.years + 1 - 2019)))
+        self.assertAlmostEqual(forecast[0].predicted_data.temperature, round(expected, 2))
+
+    def test_forecast_with_indicators(self):
+        """Test that indicator columns are blended into the entries."""
+        forecast = analog_forecast(add_indicators(_analog_series()), 6, 2026, k=2)
+        self.assertIsNotNone(forecast[10].predicted_data.gdd)
+        self.assertEqual(forecast[10].predicted_data.frost_risk, 0.0)
+
+    def test_no_following_month(self):
+        """Test that a target beyond the series history yields no analogs."""
+        self.assertEqual(analog_forecast(_analog_series(), 6, 2035), [])
+
+    def test_empty_query_window(self):
+        """Test that an anchor without preceding data is rejected."""
+        with self.assertRaises(ValueError):
+            find_analog_years(_analog_series(), anchor=np.datetime64("2030-01-01"))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
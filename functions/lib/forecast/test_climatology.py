@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local climatology forecast engine.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from lib.api.nasa.series import NASASeries
+from lib.forecast.climatology import (
+    build_climatology, calendar_slots, day_of_month_matrix, forecast_from_climatology,
+    forecast_year_from_climatology, matrix_forecast, summarize_years
+)
+from lib.forecast.schemas import ForecastEntry
+
+BEST_CONDITIONS = {
+    "temperature": 24,
+    "humidity": 70,
+    "root_soil_moisture": 0.70,
+    "top_soil_moisture": 0.65,
+    "soil_temperature": 22,
+    "snow_precipitation": 0.0,
+    "rain_precipitation": 3.0,
+}
+
+
+def _build_series(start="2019-01-01", end="2025-01-01"):
+    """Series where T2M_MAX/T2M_MIN grow by one degree per year."""
+    dates = np.arange(np.datetime64(start), np.datetime64(end))
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    offset = (years - 2019).astype(np.float32)
+
+    def column(values):
+        return np.ma.masked_array(np.asarray(values, dtype=np.float32))
+
+    return NASASeries(dates=dates, columns={
+        "T2M_MAX": column(25.0 + offset),
+        "T2M_MIN": column(15.0 + offset),
+        "RH2M": column(np.full(len(dates), 70.0)),
+        "PRECTOTCORR": column(np.full(len(dates), 3.0)),
+        "GWETROOT": column(np.full(len(dates), 0.7)),
+        "GWETTOP": column(np.full(len(dates), 0.65)),
+        "PRECSNO": column(np.zeros(len(dates))),
+        "TSOIL5": column(np.full(len(dates), 22.0)),
+    })
+
+
+def _forecast(series, month, target_year, best_conditions=None, **kwargs):
+    return forecast_from_climatology(build_climatology(series), month, target_year, best_conditions, **kwargs)
+
+
+class TestClimatologyForecast(unittest.TestCase):
+    """Test cases for the climatology forecast engine."""
+
+    def test_mean_forecast(self):
+        """Test the per-day mean across years."""
+        entries = _forecast(_build_series(), "March", 2026, BEST_CONDITIONS)
+
+        self.assertEqual(len(entries), 31)
+        self.assertIsInstance(entries[0], ForecastEntry)
+        self.assertEqual(entries[0].date, "20260301")
+        self.assertEqual(entries[-1].date, "20260331")
+        # mean of 20..25 across 2019..2024
+        self.assertAlmostEqual(entries[0].predicted_data.temperature, 22.5)
+        self.assertIsNotNone(entries[0].predicted_data.status)
+
+    def test_trend_forecast(self):
+        """Test the linear trend extrapolation to the target year."""
+        entries = _forecast(_build_series(), 3, 2026, method="median", trend=True)
+        self.assertAlmostEqual(entries[10].predicted_data.temperature, 27.0)
+        self.assertIsNone(entries[10].predicted_data.status)
+
+    def test_leap_day_uses_previous_day(self):
+        """Test that Feb 29 is produced for a leap target year."""
+        entries = _forecast(_build_series("2021-01-01", "2023-01-01"), "feb", 2028)
+        self.assertEqual(len(entries), 29)
+        self.assertEqual(entries[28].predicted_data.temperature, entries[27].predicted_data.temperature)
+
+    def test_missing_parameter(self):
+        """Test that a series without the required parameters is rejected."""
+        series = _build_series().select(["T2M_MAX"])
+        with self.assertRaises(ValueError):
+            _forecast(series, 1, 2026)
+
+    def test_summarize_years_ignores_missing(self):
+        """Test that missing years are ignored by the trend fit."""
+        values = np.array([[1.0], [np.nan], [3.0]])
+        years = np.array([2020, 2021, 2022])
+        self.assertAlmostEqual(summarize_years(values, years, 2023, trend=True)[0], 4.0)
+
+
+class TestDayOfYearClimatology(unittest.TestCase):
+    """Test cases for the precomputed day-of-year climatology."""
+
+    def test_calendar_slots(self):
+        """Test that 1 March has the same slot in leap and common years."""
+        self.assertEqual(calendar_slots(np.array([1, 2, 3, 12]), np.array([1, 29, 1, 31])).tolist(), [0, 59, 60, 365])
+
+    def test_build_statistics(self):
+        """Test the per day-of-year statistics of one parameter."""
+        climatology = build_climatology(_build_series())
+        stats = climatology.stats["T2M_MAX"]
+
+        self.assertEqual((climatology.start_year, climatology.end_year), (2019, 2024))
+        self.assertEqual(stats["mean"].shape, (366,))
+        self.assertAlmostEqual(stats["mean"][0], 27.5)
+        self.assertAlmostEqual(stats["p50"][0], 27.5)
+        self.assertAlmostEqual(stats["p10"][0], 25.5)
+        self.assertAlmostEqual(stats["trend"][0], 1.0)
+        # 29 February only exists in 2020 and 2024
+        self.assertAlmostEqual(stats["mean"][59], 28.0)
+
+    def test_forecast_matches_raw_series(self):
+        """Test that forecasts from stored statistics match the raw-series matrices."""
+        series = _build_series()
+        climatology = build_climatology(series)
+        years, matrices = day_of_month_matrix(series, 3)
+
+        for kwargs in ({}, {"method": "median"}, {"trend": True}):
+            expected = matrix_forecast(years, matrices, 3, 2026, BEST_CONDITIONS, **kwargs)
+            actual = forecast_from_climatology(climatology, "March", 2026, BEST_CONDITIONS, **kwargs)
+            self.assertEqual([entry.model_dump() for entry in actual], [entry.model_dump() for entry in expected])
+
+    def test_year_forecast_matches_months(self):
+        """Test that the full-year pass matches twelve monthly forecasts."""
+        climatology = build_climatology(_build_series())
+
+        for target_year in (2026, 2028):
+            year = forecast_year_from_climatology(climatology, target_year, BEST_CONDITIONS, trend=True)
+            self.assertEqual(sorted(year), list(range(1, 13)))
+            self.assertEqual(len(year[2]), 29 if target_year == 2028 else 28)
+            for month in range(1, 13):
+                expected = forecast_from_climatology(climatology, month, target_year, BEST_CONDITIONS, trend=True)
+                self.assertEqual([entry.model_dump() for entry in year[month]],
+                                 [entry.model_dump() for entry in expected])
+
+    def test_select_months(self):
+        """Test that selecting months keeps the statistics shared."""
+        climatology = build_climatology(_build_series())
+        march = climatology.select_months("mar")
+        self.assertEqual(march.months, (3,))
+        self.assertIs(march.stats, climatology.stats)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
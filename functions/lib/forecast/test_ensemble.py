@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the probabilistic ensemble scoring.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from lib.api.nasa.series import NASASeries
+from lib.forecast.climatology import day_of_month_matrix, matrix_forecast
+from lib.forecast.ensemble import ensemble_forecast, member_statuses, summarize_statuses
+from lib.forecast.indicators import add_indicators
+from lib.forecast.scoring import score_arrays
+from lib.forecast.test_climatology import BEST_CONDITIONS, _build_series
+
+
+class TestSummarizeStatuses(unittest.TestCase):
+    """Test cases for the per-day status summary."""
+
+    def test_probability_and_percentiles(self):
+        """Test the exceedance probability and percentiles of each day."""
+        statuses = np.array([
+            [0.9, 0.2, np.nan],
+            [0.8, 0.3, np.nan],
+            [0.1, 0.4, np.nan],
+            [0.75, np.nan, np.nan],
+        ])
+        summary = summarize_statuses(statuses, threshold=0.7)
+
+        np.testing.assert_allclose(summary["probability"][:2], [0.75, 0.0])
+        np.testing.assert_array_equal(summary["members"], [4, 3, 0])
+        self.assertAlmostEqual(summary["p50"][1], 0.3)
+        self.assertLessEqual(summary["p10"][0], summary["p50"][0])
+        self.assertLessEqual(summary["p50"][0], summary["p90"][0])
+        self.assertTrue(np.isnan(summary["probability"][2]))
+
+    def test_threshold_is_exclusive(self):
+        """Test that a status equal to the threshold does not count."""
+        summary = summarize_statuses(np.array([[0.7], [0.71]]), threshold=0.7)
+        self.assertEqual(summary["probability"][0], 0.5)
+
+
+class TestEnsembleForecast(unittest.TestCase):
+    """Test cases for the ensemble forecast."""
+
+    def test_member_statuses_match_scoring(self):
+        """Test that the batched evaluation scores every year like a single forecast."""
+        years, matrices = day_of_month_matrix(_build_series(), 6)
+        statuses = member_statuses(matrices, BEST_CONDITIONS)
+
+        self.assertEqual(statuses.shape, (len(years), 31))
+        for row in range(len(years)):
+            expected = score_arrays({
+                "moisture": matrices["GWETROOT"][row],
+                "temperature": (matrices["T2M_MAX"][row] + matrices["T2M_MIN"][row]) / 2.0,
+                "precipitation": matrices["PRECTOTCORR"][row],
+                "snow_precipitation": matrices["PRECSNO"][row],
+                "soil_temperature": matrices["TSOIL5"][row],
+                "humidity": matrices["RH2M"][row],
+            }, BEST_CONDITIONS)
+            np.testing.assert_array_equal(statuses[row], expected)
+        # June has 30 days
+        self.assertTrue(np.isnan(statuses[:, 30]).all())
+
+    def test_forecast_entries(self):
+        """Test that entries keep the climatology forecast and gain the ensemble."""
+        series = _build_series()
+        entries = ensemble_forecast(series, "June", 2026, BEST_CONDITIONS, threshold=0.99)
+        baseline = matrix_forecast(*day_of_month_matrix(series, 6), 6, 2026, BEST_CONDITIONS)
+
+        self.assertEqual(len(entries), 30)
+        self.assertEqual(entries[0].predicted_data, baseline[0].predicted_data)
+
+        ensemble = entries[0].ensemble
+        self.assertEqual(ensemble.members, 6)
+        self.assertEqual(ensemble.threshold, 0.99)
+        # Years 2019..2024 average 20..25 °C against a 24 °C optimum: only 2021..2024 are perfect
+        self.assertEqual(ensemble.probability, 0.67)
+        self.assertEqual(ensemble.p90, 1.0)
+        self.assertLess(ensemble.p10, ensemble.p50)
+
+    def test_frost_members(self):
+        """Test that members with frost are penalized individually."""
+        series = _build_series()
+        t_min = series["T2M_MIN"].data.copy()
+        t_min[(series.years == 2024) & (series.months == 6)] = -1.0
+        columns = dict(series.columns)
+        columns["T2M_MIN"] = np.ma.masked_array(t_min)
+        series = add_indicators(NASASeries(dates=series.dates, columns=columns))
+
+        _, matrices = day_of_month_matrix(series, 6)
+        statuses = member_statuses(matrices, BEST_CONDITIONS)
+        without_frost = member_statuses({name: values for name, values in matrices.items() if name != "FROST_DAY"},
+                                        BEST_CONDITIONS)
+        np.testing.assert_allclose(statuses[-1, :30], without_frost[-1, :30] * 0.5, atol=0.01)
+        np.testing.assert_array_equal(statuses[:-1], without_frost[:-1])
+
+    def test_empty_month(self):
+        """Test a month without history."""
+        series = _build_series(start="2019-01-01", end="2019-03-01")
+        self.assertEqual(ensemble_forecast(series, 6, 2026, BEST_CONDITIONS), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
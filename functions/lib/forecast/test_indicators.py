@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the derived agronomic indicators.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from lib.api.nasa.cache import NASADiskCache
+from lib.api.nasa.series import NASASeries
+from lib.forecast.climatology import attach_indicators, build_climatology, forecast_from_climatology
+from lib.forecast.indicators import (
+    INDICATOR_PARAMETERS, add_indicators, cached_indicators, compute_indicators, rolling_slope, rolling_sum
+)
+from lib.forecast.schemas import ForecastEntry, PredictedData
+from lib.forecast.test_climatology import BEST_CONDITIONS, _build_series
+
+
+class TestRollingWindows(unittest.TestCase):
+    """Test cases for the rolling window helpers."""
+
+    def test_rolling_sum(self):
+        """Test trailing sums and their incomplete windows."""
+        result = rolling_sum(np.arange(1.0, 6.0), 3)
+        np.testing.assert_array_equal(result[2:], [6.0, 9.0, 12.0])
+        self.assertTrue(np.isnan(result[:2]).all())
+
+    def test_rolling_sum_missing_day(self):
+        """Test that a missing day invalidates every window containing it."""
+        values = np.array([1.0, np.nan, 1.0, 1.0, 1.0, 1.0])
+        result = rolling_sum(values, 3)
+        self.assertTrue(np.isnan(result[:4]).all())
+        np.testing.assert_array_equal(result[4:], [3.0, 3.0])
+
+    def test_rolling_slope(self):
+        """Test the trailing least-squares slope."""
+        result = rolling_slope(np.array([0.5, 0.5, 0.5, 0.6, 0.7, 0.8, 0.9]), 3)
+        np.testing.assert_allclose(result[2:], [0.0, 0.05, 0.1, 0.1, 0.1])
+
+
+class TestIndicators(unittest.TestCase):
+    """Test cases for the indicator stage."""
+
+    def _series(self):
+        dates = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-01-21"))
+
+        def column(values):
+            return np.ma.masked_array(np.asarray(values, dtype=np.float32))
+
+        return NASASeries(dates=dates, columns={
+            "T2M_MAX": column(np.where(np.arange(20) == 5, 36.0, 20.0)),
+            "T2M_MIN": column(np.where(np.arange(20) == 3, -2.0, 6.0)),
+            "PRECTOTCORR": column(np.full(20, 2.0)),
+            "GWETROOT": column(np.linspace(0.5, 0.69, 20)),
+        })
+
+    def test_compute_indicators(self):
+        """Test every indicator column on a small series."""
+        indicators = compute_indicators(self._series())
+
+        self.assertEqual(indicators.parameters, INDICATOR_PARAMETERS)
+        self.assertAlmostEqual(float(indicators["GDD"][0]), 3.0)
+        self.assertEqual(float(indicators["FROST_DAY"][3]), 1.0)
+        self.assertEqual(float(indicators["HEAT_STRESS_DAY"][5]), 1.0)
+        self.assertEqual(float(indicators["HEAT_STRESS_DAY"][4]), 0.0)
+        self.assertTrue(indicators["PRECTOTCORR_7D"].mask[5])
+        self.assertAlmostEqual(float(indicators["PRECTOTCORR_7D"][6]), 14.0)
+        self.assertAlmostEqual(float(indicators["PRECTOTCORR_14D"][19]), 28.0)
+        self.assertAlmostEqual(float(indicators["GWETROOT_TREND_7D"][10]), 0.01, places=5)
+
+    def test_missing_source_parameter(self):
+        """Test that a series without the source parameters is rejected."""
+        with self.assertRaises(ValueError):
+            compute_indicators(self._series().select(["T2M_MAX"]))
+
+    def test_cached_indicators(self):
+        """Test that indicators are stored next to the raw window and reused."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = NASADiskCache(directory=tmp_dir)
+            series = self._series()
+            first = cached_indicators(series, "window", cache=cache)
+            second = cached_indicators(series, "window", cache=cache)
+
+            self.assertIsInstance(second["GDD"].data.base, np.memmap)
+            np.testing.assert_array_equal(second["PRECTOTCORR_7D"].mask, first["PRECTOTCORR_7D"].mask)
+
+    def test_forecast_carries_indicators(self):
+        """Test that forecasts expose indicators and score with the risks."""
+        climatology = build_climatology(add_indicators(_build_series()))
+        entries = forecast_from_climatology(climatology, "March", 2026, BEST_CONDITIONS)
+
+        self.assertEqual(entries[0].predicted_data.frost_risk, 0.0)
+        self.assertAlmostEqual(entries[0].predicted_data.gdd, 12.5)
+        self.assertAlmostEqual(entries[0].predicted_data.precipitation_7d, 21.0)
+
+    def test_attach_indicators(self):
+        """Test filling indicators of externally produced entries."""
+        climatology = build_climatology(add_indicators(_build_series()))
+        entry = ForecastEntry(date="20260310", predicted_data=PredictedData(
+            moisture=0.7, temperature=20.0, precipitation=3.0, snow_precipitation=0.0,
+            soil_temperature=22.0, humidity=70.0,
+        ))
+        attach_indicators([entry], climatology, BEST_CONDITIONS)
+
+        self.assertAlmostEqual(entry.predicted_data.precipitation_14d, 42.0)
+        self.assertIsNotNone(entry.predicted_data.status)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local forecast scoring engine.
+"""
+
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from lib.forecast.scoring import score_arrays, score_forecast, SCORE_WEIGHTS
+
+BEST_CONDITIONS = {
+    "crop_key": "tomato",
+    "crop_name": "Tomato",
+    "temperature": 24,
+    "humidity": 70,
+    "root_soil_moisture": 0.70,
+    "top_soil_moisture": 0.65,
+    "soil_temperature": 22,
+    "snow_precipitation": 0.0,
+    "rain_precipitation": 3.0,
+}
+
+
+def _perfect_day(**overrides):
+    values = {
+        "moisture": 0.68,
+        "temperature": 24.0,
+        "precipitation": 3.0,
+        "snow_precipitation": 0.0,
+        "soil_temperature": 22.0,
+        "humidity": 70.0,
+    }
+    values.update(overrides)
+    return values
+
+
+class TestScoring(unittest.TestCase):
+    """Test cases for the vectorized scorer."""
+
+    def test_weights_sum_to_one(self):
+        """Test that the weights add up to 1."""
+        self.assertAlmostEqual(sum(SCORE_WEIGHTS.values()), 1.0)
+
+    def test_perfect_day_scores_one(self):
+        """Test that values inside every tolerance band score 1."""
+        predicted = {field: np.array([value]) for field, value in _perfect_day().items()}
+        self.assertEqual(score_arrays(predicted, BEST_CONDITIONS).tolist(), [1.0])
+
+    def test_temperature_decay(self):
+        """Test the linear temperature decay between 2 and 10 degrees."""
+        days = [_perfect_day(temperature=t) for t in (26.0, 30.0, 34.0, 40.0)]
+        predicted = {field: np.array([day[field] for day in days]) for field in days[0]}
+
+        # temperature weight 0.20: full, half, zero, zero
+        self.assertEqual(score_arrays(predicted, BEST_CONDITIONS).tolist(), [1.0, 0.9, 0.8, 0.8])
+
+    def test_humidity_fraction_and_percentage_agree(self):
+        """Test that humidity given as a fraction scores like a percentage."""
+        percent = {field: np.array([value]) for field, value in _perfect_day(humidity=85.0).items()}
+        fraction = {field: np.array([value]) for field, value in _perfect_day(humidity=0.85).items()}
+        np.testing.assert_array_equal(score_arrays(percent, BEST_CONDITIONS), score_arrays(fraction, BEST_CONDITIONS))
+
+    def test_missing_value_gives_nan(self):
+        """Test that a missing input value yields a NaN status."""
+        predicted = {field: np.array([value]) for field, value in _perfect_day(moisture=np.nan).items()}
+        self.assertTrue(np.isnan(score_arrays(predicted, BEST_CONDITIONS)[0]))
+
+    def test_risk_penalties(self):
+        """Test that frost and heat-stress risks scale the status down."""
+        predicted = {field: np.array([value, value, value]) for field, value in _perfect_day().items()}
+        predicted["frost_risk"] = np.array([0.0, 1.0, np.nan])
+        predicted["heat_stress_risk"] = np.array([0.5, 0.0, np.nan])
+        self.assertEqual(score_arrays(predicted, BEST_CONDITIONS).tolist(), [0.85, 0.5, 1.0])
+
+    def test_score_forecast_updates_entries(self):
+        """Test that ForecastEntry-like objects get their status filled."""
+        entries = [
+            SimpleNamespace(date="20260101", predicted_data=SimpleNamespace(status=None, **_perfect_day())),
+            SimpleNamespace(date="20260102", predicted_data=SimpleNamespace(status=None, **_perfect_day(moisture=None))),
+        ]
+        score_forecast(entries, SimpleNamespace(**BEST_CONDITIONS))
+
+        self.assertEqual(entries[0].predicted_data.status, 1.0)
+        self.assertIsNone(entries[1].predicted_data.status)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -19,6 +19,12 @@ class PublishPredictionPayload(BaseModel):
     id_request: Optional[str] = None
     prediction_days: Literal["full", "half"] = "full"
     continue_to_next_month: Optional[bool] = False
+    # "climatology", "analog" or "ensemble" (local) or "llm" (GPT-4o). Defaults to the FORECAST_ENGINE env variable.
+    forecast_engine: Optional[Literal["climatology", "analog", "ensemble", "llm"]] = None
+    # Stream the LLM forecast and publish every day as it is generated. Defaults to the FORECAST_LLM_STREAM env variable.
+    stream_forecast: Optional[bool] = None
+    # Forecast all twelve months of the target year from one NASA fetch (climatology engine)
+    full_year: Optional[bool] = False
 
 
 def publish_prediction(payload: PublishPredictionPayload):
@@ -3,6 +3,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers import users, prediction, dashboard, location
 from routers.prediction import *
+from routers.prefetch import *
 import firebase_admin
 from firebase_admin import credentials
 
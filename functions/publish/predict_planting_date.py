@@ -1,6 +1,7 @@
 import datetime
 import json
 import logging
+import os
 import requests
 
 from infrastructure.database.collections.crops_conditions_collection import CropsConditionCollection
@@ -8,15 +9,75 @@ from infrastructure.database.collections.historical_data_collection import Histo
 from infrastructure.database.models.crop_condition_model import CropConditionModel
 from infrastructure.database.models.historical_data_model import HistoricalDataModel
 from lib.api.chatgpt.best_condition import get_crop_best_conditions
-from lib.api.chatgpt.prediction_ai import get_month_forecast_array
-
-from copy import deepcopy
+from lib.api.chatgpt.client import usage_stats
+from lib.api.chatgpt.prediction_ai import (
+    FORECAST_CHUNK_DAYS, FORECAST_MODEL, FORECAST_OUTPUT_FORMAT, PROMPT_VERSION, get_month_forecast_array,
+    get_month_forecast_chunked, stream_month_forecast_array
+)
+from lib.api.nasa.cache import GridCell, get_default_cache, make_cache_key, snap_to_grid
+from lib.api.nasa.history import series_year_is_final
+from lib.api.nasa.series import parse_month
+from lib.api.nasa.spatial import DEFAULT_NEARBY_MAX_KM, get_spatial_store
+from lib.api.nasa.unified import PREDICTION_PARAMETERS, UNION_PARAMETERS, fetch_cell_history, parse_parameters
+from lib.concurrency.background import get_background_tasks
+from lib.concurrency.single_flight import coalesced_counts, get_single_flight
+from lib.firebase.realtime_databse import FORECAST_DONE, FORECAST_ERROR, finish_forecast, push_forecast_day
+from lib.forecast.analog import analog_forecast
+from lib.forecast.climatology import (
+    DayOfYearClimatology, attach_indicators, build_climatology, forecast_from_climatology,
+    forecast_year_from_climatology
+)
+from lib.forecast.climatology_store import (
+    climatology_parameters, get_climatology_store, refresh_cell_climatology, store_cell_climatology
+)
+from lib.forecast.ensemble import ensemble_forecast
+from lib.forecast.indicators import add_indicators, cell_indicator_series
+from lib.forecast.result_cache import get_forecast_result_cache, make_forecast_key
+from lib.forecast.schemas import ForecastEntry
+
+NASA_PARAMETERS = PREDICTION_PARAMETERS
+
+# Climatologies are built over the raw parameters plus the derived agronomic indicators
+CLIMATOLOGY_PARAMETERS = climatology_parameters(NASA_PARAMETERS)
+
+# "climatology" computes the forecast locally, "analog" blends the most similar
+# historical years, "ensemble" adds the status distribution across historical
+# years to the climatology forecast, "llm" asks GPT-4o
+DEFAULT_FORECAST_ENGINE = "climatology"
+CLIMATOLOGY_METHOD = os.getenv("FORECAST_CLIMATOLOGY_METHOD", "mean")
+CLIMATOLOGY_TREND = os.getenv("FORECAST_CLIMATOLOGY_TREND", "false").lower() == "true"
+ANALOG_YEARS = int(os.getenv("FORECAST_ANALOG_YEARS", 3))
+ANALOG_WEEKS = int(os.getenv("FORECAST_ANALOG_WEEKS", 4))
+ENSEMBLE_THRESHOLD = float(os.getenv("FORECAST_ENSEMBLE_THRESHOLD", 0.7))
+
+# Stream LLM forecasts and publish every finished day to the realtime database
+STREAM_LLM_FORECAST = os.getenv("FORECAST_LLM_STREAM", "false").lower() == "true"
+
+# Engines that read the raw history series instead of the stored climatology
+SERIES_FORECAST_ENGINES = ("analog", "ensemble")
+
+# Uncached cells may borrow the series of the nearest cached cell within this distance (0 disables)
+NASA_NEARBY_MAX_KM = float(os.getenv("NASA_NEARBY_MAX_KM", DEFAULT_NEARBY_MAX_KM))
+
+
+def history_date_range(current_date: datetime.datetime = None) -> dict:
+    """Historical NASA window used for predictions: the six last completed years."""
+    current_date = current_date or datetime.datetime.now()
+    start_year = current_date.year - 6
+    end_year = current_date.year - 1
+
+    return {
+        "start_date": f"{start_year}0101",  # January 1st, 6 years ago
+        "end_date": f"{end_year}1231"       # December 31st of last year
+    }
 
 
 class PredictPlantingDate:
     def __init__(self, id_user: str, data: dict):
         self.id_user = id_user
         self.request = data
+        # Forecast days this run published to the realtime database while streaming
+        self.streamed_days = 0
 
     def execute(self):
         crop = self.request["crop_type"]
@@ -30,34 +91,41 @@ class PredictPlantingDate:
                 "longitude": self.request["longitude"]
             }
 
-            current_date = datetime.datetime.now()
-            start_year = current_date.year - 6
-            end_year = current_date.year - 1
-
-            date_range = {
-                "start_date": f"{start_year}0101",  # January 1st, 5 years ago
-                "end_date": f"{end_year}1231"       # December 31st of last year
-            }
+            date_range = history_date_range()
 
             self.request["start_date"] = date_range["start_date"]
             self.request["end_date"] = date_range["end_date"]
 
             print(f"[PredictPlantingDate worker] Fetching data from {date_range['start_date']} to {date_range['end_date']} for location: {location_data}")
 
-            self._make_prediction(best_conditions=best_conditions,
-                                  location_data=location_data,
-                                  date_range=date_range,
-                                  start_month=self.request["start_month"])
+            if self.request.get("full_year"):
+                self._make_calendar_prediction(best_conditions=best_conditions,
+                                               location_data=location_data,
+                                               date_range=date_range)
+            else:
+                self._make_prediction(best_conditions=best_conditions,
+                                      location_data=location_data,
+                                      date_range=date_range,
+                                      start_month=self.request["start_month"])
 
         except Exception as e:
             print(f"[PredictPlantingDate worker] Error: {e}")
             return
+        finally:
+            # Finish the background fetches of approximated cells before the invocation ends
+            get_background_tasks("climatology").drain()
 
         # TODO: Save prediction result to database
-        print("[PredictPlantingDate worker] done")
+        print(f"[PredictPlantingDate worker] done (coalesced calls: {coalesced_counts()}, "
+              f"OpenAI usage: {usage_stats.summary()})")
 
     @staticmethod
     def _validate_crop_in_db(crop: str):
+        # Concurrent requests for the same crop share one lookup (and one LLM call + insert)
+        return get_single_flight("crop_conditions").do(crop, PredictPlantingDate._load_or_create_crop, crop)
+
+    @staticmethod
+    def _load_or_create_crop(crop: str):
         logging.info(f"[PredictPlantingDate worker] Validating crop in DB: {crop}")
 
         existing_crop = CropsConditionCollection().get_one(filter_by={"crop_key": crop},hidden_fields=[], force_show_fields=[])
@@ -97,112 +165,366 @@ class PredictPlantingDate:
 
     def _make_prediction(self, best_conditions: CropConditionModel, location_data: dict,
                          date_range: dict, start_month: str):
+        forecast_engine = self._get_forecast_engine()
+        streaming = forecast_engine == "llm" and self._stream_forecast()
         try:
-
-            nasa_data = self._get_nasa_data(location_data=location_data, data_range=date_range)
-
-            filtered_data = self._filter_dataset_by_month(nasa_data, start_month)
-
-            if not nasa_data:
-                raise Exception("[PredictPlantingDate worker] No NASA data found for the given location and date range")
-
-
-            logging.info("Starting prediction using NASA data and best conditions")
             current_date = datetime.datetime.now()
+            target_year = current_date.year + 1
+
+            # A cached forecast skips both the NASA download and the forecast engine
+            result_cache = get_forecast_result_cache()
+            cell = snap_to_grid(location_data["latitude"], location_data["longitude"])
+            result_key = make_forecast_key(cell, parse_month(start_month), target_year, best_conditions,
+                                           self._get_forecast_version(forecast_engine))
+            result = result_cache.get(result_key)
+
+            if result is not None:
+                print(f"[PredictPlantingDate worker] Forecast cache hit for {result_key} ({result_cache.stats()})")
+            else:
+                # Identical concurrent requests wait for the forecast already being computed; only
+                # the run that computes it streams its days
+                on_entry = self._forecast_day_publisher() if streaming else None
+                result = get_single_flight("forecast").do(result_key, self._compute_forecast,
+                                                          result_key=result_key,
+                                                          forecast_engine=forecast_engine,
+                                                          best_conditions=best_conditions,
+                                                          location_data=location_data,
+                                                          date_range=date_range,
+                                                          start_month=start_month,
+                                                          current_year=current_date.year,
+                                                          on_entry=on_entry)
 
-            result = get_month_forecast_array(best_conditions=best_conditions,
-                                              current_year=current_date.year, dataset_nasa=filtered_data)
+            if not result:
+                raise Exception("[PredictPlantingDate worker] Prediction API returned no data")
 
             payload = [entry.model_dump() for entry in result]
             print(json.dumps(payload, indent=2, ensure_ascii=False))
 
-            if not result:
-                raise Exception("[PredictPlantingDate worker] Prediction API returned no data")
+            self._save_prediction_to_db(request=self.request, prediction=result, best_conditions=best_conditions,
+                                        step_block=parse_month(start_month))
+            if streaming:
+                self._finish_forecast_stream(result)
 
-            self._save_prediction_to_db(request=self.request, prediction=result)
-            
             return result
 
         except Exception as e:
             print(f"[PredictPlantingDate worker] Error making prediction: {e}")
+            if streaming:
+                self._finish_forecast_stream(None)
             return None
 
+    def _make_calendar_prediction(self, best_conditions: CropConditionModel, location_data: dict, date_range: dict):
+        # The whole year comes from one climatology (one NASA fetch at most) in a single pass,
+        # instead of one worker run per month
+        try:
+            forecast_engine = self._get_forecast_engine()
+            if forecast_engine != "climatology":
+                logging.warning(f"[PredictPlantingDate worker] Full-year calendars use the climatology engine, "
+                                f"ignoring {forecast_engine}")
+
+            target_year = datetime.datetime.now().year + 1
+            climatology, cacheable = self._get_climatology(location_data=location_data, data_range=date_range)
+            if climatology is None:
+                raise Exception("[PredictPlantingDate worker] No NASA data found for the given location and date range")
+
+            calendar = forecast_year_from_climatology(climatology=climatology,
+                                                      target_year=target_year,
+                                                      best_conditions=best_conditions,
+                                                      method=CLIMATOLOGY_METHOD,
+                                                      trend=CLIMATOLOGY_TREND)
+
+            # Later single-month requests for the same crop and cell are served from the result cache
+            if cacheable:
+                result_cache = get_forecast_result_cache()
+                cell = snap_to_grid(location_data["latitude"], location_data["longitude"])
+                version = self._get_forecast_version("climatology")
+                for month, entries in calendar.items():
+                    if entries:
+                        result_cache.set(make_forecast_key(cell, month, target_year, best_conditions, version),
+                                         entries)
+
+            print(f"[PredictPlantingDate worker] Full-year calendar ready: "
+                  f"{sum(len(entries) for entries in calendar.values())} days")
+            self._save_calendar_to_db(request=self.request, calendar=calendar, best_conditions=best_conditions)
+            return calendar
+
+        except Exception as e:
+            print(f"[PredictPlantingDate worker] Error making calendar prediction: {e}")
+            return None
+
+    def _compute_forecast(self, result_key: str, forecast_engine: str, best_conditions: CropConditionModel,
+                          location_data: dict, date_range: dict, start_month: str, current_year: int,
+                          on_entry=None):
+        if forecast_engine in SERIES_FORECAST_ENGINES:
+            result, cacheable = self._series_forecast(forecast_engine=forecast_engine,
+                                                      best_conditions=best_conditions,
+                                                      location_data=location_data,
+                                                      date_range=date_range,
+                                                      start_month=start_month,
+                                                      current_year=current_year)
+            if result and cacheable:
+                get_forecast_result_cache().set(result_key, result)
+            return result
+
+        climatology, cacheable = self._get_climatology(location_data=location_data, data_range=date_range)
+
+        if climatology is None:
+            raise Exception("[PredictPlantingDate worker] No NASA data found for the given location and date range")
 
+        logging.info(f"Starting prediction using NASA climatology and best conditions ({forecast_engine} engine)")
+        result = self._run_forecast_engine(forecast_engine=forecast_engine,
+                                           climatology=climatology,
+                                           start_month=start_month,
+                                           current_year=current_year,
+                                           best_conditions=best_conditions,
+                                           on_entry=on_entry)
+        # Forecasts from an approximation or a not yet final window are not kept for 7 days
+        if result and cacheable:
+            get_forecast_result_cache().set(result_key, result)
+        return result
 
     @staticmethod
-    def _save_prediction_to_db(request:dict, prediction: list):
-        logging.info("[PredictPlantingDate worker] Saving prediction to DB")
+    def _run_forecast_engine(forecast_engine: str, climatology: DayOfYearClimatology, start_month: str,
+                             current_year: int, best_conditions: CropConditionModel, on_entry=None):
+        if forecast_engine == "llm" and on_entry is not None:
+            def publish(entry: ForecastEntry):
+                attach_indicators([entry], climatology, best_conditions)
+                on_entry(entry)
+
+            # Days are completed (indicators, status) and published while the month is generated
+            return stream_month_forecast_array(best_conditions=best_conditions,
+                                               current_year=current_year,
+                                               dataset_nasa=climatology.select_months(start_month),
+                                               month=start_month,
+                                               on_entry=publish)
+
+        if forecast_engine == "llm":
+            if FORECAST_CHUNK_DAYS > 0:
+                # Week-sized chunks are generated concurrently, latency is about one chunk
+                forecast = get_month_forecast_chunked(best_conditions=best_conditions,
+                                                      current_year=current_year,
+                                                      dataset_nasa=climatology.select_months(start_month),
+                                                      month=start_month)
+            else:
+                forecast = get_month_forecast_array(best_conditions=best_conditions,
+                                                    current_year=current_year,
+                                                    dataset_nasa=climatology.select_months(start_month),
+                                                    month=start_month)
+            # The LLM only predicts the weather, indicators and risks come from the history
+            return attach_indicators(forecast, climatology, best_conditions) if forecast else forecast
+
+        return forecast_from_climatology(climatology=climatology,
+                                         month=start_month,
+                                         target_year=current_year + 1,
+                                         best_conditions=best_conditions,
+                                         method=CLIMATOLOGY_METHOD,
+                                         trend=CLIMATOLOGY_TREND)
+
+    def _get_forecast_engine(self) -> str:
+        return self.request.get("forecast_engine") or os.getenv("FORECAST_ENGINE", DEFAULT_FORECAST_ENGINE)
+
+    def _stream_forecast(self) -> bool:
+        stream = self.request.get("stream_forecast")
+        return STREAM_LLM_FORECAST if stream is None else bool(stream)
+
+    def _forecast_day_publisher(self):
+        id_user = self.request["id_user"]
+        id_request = str(self.request["id_request"])
+
+        def publish(entry: ForecastEntry):
+            # A realtime database failure must not break the forecast itself
+            try:
+                push_forecast_day(id_user=id_user, id_request=id_request, entry=entry.model_dump())
+                self.streamed_days += 1
+            except Exception as e:
+                logging.error(f"[PredictPlantingDate worker] Error publishing forecast day {entry.date}: {e}")
+
+        return publish
+
+    def _finish_forecast_stream(self, forecast):
+        # Clients wait for a terminal status. Cached and coalesced results were not streamed
+        # by this run, so the whole forecast is published with it.
+        id_user = self.request["id_user"]
+        id_request = str(self.request["id_request"])
         try:
+            if forecast is None:
+                finish_forecast(id_user=id_user, id_request=id_request, status=FORECAST_ERROR)
+            else:
+                entries = None if self.streamed_days else [entry.model_dump() for entry in forecast]
+                finish_forecast(id_user=id_user, id_request=id_request, status=FORECAST_DONE, forecast=entries)
+        except Exception as e:
+            logging.error(f"[PredictPlantingDate worker] Error finishing forecast stream: {e}")
 
-            data_to_insert = {
-                "id_user": request["id_user"],
-                "crop_type": request["crop_type"],
-                "latitude": request["latitude"],
-                "longitude": request["longitude"],
-                "start_date": request["start_date"],
-                "end_date": request["end_date"],
-                "id_request": request["id_request"],
-                "timestamps": [entry.model_dump() for entry in prediction]
-            }
-
-            HistoricalDataCollection().insert(HistoricalDataModel(**data_to_insert))
+    @staticmethod
+    def _get_forecast_version(forecast_engine: str) -> str:
+        if forecast_engine == "llm":
+            return f"llm:{FORECAST_MODEL}:{PROMPT_VERSION}:chunk{FORECAST_CHUNK_DAYS}:{FORECAST_OUTPUT_FORMAT}"
+        if forecast_engine == "analog":
+            return f"analog:{ANALOG_YEARS}:{ANALOG_WEEKS}"
+        if forecast_engine == "ensemble":
+            return f"ensemble:{ENSEMBLE_THRESHOLD}:{CLIMATOLOGY_METHOD}:{CLIMATOLOGY_TREND}"
+        return f"climatology:{CLIMATOLOGY_METHOD}:{CLIMATOLOGY_TREND}"
 
+    @staticmethod
+    def _save_prediction_to_db(request:dict, prediction: list, best_conditions: CropConditionModel, step_block: int):
+        logging.info("[PredictPlantingDate worker] Saving prediction to DB")
+        try:
+            HistoricalDataCollection().insert(PredictPlantingDate._historical_data(request=request,
+                                                                                   prediction=prediction,
+                                                                                   best_conditions=best_conditions,
+                                                                                   step_block=step_block))
 
         except Exception as e:
             logging.error(f"[PredictPlantingDate worker] Error saving prediction to DB: {e}")
             return None
 
     @staticmethod
-    def _get_nasa_data(location_data:dict, data_range:dict):
+    def _save_calendar_to_db(request: dict, calendar: dict, best_conditions: CropConditionModel):
+        logging.info("[PredictPlantingDate worker] Saving full-year calendar to DB")
         try:
-            base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
-            params = {
-                "parameters": "T2M_MAX,T2M_MIN,RH2M,PRECTOTCORR,GWETROOT,GWETTOP,PRECSNO,TSOIL5",
-                "community": "re",
-                "longitude": location_data["longitude"],
-                "latitude": location_data["latitude"],
-                "start": data_range["start_date"],
-                "end": data_range["end_date"],
-                "format": "json",
-                "units": "metric",
-                "header": "true"
-            }
-            response = requests.get(base_url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"[PredictPlantingDate worker] Error fetching NASA data: {e}")
+            # One document per month, as for monthly predictions, written in a single batch
+            documents = [PredictPlantingDate._historical_data(request=request,
+                                                              prediction=entries,
+                                                              best_conditions=best_conditions,
+                                                              step_block=month)
+                         for month, entries in sorted(calendar.items()) if entries]
+            HistoricalDataCollection().insert_many(documents)
+
+        except Exception as e:
+            logging.error(f"[PredictPlantingDate worker] Error saving calendar to DB: {e}")
             return None
 
     @staticmethod
-    def _filter_dataset_by_month(dataset: dict, month: str) -> dict:
-        month_map = {
-            'January': '01', 'February': '02', 'March': '03', 'April': '04',
-            'May': '05', 'June': '06', 'July': '07', 'August': '08',
-            'September': '09', 'October': '10', 'November': '11', 'December': '12'
-        }
-
-        # Get the month number
-        if month not in month_map:
-            logging.error(f"[PredictPlantingDate worker] Invalid month: {month}")
-            return {}
+    def _historical_data(request: dict, prediction: list, best_conditions: CropConditionModel,
+                         step_block: int) -> HistoricalDataModel:
+        if not isinstance(best_conditions, dict):
+            best_conditions = best_conditions.model_dump()
+
+        return HistoricalDataModel(
+            id_user=request["id_user"],
+            id_request=str(request["id_request"]),
+            crop_types=request["crop_type"],
+            latitude=request["latitude"],
+            longitude=request["longitude"],
+            start_date=datetime.datetime.strptime(request["start_date"], "%Y%m%d"),
+            end_date=datetime.datetime.strptime(request["end_date"], "%Y%m%d"),
+            best_condition=best_conditions,
+            timestamps=[entry.model_dump() for entry in prediction],
+            step_block=step_block,
+        )
 
-        month_number = month_map[month]
-
-        filtered_dataset = deepcopy(dataset)
+    @staticmethod
+    def _get_climatology(location_data: dict, data_range: dict):
+        # Per day-of-year statistics are computed once per cell and window and
+        # stored in Mongo, later requests don't touch the raw NASA data at all.
+        # Returns (climatology, cacheable): only climatologies built from the cell's
+        # own final history may back a cached forecast.
+        cell = snap_to_grid(location_data["latitude"], location_data["longitude"])
+        start_year = int(data_range["start_date"][:4])
+        end_year = int(data_range["end_date"][:4])
+
+        climatology = get_climatology_store().get(cell, start_year, end_year, CLIMATOLOGY_PARAMETERS)
+        if climatology is not None:
+            return climatology, True
+
+        window_key = make_cache_key(cell, NASA_PARAMETERS, data_range["start_date"], data_range["end_date"])
+        return get_single_flight("climatology").do(window_key, PredictPlantingDate._build_climatology,
+                                                   location_data=location_data, data_range=data_range)
 
+    @staticmethod
+    def _build_climatology(location_data: dict, data_range: dict):
+        cell = snap_to_grid(location_data["latitude"], location_data["longitude"])
+        start_year = int(data_range["start_date"][:4])
+        end_year = int(data_range["end_date"][:4])
+
+        nearby_series, approximated = PredictPlantingDate._get_nearby_nasa_data(location_data=location_data,
+                                                                               data_range=data_range)
+        if approximated:
+            # Approximations are neither stored nor cached as forecasts; the cell's own history
+            # is fetched and its climatology stored in the background, so later requests use real data
+            get_background_tasks("climatology").submit(cell.key, refresh_cell_climatology, cell,
+                                                       start_year, end_year, NASA_PARAMETERS)
+            return build_climatology(add_indicators(nearby_series)), False
+
+        nasa_series = PredictPlantingDate._get_nasa_data(location_data=location_data, data_range=data_range)
+        if nasa_series is None or not len(nasa_series):
+            return None, False
+
+        return (store_cell_climatology(cell, start_year, end_year, nasa_series),
+                series_year_is_final(nasa_series, end_year))
 
-        if 'properties' not in dataset or 'parameter' not in dataset['properties']:
-            logging.error("[PredictPlantingDate worker] Dataset does not have the expected structure")
-            return {}
+    @staticmethod
+    def _series_forecast(forecast_engine: str, best_conditions: CropConditionModel, location_data: dict,
+                         date_range: dict, start_month: str, current_year: int):
+        # These engines need every historical year, read from the raw series (a local read once cached).
+        # Returns (forecast, cacheable), a window whose last year is not final is not cached.
+        nasa_series = PredictPlantingDate._get_nasa_data(location_data=location_data, data_range=date_range)
+        if nasa_series is None or not len(nasa_series):
+            raise Exception("[PredictPlantingDate worker] No NASA data found for the given location and date range")
+
+        cell = snap_to_grid(location_data["latitude"], location_data["longitude"])
+        # Indicators are cached next to the raw window on disk
+        end_year = int(date_range["end_date"][:4])
+        series = cell_indicator_series(cell, int(date_range["start_date"][:4]), end_year, nasa_series)
+        cacheable = series_year_is_final(nasa_series, end_year)
+
+        logging.info(f"Starting prediction using NASA history and best conditions ({forecast_engine} engine)")
+        if forecast_engine == "ensemble":
+            return ensemble_forecast(series=series,
+                                     month=start_month,
+                                     target_year=current_year + 1,
+                                     best_conditions=best_conditions,
+                                     threshold=ENSEMBLE_THRESHOLD,
+                                     method=CLIMATOLOGY_METHOD,
+                                     trend=CLIMATOLOGY_TREND), cacheable
+
+        return analog_forecast(series=series,
+                               month=start_month,
+                               target_year=current_year + 1,
+                               best_conditions=best_conditions,
+                               k=ANALOG_YEARS,
+                               weeks=ANALOG_WEEKS), cacheable
 
-        for param_name, param_data in filtered_dataset['properties']['parameter'].items():
-            filtered_dates = {}
+    @staticmethod
+    def _get_nearby_nasa_data(location_data: dict, data_range: dict):
+        # Serve an uncached cell from the cached cells around it instead of calling NASA.
+        # Returns (series, approximated), the series is None when the cell is not approximated.
+        cell = snap_to_grid(location_data["latitude"], location_data["longitude"])
+        spatial_store = get_spatial_store(UNION_PARAMETERS, int(data_range["start_date"][:4]),
+                                          int(data_range["end_date"][:4]))
+        if cell in spatial_store:
+            return None, False
+
+        nearby = spatial_store.nearby_series(location_data["latitude"], location_data["longitude"],
+                                             max_distance_km=NASA_NEARBY_MAX_KM)
+        if nearby is None:
+            return None, False
+
+        series, source = nearby
+        print(f"[PredictPlantingDate worker] NASA data for cell {cell.key} approximated from cached cells ({source})")
+        return series.select(parse_parameters(NASA_PARAMETERS)), True
 
-            for date_key, value in param_data.items():
-                if len(date_key) == 8 and date_key[4:6] == month_number:
-                    filtered_dates[date_key] = value
+    @staticmethod
+    def _get_nasa_data(location_data:dict, data_range:dict):
+        # NASA POWER returns the same series for every point inside a grid cell,
+        # so the request is made for the cell center and stored per cell and year.
+        cell = snap_to_grid(location_data["latitude"], location_data["longitude"])
+        start_year = int(data_range["start_date"][:4])
+        end_year = int(data_range["end_date"][:4])
+        window_key = make_cache_key(cell, NASA_PARAMETERS, data_range["start_date"], data_range["end_date"])
 
-            filtered_dataset['properties']['parameter'][param_name] = filtered_dates
+        # Concurrent requests for the same cell share one download
+        return get_single_flight("nasa").do(window_key, PredictPlantingDate._fetch_nasa_data,
+                                            cell=cell, start_year=start_year, end_year=end_year)
 
-        return filtered_dataset
+    @staticmethod
+    def _fetch_nasa_data(cell: GridCell, start_year: int, end_year: int):
+        try:
+            # The shared fetch layer downloads every known parameter once and projects ours
+            data = fetch_cell_history(cell=cell, start_year=start_year, end_year=end_year,
+                                      parameters=NASA_PARAMETERS)
+            print(f"[PredictPlantingDate worker] NASA data ready for cell {cell.key} ({get_default_cache().stats()})")
+            return data
+        except (requests.RequestException, ValueError) as e:
+            print(f"[PredictPlantingDate worker] Error fetching NASA data: {e}")
+            return None
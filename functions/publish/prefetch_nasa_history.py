@@ -0,0 +1,112 @@
+"""
+Nightly prefetch of NASA POWER history for every saved location.
+
+Saved locations are streamed from Mongo and deduplicated by NASA grid cell.
+Cells without a stored climatology have their history downloaded with the
+async client (`fetch_many`, bounded concurrency) and their climatology
+stored in Mongo (see climatology_store). When a user then predicts for a
+saved location with the climatology engine, the NASA step is skipped.
+
+The raw series are not kept: this job's /tmp is not shared with the worker
+instances, so the analog and ensemble engines (which read the raw series)
+still download the history on their first request.
+
+Run from the functions directory:
+
+    python -m publish.prefetch_nasa_history --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from infrastructure.database.collections.locations_collection import LocationsCollection
+from lib.api.nasa.async_client import fetch_many
+from lib.api.nasa.cache import GridCell, snap_to_grid
+from lib.forecast.climatology_store import get_climatology_store, store_cell_climatology
+from publish.predict_planting_date import CLIMATOLOGY_PARAMETERS, NASA_PARAMETERS, history_date_range
+
+DEFAULT_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", 8))
+
+
+def unique_cells(locations: Iterable[dict]) -> Iterator[GridCell]:
+    """Yield the grid cell of every location once, in first-seen order."""
+    seen = set()
+    for location in locations:
+        try:
+            cell = snap_to_grid(float(location["latitude"]), float(location["longitude"]))
+        except (KeyError, TypeError, ValueError):
+            logging.warning(f"[PrefetchNasaHistory] Skipping location without valid coordinates: {location}")
+            continue
+        if cell in seen:
+            continue
+        seen.add(cell)
+        yield cell
+
+
+class PrefetchNasaHistory:
+    def __init__(self, concurrency: Optional[int] = None, limit: Optional[int] = None):
+        self.concurrency = concurrency or DEFAULT_CONCURRENCY
+        self.limit = limit
+        self.date_range = history_date_range()
+        self.start_year = int(self.date_range["start_date"][:4])
+        self.end_year = int(self.date_range["end_date"][:4])
+
+    def execute(self) -> Dict[str, float]:
+        started = time.perf_counter()
+        summary = {"cells": 0, "stored": 0, "prefetched": 0, "failed": 0}
+        print(f"[PrefetchNasaHistory] start: window {self.date_range['start_date']}-{self.date_range['end_date']}, "
+              f"concurrency {self.concurrency}")
+
+        # Cells whose climatology is already stored are not downloaded again
+        store = get_climatology_store()
+        missing = []
+        for cell in unique_cells(LocationsCollection().iter_coordinates()):
+            if self.limit is not None and summary["cells"] >= self.limit:
+                break
+            summary["cells"] += 1
+            if store.get(cell, self.start_year, self.end_year, CLIMATOLOGY_PARAMETERS) is not None:
+                summary["stored"] += 1
+            else:
+                missing.append(cell)
+
+        asyncio.run(self._prefetch(missing, summary))
+
+        summary["seconds"] = round(time.perf_counter() - started, 2)
+        print(f"[PrefetchNasaHistory] done: {summary}")
+        return summary
+
+    async def _prefetch(self, cells: List[GridCell], summary: Dict[str, float]) -> None:
+        cells_by_point = {(cell.latitude, cell.longitude): cell for cell in cells}
+        results = fetch_many(cells_by_point, self.date_range["start_date"], self.date_range["end_date"],
+                             NASA_PARAMETERS, concurrency=self.concurrency, columnar=True)
+        async for result in results:
+            cell = cells_by_point[result.point]
+            if result.error is None:
+                try:
+                    # Climatologies are built off the event loop, the other downloads keep going
+                    await asyncio.to_thread(store_cell_climatology, cell, self.start_year, self.end_year,
+                                            result.response.series)
+                    summary["prefetched"] += 1
+                    continue
+                except Exception as e:
+                    logging.error(f"[PrefetchNasaHistory] Storing the climatology of cell {cell.key} failed: {e}")
+            summary["failed"] += 1
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Prefetch NASA POWER history for every saved location.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Number of grid cells fetched in parallel")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many grid cells")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    PrefetchNasaHistory(concurrency=args.concurrency, limit=args.limit).execute()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the planting date prediction worker.
+"""
+
+import calendar
+import datetime
+import tempfile
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the functions root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../'))
+
+from lib.api.nasa import cache as nasa_cache
+from lib.api.nasa import spatial
+from lib.api.nasa.cache import NASADiskCache, snap_to_grid
+from lib.api.nasa.unified import parse_parameters
+from lib.forecast import climatology_store, result_cache
+from lib.forecast.result_cache import make_forecast_key
+from lib.forecast.test_climatology import BEST_CONDITIONS
+from publish.predict_planting_date import PredictPlantingDate
+
+LATITUDE = 49.0
+LONGITUDE = 16.25
+CROP = {"_id": "crop-1", "crop_key": "tomato", "crop_name": "Tomato", **BEST_CONDITIONS}
+
+
+def _full_response(params):
+    """NASA-like response with every requested parameter and day of the requested years."""
+    dates = np.arange(np.datetime64(f"{params['start'][:4]}-01-01"),
+                      np.datetime64(f"{int(params['end'][:4]) + 1}-01-01"))
+    names = parse_parameters(params["parameters"])
+    values = {str(date).replace("-", ""): 0.5 + (index % 365) / 100 for index, date in enumerate(dates)}
+    return {
+        "properties": {"parameter": {name: dict(values) for name in names}},
+        "header": {"fill_value": -999, "start": params["start"], "end": params["end"]},
+        "parameters": {name: {"units": "-", "longname": name} for name in names},
+    }
+
+
+class FakeClimatologyStore:
+    """In-memory stand-in for the Mongo climatology store."""
+
+    def __init__(self):
+        self.saved = {}
+
+    def get(self, cell, start_year, end_year, parameters):
+        return self.saved.get((cell.key, start_year, end_year))
+
+    def save(self, cell, climatology):
+        self.saved[(cell.key, climatology.start_year, climatology.end_year)] = climatology
+
+
+class FakeResultCache:
+    """In-memory stand-in for the Mongo forecast result cache."""
+
+    def __init__(self):
+        self.entries = {}
+        self.requested = []
+
+    def get(self, key):
+        self.requested.append(key)
+        return self.entries.get(key)
+
+    def set(self, key, forecast):
+        self.entries[key] = forecast
+
+    def stats(self):
+        return {"memory_entries": len(self.entries)}
+
+
+class TestPredictPlantingDate(unittest.TestCase):
+    """Test cases for the worker with the databases and NASA POWER patched."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.climatologies = FakeClimatologyStore()
+        self.results = FakeResultCache()
+        patches = [
+            patch.object(nasa_cache, "_default_cache", NASADiskCache(directory=self.tmp_dir.name)),
+            patch.dict(spatial._stores, clear=True),
+            patch.object(climatology_store, "_default_store", self.climatologies),
+            patch.object(result_cache, "_default_cache", self.results),
+            patch('lib.api.nasa.history.request_daily_point', side_effect=_full_response),
+            patch('publish.predict_planting_date.CropsConditionCollection'),
+            patch('publish.predict_planting_date.HistoricalDataCollection'),
+        ]
+        mocks = [patcher.start() for patcher in patches]
+        self.addCleanup(patch.stopall)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.request_daily_point, crops, historical = mocks[-3:]
+        crops.return_value.get_one.return_value = dict(CROP)
+        self.historical = historical.return_value
+        self.target_year = datetime.datetime.now().year + 1
+
+    def _execute(self, latitude=LATITUDE, longitude=LONGITUDE, **request):
+        data = {"crop_type": "tomato", "latitude": latitude, "longitude": longitude,
+                "id_user": "user-1", "id_request": 7, "start_month": "June", **request}
+        PredictPlantingDate(id_user="user-1", data=data).execute()
+
+    def _cache_key(self, month, version, latitude=LATITUDE, longitude=LONGITUDE):
+        return make_forecast_key(snap_to_grid(latitude, longitude), month, self.target_year, CROP, version)
+
+    def test_month_is_saved(self):
+        """Test the saved document of a monthly prediction."""
+        self._execute(forecast_engine="climatology")
+
+        self.historical.insert.assert_called_once()
+        document = self.historical.insert.call_args.args[0]
+        self.assertEqual(document.step_block, 6)
+        self.assertEqual(document.crop_types, "tomato")
+        self.assertEqual(document.id_request, "7")
+        self.assertEqual(len(document.timestamps), 30)
+        self.assertEqual(document.timestamps[0]["date"], f"{self.target_year}0601")
+        self.assertEqual(document.start_date, datetime.datetime(self.target_year - 7, 1, 1))
+        self.assertEqual(document.end_date, datetime.datetime(self.target_year - 2, 12, 31))
+        self.assertEqual(document.best_condition["temperature"], BEST_CONDITIONS["temperature"])
+
+        # The six years are downloaded in one request and the climatology is stored
+        self.assertEqual(self.request_daily_point.call_count, 1)
+        self.assertEqual(len(self.climatologies.saved), 1)
+        self.assertEqual(list(self.results.entries), [self._cache_key(6, "climatology:mean:False")])
+
+    def test_month_length(self):
+        """Test that a 31-day month saves 31 timestamps."""
+        self._execute(forecast_engine="climatology", start_month="7")
+        document = self.historical.insert.call_args.args[0]
+        self.assertEqual(document.step_block, 7)
+        self.assertEqual(len(document.timestamps), 31)
+
+    def test_full_year(self):
+        """Test that a full-year calendar saves one document per month in one batch."""
+        self._execute(full_year=True)
+
+        self.historical.insert.assert_not_called()
+        documents = self.historical.insert_many.call_args.args[0]
+        self.assertEqual([document.step_block for document in documents], list(range(1, 13)))
+        self.assertEqual([len(document.timestamps) for document in documents],
+                         [calendar.monthrange(self.target_year, month)[1] for month in range(1, 13)])
+        self.assertEqual(self.request_daily_point.call_count, 1)
+        self.assertEqual(sorted(self.results.entries),
+                         sorted(self._cache_key(month, "climatology:mean:False") for month in range(1, 13)))
+
+    def test_nasa_calls_per_engine(self):
+        """Test that every engine downloads the history once and reuses it for later months."""
+        versions = {"climatology": "climatology:mean:False", "analog": "analog:3:4",
+                    "ensemble": "ensemble:0.7:mean:False"}
+        for index, (engine, version) in enumerate(versions.items()):
+            with self.subTest(engine=engine):
+                # Cells far apart, so no engine reuses or approximates another one's history
+                latitude = LATITUDE - 5 * index
+                self.request_daily_point.reset_mock()
+                self._execute(forecast_engine=engine, latitude=latitude)
+                self._execute(forecast_engine=engine, latitude=latitude, start_month="July")
+
+                self.assertEqual(self.request_daily_point.call_count, 1)
+                self.assertEqual(self.results.requested[-2:], [self._cache_key(6, version, latitude=latitude),
+                                                               self._cache_key(7, version, latitude=latitude)])
+                self.assertIn(self._cache_key(7, version, latitude=latitude), self.results.entries)
+                self.assertEqual(self.historical.insert.call_args.args[0].step_block, 7)
+
+    def test_cached_forecast(self):
+        """Test that a cached forecast is saved without touching NASA."""
+        self._execute(forecast_engine="climatology")
+        self.request_daily_point.reset_mock()
+        self.historical.reset_mock()
+
+        self._execute(forecast_engine="climatology")
+
+        self.request_daily_point.assert_not_called()
+        self.assertEqual(len(self.historical.insert.call_args.args[0].timestamps), 30)
+
+    def test_approximation_is_not_cached(self):
+        """Test that a forecast from a nearby cell is not cached, the cell itself is fetched in the background."""
+        self._execute(forecast_engine="climatology")
+        self.request_daily_point.reset_mock()
+        self.results.entries.clear()
+
+        # The neighbouring cell to the east
+        self._execute(forecast_engine="climatology", longitude=LONGITUDE + 0.625)
+
+        self.assertEqual(len(self.historical.insert.call_args.args[0].timestamps), 30)
+        self.assertEqual(self.results.entries, {})
+        self.assertEqual(self.request_daily_point.call_count, 1)
+        self.assertEqual(len(self.climatologies.saved), 2)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
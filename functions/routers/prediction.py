@@ -88,7 +88,7 @@ def start_prediction_worker(event: pubsub_fn.CloudEvent[pubsub_fn.MessagePublish
         PredictPlantingDate(id_user, raw_data).execute()
         logger.info(f"Prediction completed successfully for user: {id_user}")
 
-        # Start next prediction if needed
+        # Start next prediction if needed (full_year requests already cover every month)
         # TODO: This should be decided by prediction result
         to_be_continued = False
         if to_be_continued == True:
@@ -0,0 +1,18 @@
+from firebase_functions import scheduler_fn
+from publish.prefetch_nasa_history import PrefetchNasaHistory
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Scheduled job
+# Warms the NASA history of every saved location once a night
+@scheduler_fn.on_schedule(schedule="every day 03:00", timeout_sec=540)
+def prefetch_nasa_history(event: scheduler_fn.ScheduledEvent) -> None:
+    logger.info("Starting nightly NASA history prefetch")
+    try:
+        summary = PrefetchNasaHistory().execute()
+        logger.info(f"NASA history prefetch completed: {summary}")
+    except Exception as e:
+        logger.error(f"NASA history prefetch failed: {str(e)}")